@@ -0,0 +1,603 @@
+'''
+Benchmark suite for the scheduling algorithms.
+
+Runs every registered scheduler over a grid of task counts and dependency
+settings, repeats each measurement after warmup runs, and records wall time,
+CPU time and peak memory with percentiles. Results are written as JSON or CSV
+and can be compared against a stored baseline, exiting with a nonzero status
+when a scheduler got slower than the allowed ratio.
+
+The default grid leaves out the slow solvers (ILP, island GA, simulated
+annealing, tabu search), whose time limits would make a run take hours; name
+them in --schedulers or pass --all to include them.
+
+Example:
+    python Benchmark.py --tasks 100 500 --dependencies 0 5 --repeat 5 \
+        --output results/benchmark.json --baseline results/baseline.json --max-slowdown 1.25
+'''
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from DispatchPolicies import POLICIES
+from Greedy import partition_task_types, schedule_tasks_event_driven, schedule_tasks_greedy, schedule_tasks_partitioned
+from IntegerLinearProgramming import schedule_tasks_ilp, schedule_tasks_ilp_rolling
+from MetaheuristicAlgorithms import (RepairingEvaluator, genetic_algorithm, island_genetic_algorithm,
+                                    simulated_annealing, tabu_search)
+from Metrics import measure_metrics
+from ResourceProfile import ResourceProfile
+from TaskGeneration import Task, generate_random_tasks
+from TaskSetGeneration import generate_taskset
+
+RESOURCE_LIMITS = {'A': 23, 'B': 17, 'C': 19, 'D': 11}
+
+# Registered schedulers: name -> function(tasks, resource_limits) returning a schedule
+SCHEDULERS = {}
+# Schedulers that run for seconds to minutes per call; only benchmarked on request
+SLOW_SCHEDULERS = set()
+
+def register_scheduler(name, function=None, slow=False):
+    """
+    Register a scheduler under a name. Can be used as a decorator.
+
+    Slow schedulers (solvers with a time limit or budget) are left out of the
+    default benchmark grid and run when named in --schedulers or with --all.
+    """
+    if function is None:
+        return lambda function: register_scheduler(name, function, slow)
+    SCHEDULERS[name] = function
+    if slow:
+        SLOW_SCHEDULERS.add(name)
+    return function
+
+register_scheduler('Greedy', schedule_tasks_greedy)
+register_scheduler('Greedy-Event', lambda tasks, resource_limits: schedule_tasks_greedy(tasks, resource_limits, engine='event'))
+register_scheduler('Greedy-Partitioned', lambda tasks, resource_limits: schedule_tasks_greedy(tasks, resource_limits, engine='partitioned'))
+register_scheduler('Greedy-Backfill', lambda tasks, resource_limits: schedule_tasks_greedy(tasks, resource_limits, engine='backfill'))
+register_scheduler('Greedy-Aging', lambda tasks, resource_limits: schedule_tasks_greedy(tasks, resource_limits, engine='event', policy='aging'))
+register_scheduler('Greedy-MLFQ', lambda tasks, resource_limits: schedule_tasks_greedy(tasks, resource_limits, engine='event', policy='mlfq'))
+register_scheduler('Greedy-FairShare', lambda tasks, resource_limits: schedule_tasks_greedy(tasks, resource_limits, engine='event', policy='fair'))
+register_scheduler('Greedy-SJF', lambda tasks, resource_limits: schedule_tasks_greedy(tasks, resource_limits, engine='event', policy='sjf'))
+register_scheduler('ILP-Based', schedule_tasks_ilp, slow=True)
+register_scheduler('ILP-Rolling', schedule_tasks_ilp_rolling, slow=True)
+register_scheduler('ILP-WarmStart', lambda tasks, resource_limits: schedule_tasks_ilp(tasks, resource_limits, warm_start='fill'), slow=True)
+register_scheduler('Genetic-Algorithm', genetic_algorithm)
+register_scheduler('Genetic-Algorithm-Islands', lambda tasks, resource_limits: island_genetic_algorithm(tasks, resource_limits, seed=0), slow=True)
+register_scheduler('Simulated-Annealing', lambda tasks, resource_limits: simulated_annealing(tasks, resource_limits, time_budget=10), slow=True)
+register_scheduler('Tabu-Search', lambda tasks, resource_limits: tabu_search(tasks, resource_limits, time_budget=10), slow=True)
+
+PERCENTILES = [50, 90, 95]
+
+def copy_tasks(tasks):
+    """
+    Fresh copies of the tasks, since some schedulers update task status.
+    """
+    return [Task(**vars(task)) for task in tasks]
+
+def summarize(samples):
+    """
+    Summary statistics (min, mean, max and percentiles) of a list of samples.
+    """
+    values = np.asarray(samples, dtype=float)
+    summary = {'min': float(values.min()), 'mean': float(values.mean()), 'max': float(values.max())}
+    for percentile in PERCENTILES:
+        summary[f'p{percentile}'] = float(np.percentile(values, percentile))
+    return summary
+
+def measure(function, tasks, resource_limits, repeat=5, warmup=1):
+    """
+    Time a scheduler on a task set.
+
+    Every run gets fresh copies of the tasks. Timed runs do not trace memory;
+    peak memory is measured in one extra run under tracemalloc.
+
+    Returns:
+    A dictionary with wall time, CPU time and peak memory statistics, and the
+    quality metrics of the last schedule.
+    """
+    for _ in range(warmup):
+        function(copy_tasks(tasks), resource_limits)
+
+    wall_times, cpu_times = [], []
+    for _ in range(repeat):
+        run_tasks = copy_tasks(tasks)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        schedule = function(run_tasks, resource_limits)
+        cpu_times.append(time.process_time() - cpu_start)
+        wall_times.append(time.perf_counter() - wall_start)
+
+    run_tasks = copy_tasks(tasks)
+    tracemalloc.start()
+    function(run_tasks, resource_limits)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'wall_time': summarize(wall_times),
+        'cpu_time': summarize(cpu_times),
+        'peak_memory_bytes': peak_memory,
+        'metrics': schedule_metrics(schedule, tasks, resource_limits),
+    }
+
+def schedule_metrics(schedule, tasks, resource_limits):
+    """
+    Quality metrics of a schedule, or None if the scheduler found no schedule.
+    """
+    if not isinstance(schedule, list) or not schedule:
+        return None
+    weighted_throughput, makespan, task_utilization_rate, priority_satisfaction, _, task_avg_wait_time = \
+        measure_metrics(schedule, tasks, resource_limits)
+    return {
+        'scheduled_tasks': len(schedule),
+        'weighted_throughput': weighted_throughput,
+        'makespan': makespan,
+        'task_utilization_rate': task_utilization_rate,
+        'priority_satisfaction': priority_satisfaction,
+        'average_wait_time': task_avg_wait_time,
+    }
+
+def run_benchmarks(schedulers, task_counts, dependency_counts, resource_limits=RESOURCE_LIMITS,
+                   repeat=5, warmup=1, seed=0, log=print):
+    """
+    Run every scheduler over the grid of task counts and maximum dependencies.
+
+    Returns:
+    A list of result records, one per (scheduler, num_tasks, max_dependencies).
+    """
+    records = []
+    for num_tasks in task_counts:
+        for max_dependencies in dependency_counts:
+            # Same seeded task set for every scheduler in this grid cell
+            random.seed(seed)
+            tasks = generate_random_tasks(num_tasks, resource_limits, max_dependencies,
+                                          csv_filename=None, show_statistics=False)
+            for name in schedulers:
+                result = measure(SCHEDULERS[name], tasks, resource_limits, repeat=repeat, warmup=warmup)
+                record = {'scheduler': name, 'num_tasks': num_tasks, 'max_dependencies': max_dependencies,
+                          'repeat': repeat, 'warmup': warmup, 'seed': seed, **result}
+                records.append(record)
+                if log:
+                    scheduled = result['metrics']['scheduled_tasks'] if result['metrics'] else 0
+                    log(f"{name:<28} tasks={num_tasks:<7} deps={max_dependencies:<3} scheduled={scheduled:<7} "
+                        f"wall p50={result['wall_time']['p50']:.4f}s cpu p50={result['cpu_time']['p50']:.4f}s "
+                        f"peak={result['peak_memory_bytes'] / 1e6:.1f}MB")
+    return records
+
+def warm_start_report(task_counts, dependency_counts, resource_limits=RESOURCE_LIMITS,
+                      sources=(None, 'greedy', 'genetic', 'fill'), time_limit=30, seed=0, log=print):
+    """
+    Solve the same ILPs cold and with each warm start source.
+
+    Returns:
+    A list of records with the time to the first incumbent, the objective and
+    the final gap per (num_tasks, max_dependencies, warm start source).
+    """
+    records = []
+    for num_tasks in task_counts:
+        for max_dependencies in dependency_counts:
+            random.seed(seed)
+            tasks = generate_random_tasks(num_tasks, resource_limits, max_dependencies,
+                                          csv_filename=None, show_statistics=False)
+            for source in sources:
+                stats = {}
+                schedule_tasks_ilp(copy_tasks(tasks), resource_limits, time_limit=time_limit,
+                                   stats=stats, warm_start=source)
+                record = {'num_tasks': num_tasks, 'max_dependencies': max_dependencies,
+                          'warm_start': source or 'none', 'time_limit': time_limit, 'seed': seed, **stats}
+                records.append(record)
+                if log:
+                    gap = 'n/a' if record['gap'] is None else f"{record['gap']:.2%}"
+                    log(f"ILP warm_start={record['warm_start']:<8} tasks={num_tasks:<7} deps={max_dependencies:<3} "
+                        f"first incumbent={record['first_incumbent_time']}s objective={record['objective']} gap={gap}")
+    return records
+
+def first_evaluation(history, reached):
+    """
+    Cumulative number of fitness evaluations at the first generation whose
+    best score so far satisfies `reached`, or None if none did.
+    """
+    for entry in history:
+        if reached(entry['best_so_far']):
+            return entry['evaluations']
+    return None
+
+def ga_evaluations_report(task_counts, dependency_counts, resource_limits=RESOURCE_LIMITS,
+                          encodings=('raw', 'repair'), population_size=100, generations=100,
+                          target_ratio=1.0, seed=0, log=print):
+    """
+    Count the fitness evaluations each GA encoding needs to reach a target.
+
+    The target quality is `target_ratio` times the priority-weighted
+    completion time of the event-driven greedy schedule of the same tasks
+    (the RepairingEvaluator cost). The raw encoding only rewards feasibility, so its record has the
+    evaluations to the first feasible schedule; the repair encoding is
+    feasible from the first evaluation and is measured against the target.
+
+    Returns:
+    A list of records per (num_tasks, max_dependencies, encoding) with the
+    evaluations to a feasible schedule, to the target, and in total, the
+    best cost of the repair encoding and the target cost.
+    """
+    records = []
+    for num_tasks in task_counts:
+        for max_dependencies in dependency_counts:
+            random.seed(seed)
+            tasks = generate_random_tasks(num_tasks, resource_limits, max_dependencies,
+                                          csv_filename=None, show_statistics=False)
+            evaluator = RepairingEvaluator(tasks, resource_limits)
+            greedy_tasks = copy_tasks(tasks)
+            for task in greedy_tasks:
+                task.status = 'Not Running'
+            greedy_start = {task_id: start for task_id, start, _ in
+                            schedule_tasks_event_driven(greedy_tasks, resource_limits, list(resource_limits))}
+            greedy_cost = evaluator.cost(np.array([[greedy_start[task_id] for task_id in evaluator.task_ids]]))[0]
+            target = float(greedy_cost) * target_ratio
+            # Raw fitness of any feasible schedule (see BatchFitnessEvaluator)
+            feasible_score = -sum(task.priority for task in tasks)
+
+            for encoding in encodings:
+                history = []
+                random.seed(seed)
+                genetic_algorithm(copy_tasks(tasks), resource_limits, population_size=population_size,
+                                  generations=generations, history=history, encoding=encoding)
+                if encoding == 'repair':
+                    best_cost = -history[-1]['best_so_far']
+                    to_feasible = history[0]['evaluations']
+                    to_target = first_evaluation(history, lambda score: -score <= target)
+                else:
+                    best_cost = None
+                    to_feasible = first_evaluation(history, lambda score: score >= feasible_score)
+                    to_target = None
+                record = {'num_tasks': num_tasks, 'max_dependencies': max_dependencies, 'encoding': encoding,
+                          'population_size': population_size, 'generations': generations, 'seed': seed,
+                          'evaluations': history[-1]['evaluations'], 'evaluations_to_feasible': to_feasible,
+                          'evaluations_to_target': to_target, 'target_cost': target, 'best_cost': best_cost,
+                          'wall_time': history[-1]['elapsed']}
+                records.append(record)
+                if log:
+                    log(f"GA encoding={encoding:<7} tasks={num_tasks:<7} deps={max_dependencies:<3} "
+                        f"to feasible={to_feasible} to target={to_target} of {record['evaluations']} evaluations")
+    return records
+
+def _scan_earliest_start(usage, capacity, release, length, amount):
+    """
+    Earliest start by scanning a usage list slot by slot, as the schedulers did
+    before ResourceProfile.
+    """
+    start = slot = release
+    while slot < start + length:
+        if slot < len(usage) and usage[slot] + amount > capacity:
+            start = slot + 1
+        slot += 1
+    return start
+
+def _list_add_remove(usage, start, end, amount):
+    for slot in range(start, end):
+        usage[slot] += amount
+    for slot in range(start, end):
+        usage[slot] -= amount
+
+def profile_microbenchmark(horizons=(1_000, 100_000), lengths=(5, 500), queries=2_000, capacity=23,
+                           decoder_tasks=2_000, seed=0, log=print):
+    """
+    Compare ResourceProfile against plain usage lists.
+
+    For every horizon and task length, the same random range additions, peak
+    queries and earliest-start queries are run on a usage list (slot loops
+    and a scan) and on a ResourceProfile. For every task length, the serial
+    schedule decoder is also timed with both profile kinds.
+
+    Returns:
+    A list of records with the mean time per operation in microseconds (or
+    per decode in milliseconds) for the list and the tree.
+    """
+    records = []
+    rng = np.random.default_rng(seed)
+    for horizon in horizons:
+        for length in lengths:
+            # Half-full profile, then the same operations on both structures
+            usage = rng.integers(0, capacity, horizon).tolist()
+            profile = ResourceProfile.from_usage(capacity, usage)
+            starts = rng.integers(0, max(horizon - length, 1), queries).tolist()
+            amounts = rng.integers(1, capacity // 2, queries).tolist()
+            operations = {
+                # Book and release again, so that the profile stays half full
+                'add_remove': (lambda s, a: _list_add_remove(usage, s, s + length, a),
+                               lambda s, a: (profile.add(s, s + length, a), profile.add(s, s + length, -a))),
+                'max': (lambda s, a: max(usage[s:s + length]),
+                        lambda s, a: profile.max(s, s + length)),
+                'earliest_start': (lambda s, a: _scan_earliest_start(usage, capacity, s, length, a),
+                                   lambda s, a: profile.earliest_start(s, length, a)),
+            }
+            for operation, (with_list, with_tree) in operations.items():
+                timings = {}
+                for kind, function in (('list', with_list), ('tree', with_tree)):
+                    begin = time.perf_counter()
+                    for s, a in zip(starts, amounts):
+                        function(s, a)
+                    timings[kind] = (time.perf_counter() - begin) / queries * 1e6
+                records.append({'benchmark': 'operation', 'operation': operation, 'horizon': horizon,
+                                'length': length, 'list_us': timings['list'], 'tree_us': timings['tree']})
+                if log:
+                    log(f"Profile {operation:<15} horizon={horizon:<8} length={length:<5} "
+                        f"list={timings['list']:.2f}us tree={timings['tree']:.2f}us")
+
+    for length in lengths:
+        taskset = generate_taskset(decoder_tasks, RESOURCE_LIMITS, max_dependencies=3, seed=seed,
+                                   length=(max(length // 5, 1), length))
+        keys = rng.random(decoder_tasks)
+        timings = {}
+        for kind in ('scan', 'tree'):
+            decoder = RepairingEvaluator(taskset, RESOURCE_LIMITS, profile=kind).decoder
+            begin = time.perf_counter()
+            decoder.decode(keys)
+            timings[kind] = (time.perf_counter() - begin) * 1e3
+        records.append({'benchmark': 'decoder', 'num_tasks': decoder_tasks, 'length': length,
+                        'list_ms': timings['scan'], 'tree_ms': timings['tree']})
+        if log:
+            log(f"Decoder tasks={decoder_tasks:<6} length<={length:<5} "
+                f"scan={timings['scan']:.1f}ms tree={timings['tree']:.1f}ms")
+    return records
+
+def flatten(record):
+    """
+    Flatten a result record into a single-level dictionary for CSV output.
+    """
+    row = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            for inner_key, inner_value in value.items():
+                row[f'{key}_{inner_key}'] = inner_value
+        else:
+            row[key] = value
+    return row
+
+def spread_arrivals(tasks, resource_limits, load, rng):
+    """
+    Spread the min_start_time of the tasks uniformly over the horizon in
+    which they offer `load` times the total capacity in resource-time, and
+    mark them all 'Not Running'.
+    """
+    work = sum(task.length * task.resource_req for task in tasks)
+    horizon = max(1, int(work / (sum(resource_limits.values()) * load)))
+    for task in tasks:
+        task.min_start_time = rng.randrange(horizon)
+        task.status = 'Not Running'
+    return horizon
+
+def dispatch_policy_report(task_counts, dependency_counts, resource_limits=RESOURCE_LIMITS, loads=(0.9, 1.0, 1.2),
+                           policies=tuple(POLICIES), low_priority=3, seed=0, log=print):
+    """
+    Compare the dispatch policies of the event-driven greedy engine under
+    sustained load.
+
+    Tasks arrive uniformly over a horizon sized so that they offer `load`
+    times the capacity (see spread_arrivals), and every policy schedules the
+    same task set.
+
+    Returns:
+    A list of records with the wall time, the mean, p95 and maximum wait
+    (start - min_start_time), the mean and maximum wait of tasks with
+    priority <= `low_priority`, the throughput in tasks per time unit and
+    the weighted throughput, per (num_tasks, max_dependencies, load, policy).
+    """
+    records = []
+    for num_tasks in task_counts:
+        for max_dependencies in dependency_counts:
+            for load in loads:
+                random.seed(seed)
+                tasks = generate_random_tasks(num_tasks, resource_limits, max_dependencies,
+                                              csv_filename=None, show_statistics=False)
+                horizon = spread_arrivals(tasks, resource_limits, load, random.Random(seed))
+                by_id = {task.task_id: task for task in tasks}
+                for policy in policies:
+                    run_tasks = copy_tasks(tasks)
+                    start = time.perf_counter()
+                    schedule = schedule_tasks_greedy(run_tasks, resource_limits, engine='event', policy=policy)
+                    wall_time = time.perf_counter() - start
+
+                    waits = np.array([start_time - by_id[task_id].min_start_time for task_id, start_time, _ in schedule])
+                    low = np.array([start_time - by_id[task_id].min_start_time for task_id, start_time, _ in schedule
+                                    if by_id[task_id].priority <= low_priority])
+                    makespan = max(end_time for _, _, end_time in schedule)
+                    metrics = schedule_metrics(schedule, tasks, resource_limits)
+                    record = {'num_tasks': num_tasks, 'max_dependencies': max_dependencies, 'load': load,
+                              'horizon': horizon, 'policy': policy, 'seed': seed, 'wall_time': wall_time,
+                              'mean_wait': float(waits.mean()), 'p95_wait': float(np.percentile(waits, 95)),
+                              'max_wait': int(waits.max()),
+                              'low_priority_mean_wait': float(low.mean()) if len(low) else None,
+                              'low_priority_max_wait': int(low.max()) if len(low) else None,
+                              'throughput': len(schedule) / makespan,
+                              'weighted_throughput': metrics['weighted_throughput']}
+                    records.append(record)
+                    if log:
+                        log(f"policy={policy:<9} tasks={num_tasks:<7} deps={max_dependencies:<3} load={load:<4} "
+                            f"wait mean={record['mean_wait']:.1f} p95={record['p95_wait']:.0f} max={record['max_wait']} "
+                            f"low-priority max={record['low_priority_max_wait']} throughput={record['throughput']:.3f}/t "
+                            f"time={wall_time:.4f}s")
+    return records
+
+def partition_report(task_counts, dependency_counts, resource_limits=RESOURCE_LIMITS, repeat=3, processes=None,
+                     seed=0, log=print):
+    """
+    Time the partitioned greedy engine's process pool against the threaded
+    engine and the single-process event-driven engine.
+
+    The pool is forced on (min_partition_size=0), so it runs whenever the task
+    types split into two or more groups, i.e. when no dependency crosses task
+    types. The speedup of the pool depends on the number of cores, which is
+    recorded with every result.
+
+    Returns:
+    A list of records with the wall time statistics, the number of scheduled
+    tasks, the number of type groups and whether the pool ran, per
+    (num_tasks, max_dependencies, engine).
+    """
+    engines = {
+        'threaded': lambda tasks: schedule_tasks_greedy(tasks, resource_limits),
+        'event': lambda tasks: schedule_tasks_event_driven(tasks, resource_limits),
+        'partitioned-pool': lambda tasks: schedule_tasks_partitioned(tasks, resource_limits, processes=processes,
+                                                                     min_partition_size=0),
+    }
+    records = []
+    for num_tasks in task_counts:
+        for max_dependencies in dependency_counts:
+            tasks = generate_taskset(num_tasks, resource_limits, max_dependencies, seed=seed).to_tasks()
+            groups = len(partition_task_types(tasks, list(resource_limits)))
+            for engine, function in engines.items():
+                wall_times = []
+                for _ in range(repeat):
+                    run_tasks = copy_tasks(tasks)
+                    start = time.perf_counter()
+                    schedule = function(run_tasks)
+                    wall_times.append(time.perf_counter() - start)
+                record = {'num_tasks': num_tasks, 'max_dependencies': max_dependencies, 'engine': engine,
+                          'seed': seed, 'cpu_count': os.cpu_count(), 'groups': groups,
+                          'pool_used': engine == 'partitioned-pool' and groups > 1,
+                          'scheduled_tasks': len(schedule), 'wall_time': summarize(wall_times)}
+                records.append(record)
+                if log:
+                    log(f"engine={engine:<16} tasks={num_tasks:<8} deps={max_dependencies:<3} groups={groups} "
+                        f"pool={record['pool_used']!s:<5} scheduled={len(schedule):<8} "
+                        f"wall p50={record['wall_time']['p50']:.4f}s cores={record['cpu_count']}")
+    return records
+
+def save_results(records, path):
+    """
+    Write result records to a .json or .csv file.
+    """
+    if path.endswith('.csv'):
+        rows = [flatten(record) for record in records]
+        fields = sorted({field for row in rows for field in row})
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, 'w') as f:
+            json.dump(records, f, indent=2)
+
+def load_results(path):
+    """
+    Read result records written by `save_results`.
+    """
+    if path.endswith('.csv'):
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        return [{'scheduler': row['scheduler'], 'num_tasks': int(row['num_tasks']),
+                 'max_dependencies': int(row['max_dependencies']),
+                 'wall_time': {'p50': float(row['wall_time_p50'])}} for row in rows]
+    with open(path) as f:
+        return json.load(f)
+
+def compare_to_baseline(records, baseline, max_slowdown=1.25, statistic='p50'):
+    """
+    Compare median wall times against a baseline.
+
+    Returns:
+    A list of (scheduler, num_tasks, max_dependencies, baseline_time, current_time, ratio)
+    for every grid cell slower than `max_slowdown` times the baseline.
+    """
+    reference = {(r['scheduler'], r['num_tasks'], r['max_dependencies']): r['wall_time'][statistic] for r in baseline}
+    regressions = []
+    for record in records:
+        key = (record['scheduler'], record['num_tasks'], record['max_dependencies'])
+        if key not in reference or reference[key] <= 0:
+            continue
+        current = record['wall_time'][statistic]
+        ratio = current / reference[key]
+        if ratio > max_slowdown:
+            regressions.append(key + (reference[key], current, ratio))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the registered schedulers.")
+    parser.add_argument('--schedulers', nargs='+', choices=list(SCHEDULERS),
+                        help="Schedulers to run (default: all registered except the slow ILP, island GA, "
+                             "simulated annealing and tabu search solvers).")
+    parser.add_argument('--all', action='store_true', help="Run every registered scheduler, including the slow ones.")
+    parser.add_argument('--tasks', nargs='+', type=int, default=[100, 500], help="Task counts of the grid.")
+    parser.add_argument('--dependencies', nargs='+', type=int, default=[0, 5],
+                        help="Maximum number of dependencies per task of the grid.")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per grid cell.")
+    parser.add_argument('--warmup', type=int, default=1, help="Untimed warmup runs per grid cell.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the generated task sets.")
+    parser.add_argument('--output', default='results/benchmark.json', help="Result file (.json or .csv).")
+    parser.add_argument('--baseline', help="Baseline result file to compare against.")
+    parser.add_argument('--max-slowdown', type=float, default=1.25,
+                        help="Allowed ratio of median wall time to the baseline.")
+    parser.add_argument('--warm-start-report', action='store_true',
+                        help="Compare cold and warm-started ILP solves instead of timing the schedulers.")
+    parser.add_argument('--time-limit', type=int, default=30, help="ILP time limit of the warm start report.")
+    parser.add_argument('--profile-microbenchmark', action='store_true',
+                        help="Compare ResourceProfile against usage lists instead.")
+    parser.add_argument('--ga-evaluations-report', action='store_true',
+                        help="Count GA fitness evaluations to a feasible/target schedule per encoding instead.")
+    parser.add_argument('--dispatch-report', action='store_true',
+                        help="Compare wait times and throughput of the greedy dispatch policies under load instead.")
+    parser.add_argument('--partition-report', action='store_true',
+                        help="Time the partitioned engine's process pool against the threaded and event engines instead.")
+    parser.add_argument('--processes', type=int, help="Worker processes of the partition report (default: one per group).")
+    parser.add_argument('--loads', nargs='+', type=float, default=[0.9, 1.0, 1.2],
+                        help="Offered loads (share of the capacity) of the dispatch report.")
+    args = parser.parse_args(argv)
+
+    if args.profile_microbenchmark:
+        records = profile_microbenchmark(seed=args.seed)
+        save_results(records, args.output)
+        print(f"Results written to {args.output}")
+        return 0
+
+    if args.ga_evaluations_report:
+        records = ga_evaluations_report(args.tasks, args.dependencies, seed=args.seed)
+        save_results(records, args.output)
+        print(f"Results written to {args.output}")
+        return 0
+
+    if args.dispatch_report:
+        records = dispatch_policy_report(args.tasks, args.dependencies, loads=args.loads, seed=args.seed)
+        save_results(records, args.output)
+        print(f"Results written to {args.output}")
+        return 0
+
+    if args.partition_report:
+        records = partition_report(args.tasks, args.dependencies, repeat=args.repeat, processes=args.processes,
+                                   seed=args.seed)
+        save_results(records, args.output)
+        print(f"Results written to {args.output}")
+        return 0
+
+    if args.warm_start_report:
+        records = warm_start_report(args.tasks, args.dependencies, time_limit=args.time_limit, seed=args.seed)
+        save_results(records, args.output)
+        print(f"Results written to {args.output}")
+        return 0
+
+    schedulers = args.schedulers
+    if schedulers is None:
+        schedulers = [name for name in SCHEDULERS if args.all or name not in SLOW_SCHEDULERS]
+    records = run_benchmarks(schedulers, args.tasks, args.dependencies,
+                             repeat=args.repeat, warmup=args.warmup, seed=args.seed)
+    save_results(records, args.output)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(records, load_results(args.baseline), args.max_slowdown)
+        for name, num_tasks, max_dependencies, before, after, ratio in regressions:
+            print(f"REGRESSION {name} tasks={num_tasks} deps={max_dependencies}: "
+                  f"{before:.4f}s -> {after:.4f}s ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.max_slowdown:.2f}x of the baseline")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
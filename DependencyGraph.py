@@ -0,0 +1,249 @@
+'''
+Dependency DAG index shared by the schedulers.
+
+The dependency lists of the tasks are turned once into integer adjacency
+arrays (CSR form, for predecessors and successors). On top of that the graph
+provides acyclicity validation, a topological order, level sets, earliest
+start times, critical-path lengths, and counters that answer "have all
+predecessors finished?" in O(1) while a schedule is being built.
+'''
+
+import numpy as np
+
+from TaskSet import TaskSet
+
+def _gather(indptr, indices, rows):
+    """
+    Concatenate the CSR rows `rows` of (indptr, indices).
+
+    Returns:
+    A tuple (values, owners) where owners[k] is the position in `rows` that
+    values[k] came from.
+    """
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    total = int(counts.sum())
+    owners = np.repeat(np.arange(len(rows)), counts)
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return indices[offsets + np.arange(total)], owners
+
+def _unique(values, return_counts=False):
+    """
+    Sorted unique values (and their counts), via one sort and a mask.
+    """
+    values = np.sort(values)
+    first = np.ones(len(values), dtype=bool)
+    first[1:] = values[1:] != values[:-1]
+    if not return_counts:
+        return values[first]
+    starts = np.flatnonzero(first)
+    return values[first], np.diff(np.append(starts, len(values)))
+
+def _csr(rows, values, num_rows):
+    """
+    Build CSR arrays (indptr, indices) from (row, value) pairs.
+    """
+    order = np.argsort(rows, kind='stable')
+    indptr = np.zeros(num_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_rows), out=indptr[1:])
+    return indptr, values[order].astype(np.int64)
+
+
+class PredecessorCounter:
+    """
+    Counts unfinished predecessors of every task during a schedule build.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.remaining = graph.indegree.tolist()
+
+    def is_ready(self, index):
+        """
+        True when all predecessors of the task at `index` have finished.
+        """
+        return self.remaining[index] == 0
+
+    def complete(self, index):
+        """
+        Mark the task at `index` as finished.
+
+        Returns:
+        The positions of the successors that became ready.
+        """
+        ready = []
+        remaining = self.remaining
+        for succ in self.graph.successors(index).tolist():
+            remaining[succ] -= 1
+            if remaining[succ] == 0:
+                ready.append(succ)
+        return ready
+
+
+class DependencyGraph:
+    """
+    Integer adjacency index of the task dependencies.
+
+    Attributes:
+    - task_ids: Task IDs in position order.
+    - lengths, min_start_times: Task attributes as int64 arrays.
+    - pred_indptr, pred_indices: Predecessors (dependencies) in CSR form.
+    - succ_indptr, succ_indices: Successors (dependents) in CSR form.
+    - indegree: Number of distinct predecessors of every task.
+
+    Dependencies on tasks outside the set are ignored and duplicates are merged.
+    """
+
+    def __init__(self, task_ids, parents, children, lengths, min_start_times):
+        self.task_ids = list(task_ids)
+        self.num_tasks = len(self.task_ids)
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.min_start_times = np.asarray(min_start_times, dtype=np.int64)
+
+        # Merge duplicate edges (sorted by child, then parent), then index them by child and by parent
+        keys = _unique(np.asarray(children, dtype=np.int64) * max(self.num_tasks, 1) +
+                         np.asarray(parents, dtype=np.int64))
+        self.children, self.parents = np.divmod(keys, max(self.num_tasks, 1))
+        self.pred_indptr, self.pred_indices = _csr(self.children, self.parents, self.num_tasks)
+        self.succ_indptr, self.succ_indices = _csr(self.parents, self.children, self.num_tasks)
+        self.indegree = np.diff(self.pred_indptr)
+        self._index = None
+        self._levels = None
+
+    @classmethod
+    def from_tasks(cls, tasks):
+        """
+        Build the graph of a list of tasks or a TaskSet.
+        """
+        if isinstance(tasks, TaskSet):
+            children = np.repeat(np.arange(len(tasks)), np.diff(tasks.dep_indptr))
+            return cls([task_id.decode() for task_id in tasks.ids], tasks.dep_indices, children,
+                       tasks.length, tasks.min_start_time)
+        index = {task.task_id: i for i, task in enumerate(tasks)}
+        parents, children = [], []
+        for i, task in enumerate(tasks):
+            for dep in task.dependencies:
+                parent = index.get(dep)
+                if parent is not None:
+                    parents.append(parent)
+                    children.append(i)
+        graph = cls(index.keys(), parents, children,
+                    [task.length for task in tasks], [task.min_start_time for task in tasks])
+        graph._index = index
+        return graph
+
+    @property
+    def num_edges(self):
+        return len(self.parents)
+
+    def index_of(self, task_id):
+        """
+        Position of a task ID, or None if it is not in the graph.
+        """
+        if self._index is None:
+            self._index = {task_id: i for i, task_id in enumerate(self.task_ids)}
+        return self._index.get(task_id)
+
+    def predecessors(self, index):
+        return self.pred_indices[self.pred_indptr[index]:self.pred_indptr[index + 1]]
+
+    def successors(self, index):
+        return self.succ_indices[self.succ_indptr[index]:self.succ_indptr[index + 1]]
+
+    def _compute_levels(self):
+        """
+        Kahn's algorithm, one whole level of the DAG per step.
+        """
+        indegree = self.indegree.copy()
+        level = np.full(self.num_tasks, -1, dtype=np.int64)
+        frontier = np.flatnonzero(indegree == 0)
+        level_sets = []
+        while len(frontier):
+            level[frontier] = len(level_sets)
+            level_sets.append(frontier)
+            succ, _ = _gather(self.succ_indptr, self.succ_indices, frontier)
+            targets, counts = _unique(succ, return_counts=True)
+            indegree[targets] -= counts
+            frontier = targets[indegree[targets] == 0]
+        self._levels = (level, level_sets)
+
+    @property
+    def levels(self):
+        """
+        Level of every task: 0 without dependencies, else 1 + the highest
+        level of its dependencies (-1 for tasks on or behind a cycle).
+        """
+        if self._levels is None:
+            self._compute_levels()
+        return self._levels[0]
+
+    @property
+    def level_sets(self):
+        """
+        List of arrays with the positions of the tasks of each level.
+        """
+        if self._levels is None:
+            self._compute_levels()
+        return self._levels[1]
+
+    def is_acyclic(self):
+        return bool((self.levels >= 0).all())
+
+    def validate(self):
+        """
+        Raise a ValueError if the dependencies contain a cycle.
+        """
+        if not self.is_acyclic():
+            stuck = np.flatnonzero(self.levels < 0)
+            sample = ", ".join(self.task_ids[i] for i in stuck[:10])
+            raise ValueError(f"Dependency cycle: {len(stuck)} tasks cannot be ordered (e.g. {sample})")
+
+    def topological_order(self):
+        """
+        Positions of the tasks in dependency order, level by level. Tasks on
+        or behind a cycle are left out.
+        """
+        if not self.level_sets:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(self.level_sets)
+
+    def earliest_start_times(self):
+        """
+        Earliest start of every task: its min_start_time, or later if a
+        dependency chain cannot finish before that. Tasks on or behind a
+        cycle keep their min_start_time.
+        """
+        earliest = self.min_start_times.copy()
+        for frontier in self.level_sets[1:]:
+            preds, owners = _gather(self.pred_indptr, self.pred_indices, frontier)
+            finish = np.zeros(len(frontier), dtype=np.int64)
+            np.maximum.at(finish, owners, earliest[preds] + self.lengths[preds])
+            earliest[frontier] = np.maximum(earliest[frontier], finish)
+        return earliest
+
+    def critical_path_lengths(self):
+        """
+        Length of the longest chain of task lengths from every task to the
+        end of the DAG, including the task itself.
+        """
+        tail = self.lengths.copy()
+        for frontier in reversed(self.level_sets[:-1]):
+            succ, owners = _gather(self.succ_indptr, self.succ_indices, frontier)
+            longest = np.zeros(len(frontier), dtype=np.int64)
+            np.maximum.at(longest, owners, tail[succ])
+            tail[frontier] = self.lengths[frontier] + longest
+        return tail
+
+    def critical_path_length(self):
+        """
+        Lower bound on the makespan from dependencies and min_start_time alone.
+        """
+        if not self.num_tasks:
+            return 0
+        return int((self.earliest_start_times() + self.lengths).max())
+
+    def completion_tracker(self):
+        """
+        A fresh PredecessorCounter for this graph.
+        """
+        return PredecessorCounter(self)
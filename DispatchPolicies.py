@@ -0,0 +1,359 @@
+'''
+Dispatch policies for the event-driven greedy engines.
+
+The event-driven engines keep the ready tasks of every task type in a queue
+and, whenever resources free up, start the best ready task that still fits.
+The default Greedy.ReadyQueue ranks tasks strictly by (-priority,
+min_start_time), so under sustained load a low-priority task waits until the
+backlog of higher-priority work is gone. The queues here rank ready tasks by
+other keys:
+
+- 'priority': the ReadyQueue order, for comparison.
+- 'aging': priority plus `rate` per time unit spent waiting, so a task that
+  waited long enough outranks every task that became ready after it.
+- 'mlfq': multi-level feedback queues. Tasks enter the level of their length
+  (short tasks first) and move up one level every `boost` time units they
+  wait.
+- 'fair': weighted start-time fair queueing across flows of tasks, by
+  default the priority levels weighted by their priority, so every level
+  gets a share of the resource-time in proportion to its weight.
+- 'sjf': shortest job first, by length.
+
+Every queue keeps its tasks in one IndexedHeap per resource requirement, like
+ReadyQueue's buckets, so that the key of a waiting task can be changed in
+O(log n) (the feedback queues promote tasks this way).
+
+Example:
+    schedule = schedule_tasks_greedy(tasks, RESOURCE_LIMITS, engine='event', policy='aging')
+    schedule = schedule_tasks_greedy(tasks, RESOURCE_LIMITS, engine='event',
+                                     policy=functools.partial(AgingQueue, rate=0.5))
+'''
+
+from bisect import bisect_left
+import heapq
+
+class IndexedHeap:
+    """
+    Binary min-heap of unique, hashable items whose keys can be changed or
+    removed in O(log n) through a position index.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.items = []
+        self.position = {}  # item -> index in the heap arrays
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.position
+
+    def push(self, item, key):
+        if item in self.position:
+            raise ValueError(f"Item {item!r} is already in the heap")
+        self.keys.append(key)
+        self.items.append(item)
+        self.position[item] = len(self.items) - 1
+        self._sift_up(len(self.items) - 1)
+
+    def peek(self):
+        """
+        (key, item) with the smallest key.
+        """
+        return self.keys[0], self.items[0]
+
+    def pop(self):
+        """
+        Remove and return the (key, item) with the smallest key.
+        """
+        key, item = self.keys[0], self.items[0]
+        self._remove_at(0)
+        return key, item
+
+    def key(self, item):
+        return self.keys[self.position[item]]
+
+    def update(self, item, key):
+        """
+        Change the key of an item.
+        """
+        index = self.position[item]
+        previous = self.keys[index]
+        self.keys[index] = key
+        if key < previous:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def remove(self, item):
+        """
+        Remove an item and return its key.
+        """
+        index = self.position[item]
+        key = self.keys[index]
+        self._remove_at(index)
+        return key
+
+    def _remove_at(self, index):
+        # Move the last entry into the hole and restore the heap order around it
+        last = len(self.items) - 1
+        del self.position[self.items[index]]
+        if index != last:
+            self.keys[index], self.items[index] = self.keys[last], self.items[last]
+            self.position[self.items[index]] = index
+        self.keys.pop()
+        self.items.pop()
+        if index < last:
+            self._sift_up(index)
+            self._sift_down(index)
+
+    def _sift_up(self, index):
+        keys, items, position = self.keys, self.items, self.position
+        key, item = keys[index], items[index]
+        while index:
+            parent = (index - 1) >> 1
+            if not key < keys[parent]:
+                break
+            keys[index], items[index] = keys[parent], items[parent]
+            position[items[index]] = index
+            index = parent
+        keys[index], items[index] = key, item
+        position[item] = index
+
+    def _sift_down(self, index):
+        keys, items, position = self.keys, self.items, self.position
+        size = len(items)
+        key, item = keys[index], items[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and keys[child + 1] < keys[child]:
+                child += 1
+            if not keys[child] < key:
+                break
+            keys[index], items[index] = keys[child], items[child]
+            position[items[index]] = index
+            index = child
+        keys[index], items[index] = key, item
+        position[item] = index
+
+
+class DispatchQueue:
+    """
+    Ready tasks of one task type, lowest key first.
+
+    Has the interface of Greedy.ReadyQueue: `push(task, seq, item, now)` and
+    `pop_fitting(free, now)`, where `seq` breaks ties and `now` is the clock
+    of the engine. Subclasses define `key`, and may react to the clock in
+    `advance` and to started tasks in `dispatched`.
+    """
+
+    def __init__(self):
+        self.buckets = {}  # resource_req -> IndexedHeap of items
+        self.entries = {}  # item -> (task, seq, ready time)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def key(self, task, seq, now):
+        """
+        Rank of a task that becomes ready at `now`; must be unique, e.g. by ending in `seq`.
+        """
+        raise NotImplementedError
+
+    def advance(self, now):
+        """
+        Called with the clock before every dispatch.
+        """
+
+    def dispatched(self, task, key, now):
+        """
+        Called when a task is started.
+        """
+
+    def push(self, task, seq, item, now=0):
+        self.entries[item] = (task, seq, now)
+        bucket = self.buckets.get(task.resource_req)
+        if bucket is None:
+            bucket = self.buckets[task.resource_req] = IndexedHeap()
+        bucket.push(item, self.key(task, seq, now))
+
+    def update(self, item, key):
+        """
+        Change the key of a waiting task in O(log n).
+        """
+        self.buckets[self.entries[item][0].resource_req].update(item, key)
+
+    def pop_fitting(self, free, now=0):
+        """
+        Remove and return the item of the best task with resource_req <= free, or None.
+        """
+        self.advance(now)
+        best, best_key = None, None
+        for req, bucket in self.buckets.items():
+            if req <= free and len(bucket):
+                key = bucket.keys[0]
+                if best is None or key < best_key:
+                    best, best_key = req, key
+        if best is None:
+            return None
+        key, item = self.buckets[best].pop()
+        task, _, _ = self.entries.pop(item)
+        self.dispatched(task, key, now)
+        return item
+
+
+class PriorityQueue(DispatchQueue):
+    """
+    Strict (-priority, min_start_time) order, as Greedy.ReadyQueue.
+    """
+
+    def key(self, task, seq, now):
+        return (-task.priority, task.min_start_time, seq)
+
+
+class AgingQueue(DispatchQueue):
+    """
+    Priority aging: the effective priority of a ready task grows by `rate`
+    per time unit it waits.
+
+    Since all waiting tasks age at the same rate, ranking by priority +
+    rate * (now - ready time) is the same at every time as ranking by
+    priority - rate * ready time, so keys never need updating. A task that
+    waited (max priority - min priority) / rate time units outranks every
+    task that became ready after it.
+
+    Parameters:
+    - rate: Priority gained per time unit of waiting.
+    """
+
+    def __init__(self, rate=0.1):
+        super().__init__()
+        self.rate = rate
+
+    def key(self, task, seq, now):
+        return (self.rate * now - task.priority, task.min_start_time, seq)
+
+
+class FeedbackQueue(DispatchQueue):
+    """
+    Multi-level feedback queues for tasks that run to completion.
+
+    A task enters the first level whose quantum covers its length (level
+    len(quanta) for longer tasks), so short tasks go first, by priority
+    within a level. Tasks are not preempted, so instead of being demoted
+    after using their quantum, waiting tasks are promoted one level every
+    `boost` time units, also past the top level, which bounds how long a
+    task can be overtaken by tasks that become ready after it.
+
+    Parameters:
+    - quanta: Increasing task lengths that bound the levels.
+    - boost: Waiting time after which a task moves up one level.
+    """
+
+    def __init__(self, quanta=(1, 2, 4), boost=10):
+        super().__init__()
+        self.quanta = quanta
+        self.boost = boost
+        self.promotions = []  # Heap of (time, seq, item) of the next promotion of waiting tasks
+
+    def key(self, task, seq, now):
+        return (bisect_left(self.quanta, task.length), -task.priority, task.min_start_time, seq)
+
+    def push(self, task, seq, item, now=0):
+        super().push(task, seq, item, now)
+        heapq.heappush(self.promotions, (now + self.boost, seq, item))
+
+    def advance(self, now):
+        promotions = self.promotions
+        while promotions and promotions[0][0] <= now:
+            time, seq, item = heapq.heappop(promotions)
+            # Tasks started in the meantime have left the queue
+            entry = self.entries.get(item)
+            if entry is None or entry[1] != seq:
+                continue
+            level, *rest = self.buckets[entry[0].resource_req].key(item)
+            self.update(item, (level - 1, *rest))
+            heapq.heappush(promotions, (time + self.boost, seq, item))
+
+
+class FairShareQueue(DispatchQueue):
+    """
+    Weighted start-time fair queueing across flows of tasks.
+
+    Every task is charged its length * resource_req divided by the weight of
+    its flow. A task's start tag is the later of the queue's virtual time and
+    the finish tag of the previous task of its flow, and tasks start in
+    start tag order; the virtual time is the start tag of the last started
+    task. Over a busy period, every backlogged flow gets resource-time in
+    proportion to its weight.
+
+    Resources are separate per task type, so flows are formed within the
+    queue of a task type: by default one flow per priority level, weighted
+    by the priority.
+
+    Parameters:
+    - flow: Task attribute that defines the flows.
+    - weights: Dictionary of flow -> weight (default: the attribute value for
+      'priority', 1 for other attributes). Weights must be positive.
+    """
+
+    def __init__(self, flow='priority', weights=None):
+        super().__init__()
+        self.flow = flow
+        self.weights = weights
+        self.virtual_time = 0
+        self.finish = {}  # flow -> finish tag of its last queued task
+
+    def weight(self, flow):
+        if self.weights is not None:
+            weight = self.weights[flow]
+        else:
+            weight = flow if self.flow == 'priority' else 1
+        if not weight > 0:
+            raise ValueError(f"Flow {flow!r} has weight {weight}; fair queueing needs positive weights "
+                             "(pass `weights` when priorities can be 0 or negative)")
+        return weight
+
+    def key(self, task, seq, now):
+        flow = getattr(task, self.flow)
+        start = max(self.virtual_time, self.finish.get(flow, 0))
+        self.finish[flow] = start + task.length * task.resource_req / self.weight(flow)
+        return (start, -task.priority, seq)
+
+    def dispatched(self, task, key, now):
+        self.virtual_time = max(self.virtual_time, key[0])
+
+
+class ShortestJobQueue(DispatchQueue):
+    """
+    Shortest job first by length, then by priority. Minimizes the average
+    wait among tasks that compete for the same resource, but long tasks can
+    wait as long as shorter ones keep arriving.
+    """
+
+    def key(self, task, seq, now):
+        return (task.length, -task.priority, task.min_start_time, seq)
+
+
+# Dispatch policies by name: classes or functions returning a new queue
+POLICIES = {
+    'priority': PriorityQueue,
+    'aging': AgingQueue,
+    'mlfq': FeedbackQueue,
+    'fair': FairShareQueue,
+    'sjf': ShortestJobQueue,
+}
+
+def queue_factory(policy):
+    """
+    Function creating the ready queue of one task type for a policy given by
+    name (see POLICIES) or as a function returning a DispatchQueue.
+    """
+    if callable(policy):
+        return policy
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown dispatch policy: {policy} (expected one of {list(POLICIES)})")
+    return POLICIES[policy]
@@ -1,9 +1,29 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from threading import Lock, Thread
 import heapq
 
-def schedule_tasks_greedy(tasks, resource_limits, task_types=['A', 'B', 'C', 'D']):
+from DependencyGraph import DependencyGraph
+from DispatchPolicies import queue_factory
+from Profiling import phase, profiled
+from ResourceProfile import ResourceProfile
+
+@profiled('greedy')
+def schedule_tasks_greedy(tasks, resource_limits, task_types=['A', 'B', 'C', 'D'], engine='threaded', policy=None):
+    # Dispatch to the other engines when requested
+    if engine == 'event':
+        return schedule_tasks_event_driven(tasks, resource_limits, task_types, policy)
+    if engine == 'partitioned':
+        return schedule_tasks_partitioned(tasks, resource_limits, task_types, policy=policy)
+    if policy is not None:
+        raise ValueError(f"Dispatch policies need the 'event' or 'partitioned' engine, not {engine!r}")
+    if engine == 'backfill':
+        return schedule_tasks_backfill(tasks, resource_limits, task_types)
+    if engine != 'threaded':
+        raise ValueError(f"Unknown greedy engine: {engine}")
+
     # Sort tasks by priority (descending) and min_start_time (ascending)
-    tasks.sort(key=lambda t: (-t.priority, t.min_start_time))
+    tasks = sorted(tasks, key=lambda t: (-t.priority, t.min_start_time))
 
     # Initialize resource usage for each task type
     resource_usage = {task_type: 0 for task_type in task_types}
@@ -79,10 +99,14 @@ def schedule_tasks_greedy(tasks, resource_limits, task_types=['A', 'B', 'C', 'D'
                     completed_task.status = 'Completed'  # Update task status
                     running_task_ids[task.task_type].remove(completed_task_id)  # Remove completed task ID
 
+    def run_task_type(task_type):
+        with phase('greedy.threaded.task_type'):
+            schedule_task_type(task_type)
+
     # Schedule tasks for each task type concurrently using threads
     threads = []
     for task_type in task_types:
-        t = Thread(target=schedule_task_type, args=(task_type,))
+        t = Thread(target=run_task_type, args=(task_type,))
         t.start()
         threads.append(t)
 
@@ -90,4 +114,479 @@ def schedule_tasks_greedy(tasks, resource_limits, task_types=['A', 'B', 'C', 'D'
     for t in threads:
         t.join()
 
-    return schedule
\ No newline at end of file
+    return schedule
+
+
+class ReadyQueue:
+    """
+    Ready tasks of one task type, in (-priority, min_start_time, arrival) order.
+
+    Tasks are bucketed by resource requirement, each bucket being a heap, so the
+    best task that still fits in the free capacity is found by looking at one
+    heap head per distinct requirement. The order does not depend on the
+    clock, so `now` is ignored; DispatchPolicies has queues with the same
+    interface whose order does.
+    """
+
+    def __init__(self):
+        self.buckets = {}  # resource_req -> heap of (-priority, min_start_time, seq, item)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, task, seq, item, now=0):
+        heapq.heappush(self.buckets.setdefault(task.resource_req, []), (-task.priority, task.min_start_time, seq, item))
+        self.size += 1
+
+    def pop_fitting(self, free, now=0):
+        """
+        Remove and return the item of the best task with resource_req <= free, or None.
+        """
+        best = None
+        for req, bucket in self.buckets.items():
+            if req <= free and bucket and (best is None or bucket[0] < self.buckets[best][0]):
+                best = req
+        if best is None:
+            return None
+        self.size -= 1
+        return heapq.heappop(self.buckets[best])[3]
+
+@profiled('greedy.event')
+def schedule_tasks_event_driven(tasks, resource_limits, task_types=['A', 'B', 'C', 'D'], policy=None):
+    """
+    Schedule tasks greedily with a discrete-event simulation.
+
+    Tasks are admitted in (-priority, min_start_time) order, as in the threaded
+    engine, but each task is pushed and popped a bounded number of times instead
+    of rescanning the whole task list at every step. A task becomes ready once
+    all of its dependencies have completed and its min_start_time is reached,
+    and it starts as soon as its task type has enough free resources.
+
+    Parameters:
+    - tasks: List of tasks to schedule.
+    - resource_limits: Dictionary of resource limits per task type.
+    - task_types: Task types to schedule.
+    - policy: Order of the ready tasks instead of (-priority, min_start_time):
+      a name of DispatchPolicies.POLICIES (e.g. 'aging' or 'mlfq') or a
+      function returning a DispatchQueue.
+
+    Returns:
+    A list of (task_id, start_time, end_time) tuples.
+    """
+    # Only tasks that are not already running take part in the schedule
+    candidates = [task for task in tasks if task.task_type in task_types and task.status == 'Not Running']
+
+    # Count unfinished dependencies of every task; dependencies outside the
+    # schedulable set are already satisfied
+    with phase('greedy.event.dependency_graph'):
+        graph = DependencyGraph.from_tasks(candidates)
+        counter = graph.completion_tracker()
+
+    # Ready tasks per task type
+    new_queue = ReadyQueue if policy is None else queue_factory(policy)
+    ready = {task_type: new_queue() for task_type in task_types}
+    free = {task_type: resource_limits[task_type] for task_type in task_types}
+    releases = []     # Heap of (release_time, position) for tasks waiting on min_start_time
+    completions = []  # Heap of (end_time, position) for running tasks
+    schedule = []
+
+    def release(i, now):
+        task = candidates[i]
+        release_time = max(task.min_start_time, now)
+        if release_time > now:
+            heapq.heappush(releases, (release_time, i))
+        else:
+            ready[task.task_type].push(task, i, i, now)
+
+    def dispatch(task_type, now):
+        while True:
+            # Pick the highest-priority ready task among those that fit
+            i = ready[task_type].pop_fitting(free[task_type], now)
+            if i is None:
+                return
+            task = candidates[i]
+            end_time = now + task.length
+            free[task_type] -= task.resource_req
+            task.status = 'Running'
+            schedule.append((task.task_id, now, end_time))
+            heapq.heappush(completions, (end_time, i))
+
+    now = 0
+    for i in range(len(candidates)):
+        if counter.is_ready(i):
+            release(i, now)
+
+    while True:
+        for task_type in task_types:
+            dispatch(task_type, now)
+
+        # Advance the clock to the next completion or release event
+        if not completions and not releases:
+            break
+        now = min(heap[0][0] for heap in (completions, releases) if heap)
+
+        while completions and completions[0][0] <= now:
+            _, i = heapq.heappop(completions)
+            task = candidates[i]
+            free[task.task_type] += task.resource_req
+            task.status = 'Completed'
+            for succ in counter.complete(i):
+                release(succ, now)
+
+        while releases and releases[0][0] <= now:
+            _, i = heapq.heappop(releases)
+            release(i, now)
+
+    return schedule
+
+def partition_task_types(tasks, task_types=['A', 'B', 'C', 'D']):
+    """
+    Group task types that have to be scheduled together.
+
+    Tasks of one type share that type's resources, and a dependency between
+    tasks of two types ties the timing of both types, so types linked by a
+    chain of cross-type dependencies form one group. Different groups can be
+    scheduled independently.
+
+    Returns:
+    A list of lists of task types, in the order of `task_types`.
+    """
+    parent = {task_type: task_type for task_type in task_types}
+
+    def find(task_type):
+        while parent[task_type] != task_type:
+            parent[task_type] = parent[parent[task_type]]
+            task_type = parent[task_type]
+        return task_type
+
+    candidates = [task for task in tasks if task.task_type in parent and task.status == 'Not Running']
+    type_of = {task.task_id: task.task_type for task in candidates}
+    for task in candidates:
+        for dep in task.dependencies:
+            dep_type = type_of.get(dep)
+            if dep_type is not None:
+                parent[find(dep_type)] = find(task.task_type)
+
+    groups = {}
+    for task_type in task_types:
+        groups.setdefault(find(task_type), []).append(task_type)
+    return list(groups.values())
+
+@profiled('greedy.partitioned')
+def schedule_tasks_partitioned(tasks, resource_limits, task_types=['A', 'B', 'C', 'D'],
+                               processes=None, min_partition_size=10_000, policy=None):
+    """
+    Schedule independent groups of task types in parallel processes.
+
+    The task types are split with `partition_task_types` and every group is
+    scheduled with the event-driven engine, so the result is the same as
+    `schedule_tasks_event_driven` up to the order of the entries. Groups run
+    in a ProcessPoolExecutor only when at least two of them have
+    `min_partition_size` tasks or more; otherwise everything runs in this
+    process.
+
+    Splitting is only possible between task types with no dependency across
+    them: DAG components of one type share that type's resource limit, so
+    scheduling them apart would change the schedule. Workloads with random
+    dependencies across types (as drawn by generate_random_tasks) form a
+    single group and always take the single-process path.
+
+    The pool pays a fixed start-up cost (about 20 ms for four workers) and a
+    per-task cost: the parent pickles every task of a group, about a third of
+    the time it takes to schedule the task, and the worker unpickles it. The
+    default `min_partition_size` of 10,000 tasks, about 70 ms of scheduling,
+    keeps the start-up cost small; whether the per-task costs are recovered
+    depends on the number of groups and cores, which
+    `python Benchmark.py --partition-report` measures.
+
+    Parameters:
+    - tasks: List of tasks to schedule.
+    - resource_limits: Dictionary of resource limits per task type.
+    - task_types: Task types to schedule.
+    - processes: Maximum number of worker processes (default: one per group).
+    - min_partition_size: Number of tasks from which a group is worth a process.
+    - policy: Dispatch policy of the event-driven engine (it must be picklable
+      when groups run in worker processes).
+
+    Returns:
+    A list of (task_id, start_time, end_time) tuples sorted by start time.
+    """
+    groups = partition_task_types(tasks, task_types)
+    candidates = [task for task in tasks if task.task_type in task_types and task.status == 'Not Running']
+    group_of = {task_type: g for g, group in enumerate(groups) for task_type in group}
+    partitions = [[] for _ in groups]
+    for task in candidates:
+        partitions[group_of[task.task_type]].append(task)
+
+    large = [g for g, partition in enumerate(partitions) if len(partition) >= min_partition_size]
+    if len(large) < 2:
+        # Single-process fast path
+        return schedule_tasks_event_driven(tasks, resource_limits, task_types, policy)
+
+    schedules = [None] * len(groups)
+    with ProcessPoolExecutor(max_workers=min(processes or len(large), len(large))) as executor:
+        futures = {g: executor.submit(schedule_tasks_event_driven, partitions[g], resource_limits, groups[g], policy)
+                   for g in large}
+        # Small groups are scheduled here while the workers run
+        for g in range(len(groups)):
+            if g not in futures:
+                schedules[g] = schedule_tasks_event_driven(partitions[g], resource_limits, groups[g], policy)
+        for g, future in futures.items():
+            schedules[g] = future.result()
+
+    # The workers updated copies of the tasks; every scheduled task has completed by the end
+    scheduled = {task_id for schedule in schedules for task_id, _, _ in schedule}
+    for task in candidates:
+        if task.task_id in scheduled:
+            task.status = 'Completed'
+    return sorted((entry for schedule in schedules for entry in schedule), key=lambda entry: entry[1])
+
+@profiled('greedy.backfill')
+def schedule_tasks_backfill(tasks, resource_limits, task_types=['A', 'B', 'C', 'D']):
+    """
+    Schedule tasks greedily, backfilling earlier gaps in the resource profiles.
+
+    Tasks are taken in (-priority, min_start_time) order among those whose
+    dependencies are all placed, like the other engines, but instead of
+    following a clock, each task is booked at the earliest start where its
+    task type's ResourceProfile has room for its whole length, after its
+    min_start_time and the end of its dependencies. A lower-priority task
+    can therefore start before a higher-priority one if it fits in a gap.
+    A task that needs more than its type's resource limit is left
+    unscheduled, with its dependents, as in the other engines.
+
+    Parameters:
+    - tasks: List of tasks to schedule.
+    - resource_limits: Dictionary of resource limits per task type.
+    - task_types: Task types to schedule.
+
+    Returns:
+    A list of (task_id, start_time, end_time) tuples sorted by start time.
+    """
+    candidates = [task for task in tasks if task.task_type in task_types and task.status == 'Not Running']
+    with phase('greedy.backfill.dependency_graph'):
+        graph = DependencyGraph.from_tasks(candidates)
+        counter = graph.completion_tracker()
+    profiles = {task_type: ResourceProfile(resource_limits[task_type]) for task_type in task_types}
+    ready_time = [task.min_start_time for task in candidates]
+    schedule = []
+
+    eligible = [(-task.priority, task.min_start_time, i) for i, task in enumerate(candidates) if counter.is_ready(i)]
+    heapq.heapify(eligible)
+    while eligible:
+        _, _, i = heapq.heappop(eligible)
+        task = candidates[i]
+        if task.resource_req > resource_limits[task.task_type]:
+            continue  # It never fits, so its dependents never become eligible either
+        profile = profiles[task.task_type]
+        start_time = profile.earliest_start(ready_time[i], task.length, task.resource_req)
+        end_time = start_time + task.length
+        profile.add(start_time, end_time, task.resource_req)
+        task.status = 'Completed'
+        schedule.append((task.task_id, start_time, end_time))
+
+        for succ in graph.successors(i).tolist():
+            ready_time[succ] = max(ready_time[succ], end_time)
+        for succ in counter.complete(i):
+            succ_task = candidates[succ]
+            heapq.heappush(eligible, (-succ_task.priority, succ_task.min_start_time, succ))
+
+    schedule.sort(key=lambda entry: entry[1])
+    return schedule
+
+class OnlineGreedyScheduler:
+    """
+    Incremental version of the event-driven greedy scheduler.
+
+    Tasks are submitted while the clock runs, and the scheduler emits a
+    (task_id, start_time, end_time) decision whenever a task is started. The
+    dispatching rules are the same as in `schedule_tasks_event_driven`: a task
+    is ready once its dependencies have completed and its min_start_time is
+    reached, and ready tasks start in (-priority, min_start_time, submission)
+    order as soon as their task type has enough free resources.
+
+    Completed tasks are forgotten, so memory is bounded by the number of live
+    (waiting, ready or running) tasks rather than by all tasks ever submitted.
+    As a consequence, a dependency on a task ID that is not live when the
+    dependent task is submitted counts as already satisfied.
+
+    Each submission, release and completion costs O(log n) heap operations,
+    plus one look at the head of each resource-requirement bucket of the
+    task type when dispatching.
+
+    Parameters:
+    - resource_limits: Dictionary of resource limits per task type.
+    - task_types: Task types to schedule (default: all keys of resource_limits).
+    - auto_complete: If True, running tasks complete at their planned end time.
+      If False, they only complete when reported through `completed`.
+    - start_time: Initial value of the clock.
+    - policy: Dispatch policy, as in `schedule_tasks_event_driven`.
+    """
+
+    def __init__(self, resource_limits, task_types=None, auto_complete=True, start_time=0, policy=None):
+        self.task_types = list(resource_limits) if task_types is None else list(task_types)
+        self.auto_complete = auto_complete
+        self.now = start_time
+        self.free = {task_type: resource_limits[task_type] for task_type in self.task_types}
+        new_queue = ReadyQueue if policy is None else queue_factory(policy)
+        self.ready = {task_type: new_queue() for task_type in self.task_types}
+
+        # Live tasks, keyed by task ID
+        self.tasks = {}
+        self.order = {}     # Submission sequence number
+        self.waiting = {}   # Number of live dependencies not yet completed
+        self.waiters = {}   # Live tasks waiting on this one
+        self.running = {}   # Planned end time of running tasks
+
+        self.releases = []     # Heap of (release_time, seq, task_id) for tasks waiting on min_start_time
+        self.completions = []  # Heap of (end_time, seq, task_id) for running tasks
+        self.outbox = deque()  # Decisions not yet consumed
+        self.seq = 0
+
+    def __len__(self):
+        """
+        Number of live tasks.
+        """
+        return len(self.tasks)
+
+    def submit(self, task):
+        """
+        Add a task at the current time. It is considered for dispatch on the
+        next call to `advance`.
+        """
+        if task.task_id in self.tasks:
+            raise ValueError(f"Task {task.task_id} is already scheduled")
+        if task.task_type not in self.free:
+            raise ValueError(f"Unknown task type: {task.task_type}")
+        task_id = task.task_id
+        self.tasks[task_id] = task
+        self.order[task_id] = self.seq
+        self.seq += 1
+
+        # Wait on dependencies that are still live
+        waiting = 0
+        for dep in set(task.dependencies):
+            if dep in self.tasks and dep != task_id:
+                self.waiters.setdefault(dep, []).append(task_id)
+                waiting += 1
+        if waiting:
+            self.waiting[task_id] = waiting
+        else:
+            self._release(task_id)
+
+    def completed(self, task_id):
+        """
+        Report that a running task finished at the current time.
+        """
+        if task_id not in self.running:
+            raise ValueError(f"Task {task_id} is not running")
+        self._complete(task_id)
+
+    def next_event_time(self):
+        """
+        Time of the next release or planned completion, or None if there is none.
+        """
+        times = [heap[0][0] for heap in (self.completions, self.releases) if heap]
+        return min(times) if times else None
+
+    def advance(self, now):
+        """
+        Move the clock to `now`, processing every release and completion up to
+        that time and dispatching ready tasks at each event time.
+        """
+        if now < self.now:
+            raise ValueError(f"Cannot move the clock back from {self.now} to {now}")
+        while True:
+            self._dispatch()
+            event_time = self.next_event_time()
+            if event_time is None or event_time > now:
+                break
+            self.now = event_time
+
+            while self.completions and self.completions[0][0] <= event_time:
+                end_time, _, task_id = heapq.heappop(self.completions)
+                # Skip entries of tasks already reported through `completed`
+                if self.running.get(task_id) == end_time:
+                    self._complete(task_id)
+
+            while self.releases and self.releases[0][0] <= event_time:
+                _, _, task_id = heapq.heappop(self.releases)
+                self._release(task_id)
+        self.now = now
+        self._dispatch()
+
+    def drain(self):
+        """
+        Advance until no more events are pending.
+        """
+        while True:
+            event_time = self.next_event_time()
+            if event_time is None:
+                self.advance(self.now)
+                return
+            self.advance(event_time)
+
+    def decisions(self):
+        """
+        Generator of the (task_id, start_time, end_time) decisions made so far
+        and not yet consumed.
+        """
+        while self.outbox:
+            yield self.outbox.popleft()
+
+    def _release(self, task_id):
+        task = self.tasks[task_id]
+        if task.min_start_time > self.now:
+            heapq.heappush(self.releases, (task.min_start_time, self.order[task_id], task_id))
+        else:
+            self.ready[task.task_type].push(task, self.order[task_id], task_id, self.now)
+
+    def _dispatch(self):
+        for task_type in self.task_types:
+            while True:
+                task_id = self.ready[task_type].pop_fitting(self.free[task_type], self.now)
+                if task_id is None:
+                    break
+                task = self.tasks[task_id]
+                end_time = self.now + task.length
+                self.free[task_type] -= task.resource_req
+                task.status = 'Running'
+                self.running[task_id] = end_time
+                if self.auto_complete:
+                    heapq.heappush(self.completions, (end_time, self.order[task_id], task_id))
+                self.outbox.append((task_id, self.now, end_time))
+
+    def _complete(self, task_id):
+        task = self.tasks.pop(task_id)
+        del self.order[task_id], self.running[task_id]
+        self.free[task.task_type] += task.resource_req
+        task.status = 'Completed'
+        for waiter in self.waiters.pop(task_id, ()):
+            self.waiting[waiter] -= 1
+            if self.waiting[waiter] == 0:
+                del self.waiting[waiter]
+                self._release(waiter)
+
+def schedule_tasks_online(arrivals, resource_limits, task_types=None, policy=None):
+    """
+    Stream greedy scheduling decisions for tasks that arrive over time.
+
+    Parameters:
+    - arrivals: Iterable of (arrival_time, task) pairs in non-decreasing
+      arrival time order; it may be a generator.
+    - resource_limits: Dictionary of resource limits per task type.
+    - task_types: Task types to schedule (default: all keys of resource_limits).
+    - policy: Dispatch policy, as in `schedule_tasks_event_driven`.
+
+    Yields:
+    (task_id, start_time, end_time) tuples as tasks are started.
+    """
+    scheduler = OnlineGreedyScheduler(resource_limits, task_types, policy=policy)
+    for arrival_time, task in arrivals:
+        if arrival_time > scheduler.now:
+            scheduler.advance(arrival_time)
+            yield from scheduler.decisions()
+        scheduler.submit(task)
+    scheduler.drain()
+    yield from scheduler.decisions()
@@ -1,54 +1,460 @@
-from pulp import LpProblem, LpVariable, LpBinary, LpMaximize, lpSum, LpStatus, PULP_CBC_CMD
+import copy
+import os
+import re
+import tempfile
+import time
 
-def schedule_tasks_ilp(tasks, resource_limits):
+from pulp import LpProblem, LpVariable, LpBinary, LpMaximize, LpAffineExpression, LpStatus, PULP_CBC_CMD
+
+from DependencyGraph import DependencyGraph
+from Greedy import schedule_tasks_event_driven
+from Profiling import phase, profiled
+from MetaheuristicAlgorithms import genetic_algorithm
+from TaskSet import TaskSet
+
+@profiled('ilp.build_model')
+def build_ilp_model(tasks, resource_limits, start_windows=None, capacity=None, earliness_weight=0):
+    """
+    Build the time-indexed scheduling model.
+
+    Tasks are indexed by type and by feasible start window once (start windows
+    begin at the earliest start allowed by the dependency chain), and each
+    constraint is built as one affine expression from a prepared term list:
+    - every task starts at most once,
+    - for every task type and time slot, the tasks *running* in that slot fit
+      within the resource limit; slots whose worst-case demand already fits
+      are skipped,
+    - a task can only start once each of its dependencies has finished.
+
+    Parameters:
+    - tasks: List of tasks to schedule.
+    - resource_limits: Dictionary of resource limits.
+    - start_windows: Optional dictionary of task_id -> range of allowed start
+      times. Defaults to [earliest start, max_time_horizon - length].
+    - capacity: Optional dictionary of task_type -> {slot: free capacity} for
+      slots that are partly occupied already; other slots use the limit.
+    - earliness_weight: Objective penalty per time unit a task starts after
+      the beginning of its window.
+
+    Returns:
+    A tuple (prob, task_vars, max_time_horizon) where task_vars maps
+    (task_id, start_time) to its binary variable.
+    """
     # Create a linear programming problem
     prob = LpProblem("Task_Scheduling", LpMaximize)
+    by_id = {task.task_id: task for task in tasks}
+    capacity = capacity or {}
 
-    # Create a binary variable for each task and time slot
-    task_vars = {}
-    max_time_horizon = max(task.length + task.min_start_time for task in tasks)
-
-    for task in tasks:
-        for start_time in range(max_time_horizon - task.length + 1):
-            if start_time >= task.min_start_time:
+    # Feasible start window of every task, and a binary variable per (task, start time)
+    with phase('ilp.variables'):
+        if start_windows is None:
+            max_time_horizon = max(task.length + task.min_start_time for task in tasks)
+            graph = DependencyGraph.from_tasks(tasks)
+            earliest = dict(zip(graph.task_ids, graph.earliest_start_times().tolist()))
+            windows = {task.task_id: range(earliest[task.task_id], max_time_horizon - task.length + 1) for task in tasks}
+        else:
+            windows = start_windows
+            max_time_horizon = max(windows[task.task_id].stop - 1 + task.length for task in tasks)
+        task_vars = {}
+        for task in tasks:
+            for start_time in windows[task.task_id]:
                 task_vars[(task.task_id, start_time)] = LpVariable(f"task_{task.task_id}_{start_time}", cat=LpBinary)
 
     # Objective function: maximize total priority
-    prob += lpSum(task.priority * task_vars[(task.task_id, start_time)]
-                  for task in tasks
-                  for start_time in range(max_time_horizon - task.length + 1)
-                  if (task.task_id, start_time) in task_vars)
-
-    # Resource constraints
-    for start_time in range(max_time_horizon):
-        for task_type in resource_limits:
-            prob += lpSum(task_vars[(task.task_id, start_time)] * task.resource_req
-                          for task in tasks if task.task_type == task_type
-                          if (task.task_id, start_time) in task_vars) <= resource_limits[task_type]
-
-    # Dependency constraints
-    for task in tasks:
-        for dep in task.dependencies:
-            # Check if the dependency exists in tasks
-            dependent_task = next((t for t in tasks if t.task_id == dep), None)
-            if dependent_task is not None:
-                for start_time in range(max_time_horizon - task.length + 1):
-                    if start_time >= task.min_start_time:
-                        prob += lpSum(task_vars[(dep, dep_start)]
-                                     for dep_start in range(max(0, start_time - dependent_task.length + 1), start_time + 1)
-                                     if (dep, dep_start) in task_vars) <= 1
-
-    # Solve the problem with an efficient solver
-    prob.solve(PULP_CBC_CMD(msg=0, timeLimit=300))  # Set a time limit if needed
-
-    # Check the status of the solution
+    with phase('ilp.objective'):
+        prob += LpAffineExpression([(task_vars[(task.task_id, start_time)],
+                                     task.priority - earliness_weight * (start_time - windows[task.task_id].start))
+                                    for task in tasks for start_time in windows[task.task_id]])
+
+    # Each task is scheduled at most once
+    with phase('ilp.assignment_constraints'):
+        for task in tasks:
+            if len(windows[task.task_id]) > 1:
+                prob += LpAffineExpression([(task_vars[(task.task_id, start_time)], 1)
+                                            for start_time in windows[task.task_id]]) <= 1
+
+    # Resource constraints over the tasks running in each slot, per task type
+    with phase('ilp.resource_constraints'):
+        tasks_by_type = {task_type: [] for task_type in resource_limits}
+        for task in tasks:
+            if task.task_type in tasks_by_type:
+                tasks_by_type[task.task_type].append(task)
+        for task_type, typed_tasks in tasks_by_type.items():
+            running = {}  # Slot -> terms of the tasks that may run in it
+            demand = {}   # Slot -> worst-case resource demand
+            for task in typed_tasks:
+                window = windows[task.task_id]
+                if not window:
+                    continue
+                for slot in range(window.start, window.stop - 1 + task.length):
+                    demand[slot] = demand.get(slot, 0) + task.resource_req
+                for start_time in window:
+                    term = (task_vars[(task.task_id, start_time)], task.resource_req)
+                    for slot in range(start_time, start_time + task.length):
+                        running.setdefault(slot, []).append(term)
+            free = capacity.get(task_type, {})
+            for slot in sorted(running):
+                limit = free.get(slot, resource_limits[task_type])
+                if demand[slot] > limit:
+                    prob += LpAffineExpression(running[slot]) <= limit
+
+    # Dependency constraints: starting at s requires the dependency to have finished by s
+    with phase('ilp.dependency_constraints'):
+        for task in tasks:
+            for dep in set(task.dependencies):
+                dependent_task = by_id.get(dep)
+                if dependent_task is None:
+                    continue  # Dependencies outside the task set are ignored
+                dep_window = windows[dep]
+                for start_time in windows[task.task_id]:
+                    finished = [(task_vars[(dep, dep_start)], -1)
+                                for dep_start in dep_window if dep_start + dependent_task.length <= start_time]
+                    prob += LpAffineExpression([(task_vars[(task.task_id, start_time)], 1)] + finished) <= 0
+
+    return prob, task_vars, max_time_horizon
+
+def warm_start_schedule(tasks, resource_limits, source):
+    """
+    Initial schedule to seed the ILP with.
+
+    Parameters:
+    - tasks: List of tasks to schedule.
+    - resource_limits: Dictionary of resource limits.
+    - source: 'greedy' (event-driven greedy engine), 'genetic' (genetic
+      algorithm), 'fill' (no schedule; the incumbent is built entirely by the
+      fill step of `feasible_incumbent`), or an existing schedule, e.g. one
+      from a ScheduleCache.
+
+    Returns:
+    A list of (task_id, start_time, end_time) tuples. The algorithms run on
+    copies of the tasks, all treated as not running, so `tasks` is unchanged.
+    """
+    if isinstance(source, list):
+        # The genetic algorithm returns (task_id, end_time, start_time)
+        return [(task_id, min(a, b), max(a, b)) for task_id, a, b in source]
+    if source == 'fill':
+        return []
+    # Views of a TaskSet share its arrays, so a shallow copy would write through
+    copies = tasks.to_tasks() if isinstance(tasks, TaskSet) else [copy.copy(task) for task in tasks]
+    for task in copies:
+        task.status = 'Not Running'
+    if source == 'greedy':
+        return schedule_tasks_event_driven(copies, resource_limits, list(resource_limits))
+    if source == 'genetic':
+        return warm_start_schedule(copies, resource_limits, genetic_algorithm(copies, resource_limits))
+    raise ValueError(f"Unknown warm start: {source!r}")
+
+def feasible_incumbent(tasks, resource_limits, schedule, task_vars):
+    """
+    Turn a schedule into a feasible incumbent for the ILP.
+
+    Entries are taken in start-time order and kept if their start variable
+    exists, their dependencies were kept and have finished, and their task
+    type still has room in every slot they run in. The tasks left out are
+    then added at their earliest feasible start in order of priority per unit
+    of resource-time, since the ILP maximizes total priority within the
+    horizon while the heuristics that produce the schedule do not.
+
+    Returns:
+    A dictionary of task_id -> start_time.
+    """
+    by_id = {task.task_id: task for task in tasks}
+    allowed = {}  # task_id -> start times that have a variable
+    for task_id, start_time in task_vars:
+        allowed.setdefault(task_id, []).append(start_time)
+    usage = {task_type: {} for task_type in resource_limits}
+    starts = {}
+
+    def fits(task, start_time):
+        if start_time not in task_vars_starts.get(task.task_id, ()):
+            return False
+        if any(dep in by_id and (dep not in starts or starts[dep] + by_id[dep].length > start_time)
+               for dep in task.dependencies):
+            return False
+        used = usage[task.task_type]
+        return all(used.get(slot, 0) + task.resource_req <= resource_limits[task.task_type]
+                   for slot in range(start_time, start_time + task.length))
+
+    def place(task, start_time):
+        used = usage[task.task_type]
+        for slot in range(start_time, start_time + task.length):
+            used[slot] = used.get(slot, 0) + task.resource_req
+        starts[task.task_id] = start_time
+
+    task_vars_starts = {task_id: set(times) for task_id, times in allowed.items()}
+    for task_id, start_time, _ in sorted(schedule, key=lambda entry: entry[1]):
+        task = by_id.get(task_id)
+        if task is not None and task_id not in starts and fits(task, start_time):
+            place(task, start_time)
+
+    # Fill in the remaining tasks; repeat while placing a task frees its dependents
+    pending = sorted((task for task in tasks if task.task_id not in starts and task.task_id in allowed),
+                     key=lambda task: -task.priority / (task.resource_req * task.length or 1))
+    progress = True
+    while pending and progress:
+        progress = False
+        for task in list(pending):
+            if any(dep in by_id and dep not in starts for dep in task.dependencies):
+                continue
+            pending.remove(task)
+            for start_time in sorted(allowed[task.task_id]):
+                if fits(task, start_time):
+                    place(task, start_time)
+                    progress = True
+                    break
+    return starts
+
+def parse_cbc_log(log):
+    """
+    Read solver progress from a CBC log.
+
+    Returns:
+    A dictionary with the time in seconds at which the first integer solution
+    was known (None if there was none), the objective value and the relative
+    gap between the objective and the best bound (0 when solved to optimality).
+    """
+    first_incumbent_time = None
+    waiting_for_time = False
+    objective = bound = None
+    optimal = False
+    for line in log.splitlines():
+        timestamp = re.search(r'\(([\d.]+) seconds\)', line)
+        if first_incumbent_time is None:
+            if 'MIPStart provided solution' in line or re.search(r'[Ss]olution (found )?of -?[\d.]', line):
+                waiting_for_time = True
+            if waiting_for_time and timestamp:
+                first_incumbent_time = float(timestamp.group(1))
+        if line.startswith('Result - Optimal solution found'):
+            optimal = True
+        elif line.startswith('Objective value:'):
+            objective = float(line.split(':')[1])
+        elif line.startswith(('Upper bound:', 'Lower bound:')):
+            bound = float(line.split(':')[1])
+    if waiting_for_time and first_incumbent_time is None:
+        first_incumbent_time = 0.0
+    gap = None
+    if optimal:
+        gap = 0.0
+    elif objective is not None and bound is not None:
+        gap = abs(bound - objective) / max(abs(objective), 1e-9)
+    return {'first_incumbent_time': first_incumbent_time, 'objective': objective, 'gap': gap}
+
+@profiled('ilp')
+def schedule_tasks_ilp(tasks, resource_limits, time_limit=300, stats=None, warm_start=None):
+    """
+    Schedule tasks with an integer linear program solved by CBC.
+
+    Parameters:
+    - tasks: List of tasks to schedule.
+    - resource_limits: Dictionary of resource limits.
+    - time_limit: Solver time limit in seconds.
+    - stats: Optional dictionary that receives the model-build time, solve
+      time, model size, solver status, time to the first incumbent, objective
+      and final gap, and the size of the warm start.
+    - warm_start: Optional initial incumbent: 'greedy', 'genetic', 'fill' or
+      a schedule (see `warm_start_schedule`). It is made feasible and passed
+      to CBC as a MIP start, so a time-limited run always returns at least
+      that. The greedy and genetic schedules do not target the ILP objective
+      and can steer CBC away from its own, better heuristic solutions; 'fill'
+      is the better choice when only a short time limit is available.
+
+    Returns:
+    A list of (task_id, start_time, end_time) tuples, or a message if no
+    feasible solution was found.
+    """
+    build_start = time.perf_counter()
+    prob, task_vars, max_time_horizon = build_ilp_model(tasks, resource_limits)
+    build_time = time.perf_counter() - build_start
+
+    # Map the initial schedule onto the start variables
+    incumbent = {}
+    if warm_start is not None:
+        with phase('ilp.warm_start'):
+            incumbent = feasible_incumbent(tasks, resource_limits,
+                                           warm_start_schedule(tasks, resource_limits, warm_start), task_vars)
+            for (task_id, start_time), var in task_vars.items():
+                var.setInitialValue(1 if incumbent.get(task_id) == start_time else 0)
+
+    # Solve the problem with an efficient solver, keeping the log when stats are wanted
+    log_path = None
+    if stats is not None:
+        fd, log_path = tempfile.mkstemp(suffix='.log')
+        os.close(fd)
+    solve_start = time.perf_counter()
+    with phase('ilp.solve'):
+        prob.solve(PULP_CBC_CMD(msg=0, timeLimit=time_limit, warmStart=warm_start is not None, logPath=log_path))
+    solve_time = time.perf_counter() - solve_start
+
+    if stats is not None:
+        with open(log_path) as f:
+            progress = parse_cbc_log(f.read())
+        os.remove(log_path)
+        stats.update(build_time=build_time, solve_time=solve_time, num_variables=len(task_vars),
+                     num_constraints=len(prob.constraints), status=LpStatus[prob.status],
+                     warm_start_tasks=len(incumbent), **progress)
+
+    # Check the status of the solution (a time-limited run with an incumbent also reports 'Optimal')
     if LpStatus[prob.status] == 'Optimal':
         schedule = []
         for task in tasks:
-            for start_time in range(max_time_horizon - task.length + 1):
-                if (task.task_id, start_time) in task_vars and task_vars[(task.task_id, start_time)].varValue == 1:
+            for start_time in range(task.min_start_time, max_time_horizon - task.length + 1):
+                if (task.task_id, start_time) in task_vars and task_vars[(task.task_id, start_time)].varValue > 0.5:
                     end_time = start_time + task.length
                     schedule.append((task.task_id, start_time, end_time))
         return schedule
     else:
-        return "No optimal solution found"
\ No newline at end of file
+        return "No optimal solution found"
+
+
+def schedulable_order(tasks, resource_limits, graph):
+    """
+    Topological order of the tasks that can ever be scheduled.
+
+    A task is dropped if its resource requirement exceeds the limit of its
+    type, if it lies on a dependency cycle, or if it depends on a dropped task.
+    """
+    usable = [False] * graph.num_tasks
+    order = []
+    for i in graph.topological_order().tolist():  # Tasks on or behind a cycle are not in the order
+        task = tasks[i]
+        usable[i] = task.task_type in resource_limits and task.resource_req <= resource_limits[task.task_type] \
+            and all(usable[dep] for dep in graph.predecessors(i).tolist())
+        if usable[i]:
+            order.append(task)
+    return order
+
+@profiled('ilp_rolling')
+def schedule_tasks_ilp_rolling(tasks, resource_limits, window_size=20, overlap=5, max_window_tasks=200,
+                               time_limit=10, gap=0.01, stats=None):
+    """
+    Schedule tasks with a rolling-horizon sequence of ILPs.
+
+    Each ILP covers the time window [window_start, window_start + window_size)
+    and the highest-priority tasks that can finish in it. Tasks that start
+    before window_start + window_size - overlap are committed; the rest are
+    planned again in the next window, which starts at that point. Committed
+    tasks carry their resource occupancy and completion times into later
+    windows. If a window's ILP finds no solution in time, the window is filled
+    greedily instead, so the result is always a feasible schedule of every
+    task that can be scheduled at all.
+
+    Parameters:
+    - tasks: List of tasks to schedule.
+    - resource_limits: Dictionary of resource limits.
+    - window_size: Length of each ILP time window (at least the longest task).
+    - overlap: Length of the window tail that is re-planned by the next window.
+    - max_window_tasks: Maximum number of tasks in one window's ILP.
+    - time_limit: Solver time limit in seconds per window.
+    - gap: Relative optimality gap at which the solver stops per window.
+    - stats: Optional dictionary that receives the number of windows, the
+      number of greedy fallbacks, and total build and solve times.
+
+    Returns:
+    A list of (task_id, start_time, end_time) tuples.
+    """
+    by_id = {task.task_id: task for task in tasks}
+    order = schedulable_order(tasks, resource_limits, DependencyGraph.from_tasks(tasks))
+    if not order:
+        return []
+    window_size = max(window_size, max(task.length for task in order))
+    step = max(1, window_size - overlap)
+
+    committed = {}  # task_id -> (start_time, end_time)
+    usage = {task_type: {} for task_type in resource_limits}  # Occupancy of committed tasks per slot
+    remaining = list(order)
+    window_start = 0
+    totals = {'windows': 0, 'fallbacks': 0, 'build_time': 0.0, 'solve_time': 0.0}
+
+    while remaining:
+        window_end = window_start + window_size
+
+        # Earliest start of every remaining task given committed and in-window dependencies
+        earliest = {}
+        for task in remaining:  # Topological order, so dependencies come first
+            start = max(task.min_start_time, window_start)
+            for dep in task.dependencies:
+                if dep in committed:
+                    start = max(start, committed[dep][1])
+                elif dep in by_id:
+                    start = max(start, earliest.get(dep, float('inf')) + by_id[dep].length)
+            earliest[task.task_id] = start
+
+        # Pick the highest-priority tasks that fit in the window, together with their dependencies
+        fitting = [task for task in remaining if earliest[task.task_id] + task.length <= window_end]
+        fitting.sort(key=lambda task: (-task.priority, earliest[task.task_id]))
+        selected = set()
+        for task in fitting:
+            if len(selected) == max_window_tasks:
+                break
+            if all(dep in committed or dep in selected or dep not in by_id for dep in task.dependencies):
+                selected.add(task.task_id)
+        if not selected:
+            # Nothing fits yet: jump to the earliest time a remaining task can start
+            window_start = max(window_start + 1, min(start for start in earliest.values() if start != float('inf')))
+            continue
+        window_tasks = [task for task in remaining if task.task_id in selected]
+        windows = {task.task_id: range(earliest[task.task_id], window_end - task.length + 1) for task in window_tasks}
+        capacity = {task_type: {slot: resource_limits[task_type] - used for slot, used in slots.items()}
+                    for task_type, slots in usage.items()}
+
+        build_start = time.perf_counter()
+        prob, task_vars, _ = build_ilp_model(window_tasks, resource_limits, start_windows=windows,
+                                             capacity=capacity, earliness_weight=1 / (window_size + 1))
+        solve_start = time.perf_counter()
+        with phase('ilp.solve'):
+            prob.solve(PULP_CBC_CMD(msg=0, timeLimit=time_limit, gapRel=gap))
+        solve_end = time.perf_counter()
+        totals['windows'] += 1
+        totals['build_time'] += solve_start - build_start
+        totals['solve_time'] += solve_end - solve_start
+
+        if LpStatus[prob.status] == 'Optimal':
+            starts = {task_id: start_time for (task_id, start_time), var in task_vars.items()
+                      if var.varValue is not None and var.varValue > 0.5}
+        else:
+            totals['fallbacks'] += 1
+            starts = _fill_window_greedily(window_tasks, windows, usage, resource_limits)
+
+        # Commit the tasks that start before the overlap, and carry their occupancy forward
+        commit_end = window_start + step
+        for task in window_tasks:
+            start_time = starts.get(task.task_id)
+            if start_time is not None and start_time < commit_end:
+                committed[task.task_id] = (start_time, start_time + task.length)
+                slots = usage[task.task_type]
+                for slot in range(start_time, start_time + task.length):
+                    slots[slot] = slots.get(slot, 0) + task.resource_req
+        remaining = [task for task in remaining if task.task_id not in committed]
+        window_start = commit_end
+
+    if stats is not None:
+        stats.update(totals)
+    return [(task.task_id,) + committed[task.task_id] for task in order]
+
+def _fill_window_greedily(window_tasks, windows, usage, resource_limits):
+    """
+    Place the tasks of a window at their earliest feasible start, by priority.
+    """
+    placed = {}  # task_id -> end time
+    in_window = {task.task_id for task in window_tasks}
+    load = {task_type: dict(slots) for task_type, slots in usage.items()}
+    pending = sorted(window_tasks, key=lambda task: (-task.priority, windows[task.task_id].start))
+    progress = True
+    while pending and progress:
+        progress = False
+        for task in list(pending):
+            deps = [dep for dep in task.dependencies if dep in in_window]
+            if any(dep not in placed for dep in deps):
+                continue  # Wait until the in-window dependencies are placed
+            pending.remove(task)
+            progress = True
+            ready = max([windows[task.task_id].start] + [placed[dep] for dep in deps])
+            slots = load[task.task_type]
+            for start_time in range(ready, windows[task.task_id].stop):
+                if all(slots.get(slot, 0) + task.resource_req <= resource_limits[task.task_type]
+                       for slot in range(start_time, start_time + task.length)):
+                    for slot in range(start_time, start_time + task.length):
+                        slots[slot] = slots.get(slot, 0) + task.resource_req
+                    placed[task.task_id] = start_time + task.length
+                    break
+    return {task.task_id: placed[task.task_id] - task.length for task in window_tasks if task.task_id in placed}
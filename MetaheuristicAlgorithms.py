@@ -10,12 +10,24 @@ Overview of Genetic Algorithms
         Selection: Choosing the best solutions to create the next generation.
         Crossover: Combining parts of two solutions to create new ones.
         Mutation: Making small random changes to solutions to maintain diversity.
+
+    Simulated annealing and tabu search improve a single schedule instead,
+        through shift and swap moves that are evaluated incrementally.
 '''
 
 
+import heapq
+import multiprocessing
+import os
 import random
+import time
 
-import random
+import numpy as np
+
+from DependencyGraph import DependencyGraph
+from Profiling import phase, profiled
+from ResourceProfile import ResourceProfile
+from TaskSet import TaskSet
 
 def create_individual(tasks, max_time_horizon):
     """
@@ -74,6 +86,256 @@ def fitness(schedule, tasks, resource_limits):
         
     return total_priority  # Return total priority score
 
+class BatchFitnessEvaluator:
+    """
+    Evaluate the fitness of a whole population at once.
+
+    The population is encoded as a 2-D start-time matrix with one row per
+    individual and one column per task (in the order of `tasks`), and the
+    resource-limit violations, dependency violations and priority score are
+    computed for all individuals with NumPy array operations.
+
+    With compat=True the scores match `fitness` exactly: resource usage is
+    summed per task type regardless of time, a dependency must appear earlier
+    in the schedule and finish before the task starts, and any violation gives
+    a fitness of 0. With compat=False resource usage is checked per time slot
+    and violations are subtracted from the priority score with a penalty
+    weight, so infeasible schedules are still ranked by how far off they are.
+    """
+
+    def __init__(self, tasks, resource_limits, compat=False, penalty=100, graph=None):
+        """
+        Parameters:
+        - tasks: List of tasks (or a TaskSet) to schedule.
+        - resource_limits: Dictionary of resource limits.
+        - compat: Reproduce the scoring of `fitness`.
+        - penalty: Weight of one unit of violation when compat is False.
+        - graph: DependencyGraph of the tasks, if already built.
+        """
+        taskset = tasks if isinstance(tasks, TaskSet) else TaskSet.from_tasks(tasks)
+        self.compat = compat
+        self.penalty = penalty
+        self.task_ids = [task_id.decode() for task_id in taskset.ids]
+        self.length = taskset.length.astype(np.int64)
+        self.resource_req = taskset.resource_req.astype(np.int64)
+        self.priority_score = -int(taskset.priority.sum())  # Same score as `fitness` for a feasible schedule
+
+        # Map task types onto the rows of the resource limit vector
+        self.resource_types = list(resource_limits.keys())
+        type_rows = np.array([self.resource_types.index(task_type) if task_type in resource_limits else -1
+                              for task_type in taskset.task_types], dtype=np.int64)
+        self.type_row = type_rows[taskset.task_type]
+        self.limits = np.array([resource_limits[task_type] for task_type in self.resource_types], dtype=np.int64)
+
+        # Dependency edges as (task position, dependency position) pairs
+        graph = graph or DependencyGraph.from_tasks(taskset)
+        self.dep_child = graph.children
+        self.dep_parent = graph.parents
+
+        # Checks of the legacy scoring that do not depend on start times
+        totals = np.bincount(self.type_row, weights=self.resource_req, minlength=len(self.limits))
+        missing_deps = not isinstance(tasks, TaskSet) and \
+            sum(len(task.dependencies) for task in tasks) != len(taskset.dep_indices)
+        self.static_feasible = bool((totals <= self.limits).all()) and not missing_deps and \
+            bool((self.dep_parent < self.dep_child).all())
+
+    def encode(self, population):
+        """
+        Encode a list of (task_id, start_time) schedules as a start-time matrix.
+        """
+        return np.array([[start_time for _, start_time in individual] for individual in population], dtype=np.int64)
+
+    def resource_violations(self, starts):
+        """
+        Total resource usage above the limits, summed over task types and time slots.
+        """
+        pop_size, num_tasks = starts.shape
+        ends = starts + self.length
+        horizon = int(ends.max()) + 1
+        num_types = len(self.limits)
+
+        # Build per-individual, per-type usage deltas and integrate them over time
+        rows = np.broadcast_to(self.type_row, starts.shape)
+        base = (np.arange(pop_size)[:, None] * num_types + rows) * horizon
+        weights = np.broadcast_to(self.resource_req, starts.shape).ravel()
+        delta = np.bincount((base + starts).ravel(), weights=weights, minlength=pop_size * num_types * horizon)
+        delta -= np.bincount((base + ends).ravel(), weights=weights, minlength=pop_size * num_types * horizon)
+        usage = np.cumsum(delta.reshape(pop_size, num_types, horizon), axis=2)
+        return np.clip(usage - self.limits[None, :, None], 0, None).sum(axis=(1, 2))
+
+    def dependency_violations(self, starts):
+        """
+        Total time by which tasks start before their dependencies finish.
+        """
+        if not len(self.dep_parent):
+            return np.zeros(len(starts))
+        lateness = starts[:, self.dep_parent] + self.length[self.dep_parent] - starts[:, self.dep_child]
+        return np.clip(lateness, 0, None).sum(axis=1)
+
+    def __call__(self, starts):
+        """
+        Parameters:
+        - starts: Start-time matrix of shape (population_size, number_of_tasks).
+
+        Returns:
+        A NumPy array with the fitness score of every individual.
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        if self.compat:
+            ends = starts + self.length
+            on_time = (ends[:, self.dep_parent] <= starts[:, self.dep_child]).all(axis=1)
+            feasible = on_time & self.static_feasible
+            return np.where(feasible, self.priority_score, 0)
+        violations = self.resource_violations(starts) + self.dependency_violations(starts)
+        return self.priority_score - self.penalty * violations
+
+class SerialScheduleDecoder:
+    """
+    Serial schedule generation scheme: turn a vector of priority keys into a
+    feasible schedule.
+
+    Tasks are placed one at a time, always taking the eligible task (all
+    dependencies placed) with the smallest key, at the earliest time that is
+    not before its min_start_time, its optional release time or the end of
+    its dependencies, and at which its task type has enough free resources
+    for its whole length. Every task is placed once and the heap operations
+    cost O(n log n); the cost of finding the starts depends on the profile:
+    - 'scan' walks the resource profile of the type slot by slot, from the
+      ready time to the end of the task, and books it slot by slot, so a
+      task costs O(length + delay) and the decoder O(n log n + the sum of
+      the lengths and delays). It is the fastest for short tasks.
+    - 'tree' queries and books a ResourceProfile segment tree in O(log T)
+      for a horizon of T slots, plus O(log T) per gap too short for the
+      task that it skips, so the decoder runs in O(n log n + n log T) when
+      few gaps are skipped. Use it for long tasks and busy profiles.
+    """
+
+    def __init__(self, tasks, resource_limits, graph=None, profile='scan'):
+        """
+        Parameters:
+        - tasks: List of tasks (or a TaskSet) to schedule.
+        - resource_limits: Dictionary of resource limits.
+        - graph: DependencyGraph of the tasks, if already built.
+        - profile: 'scan' or 'tree', how the resource profiles are searched.
+
+        Raises a ValueError if the dependencies have a cycle or a task needs
+        more resources than its type's limit, since no feasible schedule exists.
+        """
+        if profile not in ('scan', 'tree'):
+            raise ValueError(f"Unknown profile: {profile}")
+        taskset = tasks if isinstance(tasks, TaskSet) else TaskSet.from_tasks(tasks)
+        self.profile = profile
+        self.graph = graph or DependencyGraph.from_tasks(taskset)
+        self.graph.validate()
+        types = [taskset.task_types[code] for code in taskset.task_type.tolist()]
+        self.length = taskset.length.tolist()
+        self.min_start_time = taskset.min_start_time.tolist()
+        self.resource_req = taskset.resource_req.tolist()
+        self.limit = [resource_limits.get(task_type, 0) for task_type in types]
+        self.type_index = [sorted(resource_limits).index(task_type) if task_type in resource_limits else -1
+                           for task_type in types]
+        too_large = [i for i, req in enumerate(self.resource_req) if req > self.limit[i]]
+        if too_large:
+            raise ValueError(f"{len(too_large)} tasks need more resources than their type's limit")
+        self.successors = [self.graph.successors(i).tolist() for i in range(len(self.length))]
+        self.indegree = self.graph.indegree.tolist()
+
+    def decode(self, keys, release_times=None):
+        """
+        Parameters:
+        - keys: Priority key of every task (smaller is placed first); ties go
+          to the lower position.
+        - release_times: Optional earliest start of every task on top of
+          min_start_time, e.g. the start times of a raw individual.
+
+        Returns:
+        A NumPy array with the start time of every task.
+        """
+        length, req, limit, type_index = self.length, self.resource_req, self.limit, self.type_index
+        successors = self.successors
+        remaining = list(self.indegree)
+        ready_time = list(self.min_start_time) if release_times is None else \
+            [max(a, int(b)) for a, b in zip(self.min_start_time, release_times)]
+        keys = keys.tolist() if isinstance(keys, np.ndarray) else list(keys)
+        num_types = max(type_index, default=-1) + 1
+        tree = self.profile == 'tree'
+        # Resource profile per type
+        if tree:
+            limits = {type_index[i]: limit[i] for i in range(len(length))}
+            usage = [ResourceProfile(limits.get(row, 0)) for row in range(num_types)]
+        else:
+            usage = [[] for _ in range(num_types)]
+        starts = [0] * len(length)
+
+        eligible = [(keys[i], i) for i in range(len(length)) if remaining[i] == 0]
+        heapq.heapify(eligible)
+        while eligible:
+            _, i = heapq.heappop(eligible)
+            profile = usage[type_index[i]]
+            if tree:
+                start = profile.earliest_start(ready_time[i], length[i], req[i])
+                end = start + length[i]
+                profile.add(start, end, req[i])
+            else:
+                room = limit[i] - req[i]
+                # Earliest start at which every slot of the task has room, skipping past full slots
+                start = ready_time[i]
+                slot = start
+                while slot < start + length[i]:
+                    if slot < len(profile) and profile[slot] > room:
+                        start = slot + 1
+                    slot += 1
+                end = start + length[i]
+                if len(profile) < end:
+                    profile.extend([0] * (end - len(profile)))
+                for slot in range(start, end):
+                    profile[slot] += req[i]
+            starts[i] = start
+
+            for succ in successors[i]:
+                if ready_time[succ] < end:
+                    ready_time[succ] = end
+                remaining[succ] -= 1
+                if remaining[succ] == 0:
+                    heapq.heappush(eligible, (keys[succ], succ))
+        return np.array(starts, dtype=np.int64)
+
+
+class RepairingEvaluator:
+    """
+    Fitness of individuals decoded by a SerialScheduleDecoder.
+
+    Each row of the start-time matrix is used as the priority keys of the
+    decoder, so every evaluation scores a feasible schedule. The score is
+    minus the priority-weighted completion time, sum(end_time / priority),
+    so important tasks (low priority numbers, as in `fitness`) are pushed to
+    finish early. `profile` is passed on to the decoder.
+    """
+    compat = False
+
+    def __init__(self, tasks, resource_limits, graph=None, profile='scan'):
+        taskset = tasks if isinstance(tasks, TaskSet) else TaskSet.from_tasks(tasks)
+        self.decoder = SerialScheduleDecoder(taskset, resource_limits, graph, profile)
+        self.task_ids = [task_id.decode() for task_id in taskset.ids]
+        self.length = taskset.length.astype(np.int64)
+        self.weight = 1.0 / np.maximum(taskset.priority.astype(np.float64), 1)
+
+    def decode(self, starts):
+        """
+        Decode every row of a start-time matrix into feasible start times.
+        """
+        return np.array([self.decoder.decode(row) for row in np.atleast_2d(starts)], dtype=np.int64)
+
+    def cost(self, starts):
+        """
+        Priority-weighted completion time of every row of decoded start times.
+        """
+        return ((starts + self.length) * self.weight).sum(axis=1)
+
+    def __call__(self, starts):
+        return -self.cost(self.decode(starts))
+
+@profiled('ga.crossover')
 def crossover(parent1, parent2):
     """
     Create two offspring schedules from two parent schedules.
@@ -91,6 +353,7 @@ def crossover(parent1, parent2):
     child2 = parent2[:crossover_point] + parent1[crossover_point:]
     return child1, child2  # Return the two new child schedules
 
+@profiled('ga.mutate')
 def mutate(individual, tasks, max_time_horizon):
     """
     Randomly mutate a schedule to introduce diversity.
@@ -112,7 +375,245 @@ def mutate(individual, tasks, max_time_horizon):
         # Update the individual's schedule with the new start time
         individual[individual.index(task_to_mutate)] = (task_id, new_start_time)
 
-def genetic_algorithm(tasks, resource_limits, population_size=100, generations=100):
+def start_bounds(tasks, max_time_horizon):
+    """
+    Earliest and latest allowed start time of every task, as two arrays.
+    """
+    if isinstance(tasks, TaskSet):
+        lower, length = tasks.min_start_time.astype(np.int64), tasks.length.astype(np.int64)
+    else:
+        lower = np.array([task.min_start_time for task in tasks], dtype=np.int64)
+        length = np.array([task.length for task in tasks], dtype=np.int64)
+    return lower, max_time_horizon - length
+
+def random_population(population_size, lower, upper, rng):
+    """
+    Create a population as a start-time matrix, one row per individual and
+    one column per task.
+
+    Start times are stored in the smallest integer type that holds the
+    horizon (int16 for the usual instances), so a population of 100
+    individuals of 2000 tasks takes 400 KB instead of the 12.8 MB of the
+    equivalent lists of (task_id, start_time) tuples.
+    """
+    dtype = np.int16 if upper.max(initial=0) < np.iinfo(np.int16).max else np.int32
+    return rng.integers(lower, upper + 1, size=(population_size, len(lower))).astype(dtype)
+
+@profiled('ga.crossover')
+def crossover_population(parents1, parents2, rng, method='one_point', out1=None, out2=None):
+    """
+    Cross pairs of parents row by row.
+
+    Parameters:
+    - parents1, parents2: Start-time matrices of the same shape.
+    - rng: NumPy random generator.
+    - method: 'one_point' (one cut point per pair, as in `crossover`) or
+      'uniform' (every gene taken from either parent with equal chance).
+    - out1, out2: Optional matrices that receive the children.
+
+    Returns:
+    The two children matrices.
+    """
+    num_pairs, num_tasks = parents1.shape
+    if method == 'one_point':
+        points = rng.integers(1, max(num_tasks, 2), size=num_pairs)
+        from_first = np.arange(num_tasks) < points[:, None]
+    elif method == 'uniform':
+        from_first = rng.random(parents1.shape) < 0.5
+    else:
+        raise ValueError(f"Unknown crossover method: {method}")
+    out1 = np.empty_like(parents1) if out1 is None else out1
+    out2 = np.empty_like(parents2) if out2 is None else out2
+    np.copyto(out1, parents1, where=from_first)
+    np.copyto(out1, parents2, where=~from_first)
+    np.copyto(out2, parents2, where=from_first)
+    np.copyto(out2, parents1, where=~from_first)
+    return out1, out2
+
+@profiled('ga.mutate')
+def mutate_population(population, lower, upper, rng, rate=0.1):
+    """
+    Mutate a start-time matrix in place: each individual has a `rate` chance
+    that one random task gets a new random start time, as in `mutate`.
+
+    Returns:
+    The indices of the mutated rows.
+    """
+    rows = np.flatnonzero(rng.random(len(population)) < rate)
+    genes = rng.integers(0, population.shape[1], size=len(rows))
+    population[rows, genes] = rng.integers(lower[genes], upper[genes] + 1)
+    return rows
+
+def truncation_selection(scores, count, rng, tournament_size=None):
+    """
+    Parents drawn uniformly from the better half of the population, as in `evolve`.
+    """
+    best_half = np.argsort(-scores, kind='stable')[:max(len(scores) // 2, 1)]
+    return best_half[rng.integers(0, len(best_half), size=count)]
+
+def tournament_selection(scores, count, rng, tournament_size=3):
+    """
+    Each parent is the fittest of `tournament_size` individuals drawn at random.
+    """
+    entrants = rng.integers(0, len(scores), size=(count, tournament_size))
+    return entrants[np.arange(count), np.argmax(scores[entrants], axis=1)]
+
+# Parent selection: function(scores, count, rng, tournament_size) -> indices of the parents
+SELECTION_METHODS = {
+    'truncation': truncation_selection,
+    'tournament': tournament_selection,
+}
+
+def evolve_population(population, evaluator, lower, upper, generations, rng, crossover_method='one_point',
+                      mutation_rate=0.1, elitism=0, selection='truncation', tournament_size=3,
+                      stall_generations=None, time_budget=None, history=None):
+    """
+    Evolve a start-time matrix for up to a number of generations.
+
+    Every generation, the `elitism` fittest individuals are copied unchanged,
+    and the rest is filled with pairs of children from parents picked by the
+    selection method, crossed over and mutated. The next generation is
+    written into a second buffer that is swapped with the current one.
+    Fitness is only computed for individuals that may have changed: elites
+    and unmutated children of a parent paired with itself keep their score.
+
+    Parameters:
+    - population: Initial start-time matrix.
+    - evaluator: BatchFitnessEvaluator for the tasks.
+    - lower, upper: Allowed start times of every task (see `start_bounds`).
+    - generations: Maximum number of generations.
+    - rng: NumPy random generator.
+    - crossover_method: 'one_point' or 'uniform'.
+    - mutation_rate: Chance that an individual gets one task moved.
+    - elitism: Number of best individuals carried over unchanged.
+    - selection: Key of SELECTION_METHODS ('truncation' or 'tournament').
+    - tournament_size: Number of entrants per tournament.
+    - stall_generations: Stop after this many generations without a new best.
+    - time_budget: Stop once this many seconds have passed.
+    - history: Optional list that receives one dictionary per generation with
+      the best and mean score, the best score so far, the cumulative number
+      of fitness evaluations and the elapsed time.
+
+    Returns:
+    A tuple (population, scores, best, best_score) with the final population
+    and its scores, and the best individual found in any generation.
+    """
+    if selection not in SELECTION_METHODS:
+        raise ValueError(f"Unknown selection method: {selection}")
+    select = SELECTION_METHODS[selection]
+    start_time = time.perf_counter()
+    population_size, num_tasks = population.shape
+    elitism = min(elitism, population_size)
+    num_pairs = (population_size - elitism + 1) // 2
+    # Two buffers with room for all children (one more than the population if the brood is odd)
+    current = np.empty((elitism + 2 * num_pairs, num_tasks), dtype=population.dtype)
+    following = np.empty_like(current)
+    current[:population_size] = population
+    population = current[:population_size]
+    with phase('ga.fitness'):
+        scores = evaluator(population).astype(float)
+    evaluations = population_size
+    best_index = int(np.argmax(scores))
+    best, best_score = population[best_index].copy(), scores[best_index]
+    last_improvement = 0
+
+    for generation in range(generations + 1):
+        if history is not None:
+            history.append({'generation': generation, 'best': float(scores.max()), 'mean': float(scores.mean()),
+                            'best_so_far': float(best_score), 'evaluations': evaluations,
+                            'elapsed': time.perf_counter() - start_time})
+        if generation == generations:
+            break
+        if stall_generations is not None and generation - last_improvement >= stall_generations:
+            break
+        if time_budget is not None and time.perf_counter() - start_time >= time_budget:
+            break
+
+        next_scores = np.full(len(following), np.nan)
+        with phase('ga.selection'):
+            if elitism:
+                elites = np.argpartition(-scores, elitism - 1)[:elitism]
+                following[:elitism] = population[elites]
+                next_scores[:elitism] = scores[elites]
+            parents = select(scores, 2 * num_pairs, rng, tournament_size).reshape(2, num_pairs)
+        with phase('ga.breeding'):
+            children = following[elitism:]
+            crossover_population(population[parents[0]], population[parents[1]], rng, crossover_method,
+                                 children[:num_pairs], children[num_pairs:])
+            mutated = np.zeros(len(children), dtype=bool)
+            mutated[mutate_population(children, lower, upper, rng, mutation_rate)] = True
+            # A child of a parent paired with itself is a copy of it unless mutated
+            same = np.tile(parents[0] == parents[1], 2) & ~mutated
+            next_scores[elitism:][same] = scores[np.tile(parents[0], 2)[same]]
+
+        current, following = following, current
+        population = current[:population_size]
+        scores = next_scores[:population_size]
+        with phase('ga.fitness'):
+            stale = np.flatnonzero(np.isnan(scores))
+            if len(stale):
+                scores[stale] = evaluator(population[stale])
+        evaluations += len(stale)
+
+        generation_best = int(np.argmax(scores))
+        if scores[generation_best] > best_score:
+            best, best_score = population[generation_best].copy(), scores[generation_best]
+            last_improvement = generation + 1
+
+    return population, scores, best, best_score
+
+def evolve(population, tasks, evaluator, max_time_horizon, generations):
+    """
+    Evolve a population for a number of generations.
+
+    Parameters:
+    - population: List of schedules to start from.
+    - tasks: List of tasks for reference.
+    - evaluator: BatchFitnessEvaluator for the tasks.
+    - max_time_horizon: The latest time by which tasks can be scheduled.
+    - generations: Number of generations to evolve.
+
+    Returns:
+    The population after the last generation.
+    """
+    population_size = len(population)
+    for generation in range(generations):
+        # Evaluate the fitness of the whole population at once
+        with phase('ga.fitness'):
+            scores = evaluator(evaluator.encode(population))
+        with phase('ga.selection'):
+            ranking = np.argsort(-scores, kind='stable')  # Sort by fitness score
+
+            # Select the top half of individuals as parents for the next generation
+            selected_parents = [population[i] for i in ranking[:population_size // 2]]
+
+        # Prepare for the next generation
+        with phase('ga.breeding'):
+            next_generation = []
+            while len(next_generation) < population_size:
+                # Select two parents randomly from the selected parents
+                parent1, parent2 = random.choices(selected_parents, k=2)
+                children = crossover(parent1, parent2)  # Create children from parents
+                for child in children:
+                    mutate(child, tasks, max_time_horizon)  # Apply mutation
+                    next_generation.append(child)  # Add child to next generation
+
+        population = next_generation  # Update the population for the next generation
+
+    return population
+
+def to_final_schedule(individual, evaluator):
+    """
+    Convert a (task_id, start_time) schedule to the (task_id, end_time, start_time) output format.
+    """
+    lengths = dict(zip(evaluator.task_ids, evaluator.length.tolist()))
+    return [(task_id, start_time + lengths[task_id], start_time) for task_id, start_time in individual]
+
+@profiled('ga')
+def genetic_algorithm(tasks, resource_limits, population_size=100, generations=100, compat=False,
+                      crossover_method='one_point', mutation_rate=0.1, elitism=0, selection='truncation',
+                      tournament_size=3, stall_generations=None, time_budget=None, history=None,
+                      encoding='raw'):
     """
     Run the genetic algorithm to optimize task scheduling.
     
@@ -121,43 +622,522 @@ def genetic_algorithm(tasks, resource_limits, population_size=100, generations=1
     - resource_limits: Dictionary of resource limits.
     - population_size: Number of individuals in the population.
     - generations: Number of generations to evolve.
+    - compat: Score individuals exactly like `fitness` (see BatchFitnessEvaluator)
+      and evolve lists of (task_id, start_time) tuples with `crossover` and
+      `mutate`, which reproduces earlier results for the same `random` seed.
+    - crossover_method: 'one_point' or 'uniform' (see `crossover_population`).
+    - mutation_rate: Chance that an individual gets one task moved per generation.
+    - elitism: Number of best individuals carried over unchanged each generation.
+    - selection: 'truncation' (random parents from the better half) or 'tournament'.
+    - tournament_size: Number of entrants per tournament.
+    - stall_generations: Stop early after this many generations without improvement.
+    - time_budget: Stop early once this many seconds have passed.
+    - history: Optional list that receives the convergence history, one
+      dictionary per generation (see `evolve_population`).
+    - encoding: 'raw' evolves start times directly and penalizes violations
+      (see BatchFitnessEvaluator). 'repair' uses them as priority keys of a
+      SerialScheduleDecoder, so every individual is a feasible schedule,
+      scored by RepairingEvaluator.
+
+    The options from `elitism` on need the array engine (compat=False).
 
     Returns:
-    The best schedule found after all generations.
+    The best schedule found in any generation.
     """
+    if encoding not in ('raw', 'repair'):
+        raise ValueError(f"Unknown encoding: {encoding}")
+    if compat and (elitism or selection != 'truncation' or stall_generations is not None
+                   or time_budget is not None or history is not None or encoding != 'raw'):
+        raise ValueError("Elitism, selection, early stopping and encoding options require compat=False")
+
     max_time_horizon = max(task.length + task.min_start_time for task in tasks)  # Calculate max time
+    with phase('ga.setup'):
+        if encoding == 'repair':
+            evaluator = RepairingEvaluator(tasks, resource_limits)
+        else:
+            evaluator = BatchFitnessEvaluator(tasks, resource_limits, compat=compat)
 
-    # Create initial population of random schedules
-    population = [create_individual(tasks, max_time_horizon) for _ in range(population_size)]
+    if compat:
+        # Create initial population of random schedules
+        with phase('ga.initial_population'):
+            population = [create_individual(tasks, max_time_horizon) for _ in range(population_size)]
+        population = evolve(population, tasks, evaluator, max_time_horizon, generations)
 
-    for generation in range(generations):
-        # Evaluate the fitness of each individual in the population
-        fitness_scores = [(individual, fitness(individual, tasks, resource_limits)) for individual in population]
-        fitness_scores.sort(key=lambda x: x[1], reverse=True)  # Sort by fitness score
-        
-        # Select the top half of individuals as parents for the next generation
-        selected_parents = fitness_scores[:population_size // 2]
+        # Get the best solution from the final population
+        with phase('ga.fitness'):
+            scores = evaluator(evaluator.encode(population))
+        best_schedule = population[int(np.argmax(scores))]
+    else:
+        # Population as a start-time matrix; the generator is seeded from `random`
+        # so that random.seed still makes runs reproducible
+        rng = np.random.default_rng(random.getrandbits(64))
+        lower, upper = start_bounds(tasks, max_time_horizon)
+        with phase('ga.initial_population'):
+            population = random_population(population_size, lower, upper, rng)
+        _, _, best, _ = evolve_population(population, evaluator, lower, upper, generations, rng,
+                                          crossover_method, mutation_rate, elitism, selection, tournament_size,
+                                          stall_generations, time_budget, history)
+        if encoding == 'repair':
+            best = evaluator.decode(best)[0]
+        best_schedule = list(zip(evaluator.task_ids, best.tolist()))
 
-        # Prepare for the next generation
-        next_generation = []
-        while len(next_generation) < population_size:
-            # Select two parents randomly from the selected parents
-            parent1, parent2 = random.choices(selected_parents, k=2)
-            children = crossover(parent1[0], parent2[0])  # Create children from parents
-            for child in children:
-                mutate(child, tasks, max_time_horizon)  # Apply mutation
-                next_generation.append(child)  # Add child to next generation
+    # Convert the best schedule to the expected format (task_id, end_time, start_time)
+    return to_final_schedule(best_schedule, evaluator)  # Return the final optimized schedule
 
-        population = next_generation  # Update the population for the next generation
+# Island model: migration topologies map (island, number of islands) to the receiving islands
+MIGRATION_TOPOLOGIES = {
+    'ring': lambda island, num_islands: [(island + 1) % num_islands],
+    'fully_connected': lambda island, num_islands: [j for j in range(num_islands) if j != island],
+}
 
-    # Get the best solution from the final population
-    best_schedule = max(population, key=lambda ind: fitness(ind, tasks, resource_limits))
-    
-    # Convert the best schedule to the expected format (task_id, end_time, start_time)
-    final_schedule = []
-    for task_id, start_time in best_schedule:
-        task = next(t for t in tasks if t.task_id == task_id)  # Get task details
-        end_time = start_time + task.length  # Calculate end time
-        final_schedule.append((task_id, end_time, start_time))  # Append to final schedule
-    
-    return final_schedule  # Return the final optimized schedule
\ No newline at end of file
+# Task data held by each island worker, set once by the pool initializer
+_island_state = {}
+
+def _init_island_worker(tasks, resource_limits, compat):
+    _island_state['tasks'] = tasks
+    _island_state['evaluator'] = BatchFitnessEvaluator(tasks, resource_limits, compat=compat)
+    _island_state['max_time_horizon'] = max(task.length + task.min_start_time for task in tasks)
+    _island_state['bounds'] = start_bounds(tasks, _island_state['max_time_horizon'])
+
+def _run_island_epoch(args):
+    """
+    Evolve one island for one migration interval inside a worker.
+
+    Populations travel as start-time matrices, so only integers are pickled.
+    """
+    island_seed, starts, population_size, generations = args
+    tasks = _island_state['tasks']
+    evaluator = _island_state['evaluator']
+    max_time_horizon = _island_state['max_time_horizon']
+
+    # Each (island, epoch) has its own seed, whichever worker runs it
+    if evaluator.compat:
+        random.seed(island_seed)
+        if starts is None:
+            population = [create_individual(tasks, max_time_horizon) for _ in range(population_size)]
+        else:
+            population = [list(zip(evaluator.task_ids, row)) for row in starts.tolist()]
+        population = evolve(population, tasks, evaluator, max_time_horizon, generations)
+        starts = evaluator.encode(population)
+        return starts, evaluator(starts)
+    rng = np.random.default_rng(island_seed)
+    lower, upper = _island_state['bounds']
+    if starts is None:
+        starts = random_population(population_size, lower, upper, rng)
+    starts, scores, _, _ = evolve_population(starts, evaluator, lower, upper, generations, rng)
+    return starts.copy(), scores
+
+def _run_in_process(function, jobs):
+    # Compat epochs seed the global random module; keep the caller's state
+    state = random.getstate()
+    try:
+        return list(map(function, jobs))
+    finally:
+        random.setstate(state)
+
+def island_genetic_algorithm(tasks, resource_limits, num_islands=4, population_size=100, generations=100,
+                             migration_interval=10, migration_size=2, topology='ring', processes=None,
+                             seed=None, compat=False):
+    """
+    Run the genetic algorithm as an island model across CPU cores.
+
+    Every island evolves its own sub-population in a process pool. After each
+    migration interval, the best individuals of every island replace the worst
+    individuals of the islands it sends to under the chosen topology.
+
+    Parameters:
+    - tasks: List of tasks to schedule.
+    - resource_limits: Dictionary of resource limits.
+    - num_islands: Number of sub-populations.
+    - population_size: Number of individuals per island.
+    - generations: Number of generations to evolve.
+    - migration_interval: Number of generations between migrations.
+    - migration_size: Number of individuals each island sends per migration.
+    - topology: Key of MIGRATION_TOPOLOGIES ('ring' or 'fully_connected').
+    - processes: Number of worker processes (1 runs the islands in this process).
+    - seed: Seed that makes the run deterministic.
+    - compat: Score individuals exactly like `fitness` (see BatchFitnessEvaluator).
+
+    Returns:
+    The best schedule found on any island, as (task_id, end_time, start_time) tuples.
+    """
+    if topology not in MIGRATION_TOPOLOGIES:
+        raise ValueError(f"Unknown migration topology: {topology}")
+    if migration_interval < 1:
+        raise ValueError(f"migration_interval must be at least 1, not {migration_interval}")
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    if processes is None:
+        processes = min(num_islands, os.cpu_count() or 1)
+    seeds = np.random.SeedSequence(seed)
+    neighbours = [MIGRATION_TOPOLOGIES[topology](island, num_islands) for island in range(num_islands)]
+
+    # The task data is sent to every worker once, when the pool starts
+    if processes > 1:
+        pool = multiprocessing.Pool(processes, initializer=_init_island_worker,
+                                    initargs=(tasks, resource_limits, compat))
+        run = pool.map
+    else:
+        pool = None
+        _init_island_worker(tasks, resource_limits, compat)
+        run = _run_in_process
+
+    try:
+        populations = [None] * num_islands
+        done = 0
+        while True:
+            epoch_generations = min(migration_interval, generations - done)
+            epoch_seeds = [int(s.generate_state(1)[0]) for s in seeds.spawn(num_islands)]
+            jobs = [(epoch_seeds[island], populations[island], population_size, epoch_generations)
+                    for island in range(num_islands)]
+            results = run(_run_island_epoch, jobs)
+            populations = [starts for starts, _ in results]
+            scores = [island_scores.astype(float) for _, island_scores in results]
+            done += epoch_generations
+            if done >= generations:
+                break
+
+            # Migrate copies of the best individuals over the worst ones of the receiving islands
+            emigrants = [populations[island][np.argsort(-scores[island], kind='stable')[:migration_size]]
+                         for island in range(num_islands)]
+            for island in range(num_islands):
+                for target in neighbours[island]:
+                    worst = np.argsort(scores[target], kind='stable')[:len(emigrants[island])]
+                    populations[target][worst] = emigrants[island]
+                    scores[target][worst] = np.inf  # Do not overwrite immigrants in the same round
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    # Pick the global best across all islands
+    best_island = max(range(num_islands), key=lambda island: scores[island].max())
+    best_row = populations[best_island][int(np.argmax(scores[best_island]))]
+    evaluator = BatchFitnessEvaluator(tasks, resource_limits, compat=compat)
+    return to_final_schedule(list(zip(evaluator.task_ids, best_row.tolist())), evaluator)
+
+
+# Local search: simulated annealing and tabu search over feasible schedules
+
+class LocalSearchState:
+    """
+    A feasible schedule that is changed one move at a time.
+
+    A move is a list of (position, new_start) pairs: shifting one task, or
+    swapping the starts of two tasks of the same type. The state keeps the
+    resource profile of every type and the priority-weighted completion time
+    (the RepairingEvaluator cost), so checking and applying a move only looks
+    at the time slots the moved tasks leave or enter and at their direct
+    dependencies, never at the whole schedule. With the decoder's 'tree'
+    profile, the profiles are ResourceProfile segment trees and a move costs
+    O(log T) per moved task instead of O(length).
+    """
+
+    def __init__(self, decoder, starts, weight):
+        """
+        Parameters:
+        - decoder: SerialScheduleDecoder of the tasks (for the task data and
+          the kind of resource profile).
+        - starts: Feasible start time of every task.
+        - weight: Cost weight of every task's completion time.
+        """
+        self.length, self.req, self.limit = decoder.length, decoder.resource_req, decoder.limit
+        self.type_index = decoder.type_index
+        self.min_start_time = decoder.min_start_time
+        self.successors = decoder.successors
+        self.predecessors = [decoder.graph.predecessors(i).tolist() for i in range(len(self.length))]
+        self.weight = list(weight)
+        self.starts = [int(start) for start in starts]
+        # Tasks may move anywhere up to the makespan of the initial schedule
+        self.horizon = max((start + length for start, length in zip(self.starts, self.length)), default=0)
+        self.usage = [[0] * self.horizon for _ in range(max(self.type_index, default=-1) + 1)]
+        for i, start in enumerate(self.starts):
+            profile = self.usage[self.type_index[i]]
+            for slot in range(start, start + self.length[i]):
+                profile[slot] += self.req[i]
+        self.tree = decoder.profile == 'tree'
+        if self.tree:
+            limits = {type_index: limit for type_index, limit in zip(self.type_index, self.limit)}
+            self.usage = [ResourceProfile.from_usage(limits.get(row, 0), usage)
+                          for row, usage in enumerate(self.usage)]
+        self.cost = sum((start + length) * weight for start, length, weight in
+                        zip(self.starts, self.length, self.weight))
+
+    def window(self, i):
+        """
+        Earliest and latest start of task `i` allowed by its min_start_time,
+        the current starts of its dependencies and dependents, and the horizon.
+        """
+        starts, length = self.starts, self.length
+        lowest = self.min_start_time[i]
+        for pred in self.predecessors[i]:
+            lowest = max(lowest, starts[pred] + length[pred])
+        highest = self.horizon - length[i]
+        for succ in self.successors[i]:
+            highest = min(highest, starts[succ] - length[i])
+        return lowest, highest
+
+    def delta(self, move):
+        """
+        Change of the cost if `move` were applied, or None if it breaks a
+        dependency or a resource limit.
+        """
+        for i, start in move:
+            lowest, highest = self.window(i)
+            if not lowest <= start <= highest:
+                return None
+        if self.tree:
+            return self._tree_delta(move)
+        # Net change of the usage in every slot a moved task enters
+        change = {}
+        for i, start in move:
+            old = self.starts[i]
+            for slot in range(old, old + self.length[i]):
+                key = (self.type_index[i], slot)
+                change[key] = change.get(key, 0) - self.req[i]
+            for slot in range(start, start + self.length[i]):
+                key = (self.type_index[i], slot)
+                change[key] = change.get(key, 0) + self.req[i]
+        limit = {self.type_index[i]: self.limit[i] for i, _ in move}
+        for (type_index, slot), amount in change.items():
+            if amount > 0 and self.usage[type_index][slot] + amount > limit[type_index]:
+                return None
+        return sum((start - self.starts[i]) * self.weight[i] for i, start in move)
+
+    def _tree_delta(self, move):
+        # Take the moved tasks out, book them at their new starts one by one, then undo it all
+        for i, _ in move:
+            self.usage[self.type_index[i]].add(self.starts[i], self.starts[i] + self.length[i], -self.req[i])
+        booked = []
+        for i, start in move:
+            profile = self.usage[self.type_index[i]]
+            if profile.max(start, start + self.length[i]) + self.req[i] > self.limit[i]:
+                break
+            profile.add(start, start + self.length[i], self.req[i])
+            booked.append((i, start))
+        fits = len(booked) == len(move)
+        for i, start in booked:
+            self.usage[self.type_index[i]].add(start, start + self.length[i], -self.req[i])
+        for i, _ in move:
+            self.usage[self.type_index[i]].add(self.starts[i], self.starts[i] + self.length[i], self.req[i])
+        if not fits:
+            return None
+        return sum((start - self.starts[i]) * self.weight[i] for i, start in move)
+
+    def apply(self, move, delta):
+        """
+        Apply a move whose `delta` was computed on the current state.
+        """
+        for i, start in move:
+            profile = self.usage[self.type_index[i]]
+            if self.tree:
+                profile.add(self.starts[i], self.starts[i] + self.length[i], -self.req[i])
+                profile.add(start, start + self.length[i], self.req[i])
+            else:
+                for slot in range(self.starts[i], self.starts[i] + self.length[i]):
+                    profile[slot] -= self.req[i]
+                for slot in range(start, start + self.length[i]):
+                    profile[slot] += self.req[i]
+            self.starts[i] = start
+        self.cost += delta
+
+    def random_move(self, rng, swap_rate, same_type, max_shift):
+        """
+        Draw a random move: a swap of two tasks of the same type with
+        probability `swap_rate`, otherwise a shift of one task by up to
+        `max_shift` time units within its window. Returns None if the draw
+        does not change anything.
+        """
+        i = rng.randrange(len(self.starts))
+        if rng.random() < swap_rate:
+            peers = same_type[self.type_index[i]]
+            j = peers[rng.randrange(len(peers))]
+            if self.starts[i] == self.starts[j]:
+                return None
+            return [(i, self.starts[j]), (j, self.starts[i])]
+        lowest, highest = self.window(i)
+        start = self.starts[i]
+        start = rng.randint(max(lowest, start - max_shift), min(highest, start + max_shift))
+        return None if start == self.starts[i] else [(i, start)]
+
+def _initial_search_state(tasks, resource_limits, profile):
+    """
+    Local search state of the serial schedule of the tasks in order of
+    min_start_time, and the task IDs by position.
+    """
+    taskset = TaskSet.from_tasks(tasks)
+    decoder = SerialScheduleDecoder(taskset, resource_limits, profile=profile)
+    starts = decoder.decode(taskset.min_start_time)
+    weight = (1.0 / np.maximum(taskset.priority.astype(np.float64), 1)).tolist()
+    state = LocalSearchState(decoder, starts, weight)
+    same_type = {}
+    for i, type_index in enumerate(state.type_index):
+        same_type.setdefault(type_index, []).append(i)
+    return state, same_type, [task_id.decode() for task_id in taskset.ids]
+
+def _local_search_schedule(task_ids, starts, lengths):
+    """
+    Standard (task_id, start_time, end_time) schedule, ordered by start time.
+    """
+    schedule = [(task_id, start, start + length) for task_id, start, length in zip(task_ids, starts, lengths)]
+    schedule.sort(key=lambda entry: entry[1])
+    return schedule
+
+@profiled('sa')
+def simulated_annealing(tasks, resource_limits, iterations=1_000_000, time_budget=None, initial_temperature=None,
+                        final_temperature_ratio=1e-3, swap_rate=0.3, max_shift=10, profile='scan', history=None):
+    """
+    Improve a serial schedule with simulated annealing.
+
+    Starting from the serial schedule in min_start_time order, random shift
+    and swap moves that keep the schedule feasible are accepted when they
+    lower the priority-weighted completion time, sum(end_time / priority),
+    and otherwise with probability exp(-delta / temperature). The temperature
+    falls geometrically from `initial_temperature` to
+    `initial_temperature * final_temperature_ratio` over the iterations or
+    the time budget, whichever runs out first.
+
+    Parameters:
+    - tasks: List of tasks to schedule.
+    - resource_limits: Dictionary of resource limits.
+    - iterations: Maximum number of proposed moves.
+    - time_budget: Stop once this many seconds have passed.
+    - initial_temperature: Starting temperature (default: such that an average
+      worsening move is accepted half of the time).
+    - final_temperature_ratio: Final temperature relative to the initial one.
+    - swap_rate: Share of the moves that swap two tasks instead of shifting one.
+    - max_shift: Largest distance a shift moves a task.
+    - profile: 'scan' or 'tree', how resource profiles are kept (see LocalSearchState).
+    - history: Optional list that receives a dictionary with the iteration,
+      temperature, current and best cost and elapsed time every 1000 iterations.
+
+    Returns:
+    The best schedule found, as (task_id, start_time, end_time) tuples.
+    """
+    start_time = time.perf_counter()
+    rng = random.Random(random.getrandbits(64))
+    with phase('sa.setup'):
+        state, same_type, task_ids = _initial_search_state(tasks, resource_limits, profile)
+    if not task_ids:
+        return []
+
+    if initial_temperature is None:
+        # Mean worsening of a sample of feasible moves, accepted with probability 1/2
+        worse = [delta for delta in (state.delta(move) for move in
+                                     (state.random_move(rng, swap_rate, same_type, max_shift) for _ in range(200))
+                                     if move is not None)
+                 if delta is not None and delta > 0]
+        initial_temperature = (sum(worse) / len(worse) if worse else 1.0) / np.log(2)
+
+    best_starts, best_cost = list(state.starts), state.cost
+    at_best = True  # Copy the best starts lazily, when a worse move leaves them
+    temperature = initial_temperature
+    with phase('sa.search'):
+        for iteration in range(iterations):
+            if iteration % 1000 == 0:
+                elapsed = time.perf_counter() - start_time
+                if history is not None:
+                    history.append({'iteration': iteration, 'temperature': temperature, 'cost': state.cost,
+                                    'best': best_cost, 'elapsed': elapsed})
+                if time_budget is not None and elapsed >= time_budget:
+                    break
+                progress = iteration / iterations
+                if time_budget is not None:
+                    progress = max(progress, elapsed / time_budget)
+                temperature = initial_temperature * final_temperature_ratio ** progress
+
+            move = state.random_move(rng, swap_rate, same_type, max_shift)
+            if move is None:
+                continue
+            delta = state.delta(move)
+            if delta is None or (delta > 0 and rng.random() >= np.exp(-delta / temperature)):
+                continue
+            if delta > 0 and at_best:
+                best_starts, at_best = list(state.starts), False
+            state.apply(move, delta)
+            if state.cost < best_cost - 1e-9:
+                best_cost, at_best = state.cost, True
+
+    if at_best:
+        best_starts = state.starts
+    return _local_search_schedule(task_ids, best_starts, state.length)
+
+@profiled('tabu')
+def tabu_search(tasks, resource_limits, iterations=10_000, time_budget=None, candidates=50, tenure=None,
+                swap_rate=0.3, max_shift=10, profile='scan', history=None):
+    """
+    Improve a serial schedule with tabu search.
+
+    Starting from the serial schedule in min_start_time order, every
+    iteration draws a sample of feasible shift and swap moves and applies the
+    best one, even if it is worse than the current schedule. Tasks that were
+    just moved are tabu for `tenure` iterations, unless moving them gives a
+    new best schedule. The cost is the priority-weighted completion time,
+    sum(end_time / priority).
+
+    Parameters:
+    - tasks: List of tasks to schedule.
+    - resource_limits: Dictionary of resource limits.
+    - iterations: Maximum number of applied moves.
+    - time_budget: Stop once this many seconds have passed.
+    - candidates: Number of moves drawn per iteration.
+    - tenure: Number of iterations a moved task stays tabu (default: the
+      square root of the number of tasks, at least 7).
+    - swap_rate: Share of the moves that swap two tasks instead of shifting one.
+    - max_shift: Largest distance a shift moves a task.
+    - profile: 'scan' or 'tree', how resource profiles are kept (see LocalSearchState).
+    - history: Optional list that receives a dictionary with the iteration,
+      current and best cost and elapsed time every 100 iterations.
+
+    Returns:
+    The best schedule found, as (task_id, start_time, end_time) tuples.
+    """
+    start_time = time.perf_counter()
+    rng = random.Random(random.getrandbits(64))
+    with phase('tabu.setup'):
+        state, same_type, task_ids = _initial_search_state(tasks, resource_limits, profile)
+    if not task_ids:
+        return []
+    if tenure is None:
+        tenure = max(7, int(len(task_ids) ** 0.5))
+
+    tabu_until = [0] * len(task_ids)
+    best_starts, best_cost = list(state.starts), state.cost
+    at_best = True  # Copy the best starts lazily, when a worse move leaves them
+    with phase('tabu.search'):
+        for iteration in range(iterations):
+            if iteration % 100 == 0:
+                elapsed = time.perf_counter() - start_time
+                if history is not None:
+                    history.append({'iteration': iteration, 'cost': state.cost, 'best': best_cost,
+                                    'elapsed': elapsed})
+                if time_budget is not None and elapsed >= time_budget:
+                    break
+
+            # Best admissible move of the sample
+            chosen, chosen_delta = None, None
+            for _ in range(candidates):
+                move = state.random_move(rng, swap_rate, same_type, max_shift)
+                if move is None:
+                    continue
+                delta = state.delta(move)
+                if delta is None or (chosen is not None and delta >= chosen_delta):
+                    continue
+                tabu = any(tabu_until[i] > iteration for i, _ in move)
+                if tabu and state.cost + delta >= best_cost - 1e-9:
+                    continue
+                chosen, chosen_delta = move, delta
+            if chosen is None:
+                continue
+
+            if chosen_delta > 0 and at_best:
+                best_starts, at_best = list(state.starts), False
+            state.apply(chosen, chosen_delta)
+            for i, _ in chosen:
+                tabu_until[i] = iteration + tenure
+            if state.cost < best_cost - 1e-9:
+                best_cost, at_best = state.cost, True
+
+    if at_best:
+        best_starts = state.starts
+    return _local_search_schedule(task_ids, best_starts, state.length)
@@ -1,5 +1,10 @@
+import numpy as np
 import pandas as pd
 
+from Profiling import phase, profiled
+from ResourceProfile import ResourceProfile
+from TaskSet import TaskSet
+
 def normalize(values):
     min_value = min(values)
     max_value = max(values)
@@ -180,6 +185,189 @@ def calculate_average_wait_time(tasks, schedule):
     average_wait_time = total_wait_time / len(tasks) if tasks else 0
     return average_wait_time
 
+class MetricsEngine:
+    """
+    Computes all the metrics of `measure_metrics` from NumPy arrays.
+
+    Task attributes are looked up through one ID index built up front, and
+    resource utilization is computed with a sorted start/end sweep line per
+    task type, so a full evaluation costs O(n log n) instead of O(n^2) or
+    worse. Schedule entries can be added one at a time as they arrive; the
+    scalar metrics are kept as running totals and the utilization profile is
+    rebuilt from the stored entries when requested.
+    """
+
+    def __init__(self, tasks, resource_limits):
+        """
+        Args:
+            tasks (list): A list of Task objects (or a TaskSet).
+            resource_limits (dict): A dictionary of resource limits for each task type.
+        """
+        self.resource_limits = resource_limits
+        self.resource_types = list(resource_limits.keys())
+        if isinstance(tasks, TaskSet):
+            self.task_ids = [task_id.decode() for task_id in tasks.ids]
+            lengths, priorities = tasks.length.astype(np.int64), tasks.priority.astype(np.int64)
+            resource_reqs, min_start_times = tasks.resource_req.astype(np.int64), tasks.min_start_time.astype(np.int64)
+            task_types = [tasks.task_types[code] for code in tasks.task_type]
+        else:
+            self.task_ids = [task.task_id for task in tasks]
+            lengths = np.array([task.length for task in tasks], dtype=np.int64)
+            priorities = np.array([task.priority for task in tasks], dtype=np.int64)
+            resource_reqs = np.array([task.resource_req for task in tasks], dtype=np.int64)
+            min_start_times = np.array([task.min_start_time for task in tasks], dtype=np.int64)
+            task_types = [task.task_type for task in tasks]
+        self.index = {task_id: i for i, task_id in enumerate(self.task_ids)}
+        self.num_tasks = len(self.task_ids)
+        self.lengths = lengths
+        self.resource_reqs = resource_reqs
+        self.min_start_times = min_start_times
+        self.type_rows = np.array([self.resource_types.index(task_type) if task_type in resource_limits else -1
+                                   for task_type in task_types], dtype=np.int64)
+
+        # Per-task weights of the weighted throughput, computed once
+        if self.num_tasks:
+            weights = (1 - self._normalize(priorities)) * 0.4 + self._normalize(lengths) * 0.4 + \
+                self._normalize(resource_reqs) * 0.2
+            self.weighted_lengths = weights * lengths
+        else:
+            self.weighted_lengths = np.zeros(0)
+        self.high_priority = priorities >= 3
+        self.num_high_priority = int(self.high_priority.sum())
+        self.total_task_time = int(lengths.sum())
+
+        # Stored schedule entries and running totals
+        self.positions = []
+        self.first_times = []   # First time field of each entry
+        self.second_times = []  # Second time field of each entry
+        self.weighted_work = []
+        self.max_first = None
+        self.max_second = None
+        self.high_priority_completed = 0
+        self.total_wait_time = 0
+
+    @staticmethod
+    def _normalize(values):
+        value_range = values.max() - values.min()
+        if value_range == 0:
+            raise ZeroDivisionError("float division by zero")
+        return (values - values.min()) / value_range
+
+    def add(self, entry):
+        """
+        Add one schedule entry (task_id, start_time, end_time).
+        """
+        task_id, first, second = entry
+        position = self.index[task_id]
+        self.positions.append(position)
+        self.first_times.append(first)
+        self.second_times.append(second)
+        self.weighted_work.append(self.weighted_lengths[position])
+        self.max_first = first if self.max_first is None else max(self.max_first, first)
+        self.max_second = second if self.max_second is None else max(self.max_second, second)
+        self.high_priority_completed += int(self.high_priority[position])
+        self.total_wait_time += max(0, first - int(self.min_start_times[position]))
+        return self
+
+    def extend(self, schedule):
+        """
+        Add several schedule entries.
+        """
+        for entry in schedule:
+            self.add(entry)
+        return self
+
+    @profiled('metrics.weighted_throughput')
+    def weighted_throughput(self):
+        if not self.positions:
+            raise ValueError("The schedule is empty")
+        # Cumulative sum keeps the left-to-right accumulation order of calculate_weighted_throughput
+        total_weighted_work_units = float(np.cumsum(self.weighted_work)[-1])
+        total_time = self.max_first
+        return total_weighted_work_units / total_time if total_time > 0 else 0
+
+    @profiled('metrics.makespan')
+    def makespan(self):
+        return self.max_second if self.positions else 0
+
+    @profiled('metrics.task_utilization_rate')
+    def task_utilization_rate(self):
+        if not self.positions:
+            return 0
+        return self.total_task_time / (self.num_tasks * self.max_second)
+
+    @profiled('metrics.priority_satisfaction')
+    def priority_satisfaction(self):
+        return self.high_priority_completed / self.num_high_priority
+
+    @profiled('metrics.average_wait_time')
+    def average_wait_time(self):
+        return self.total_wait_time / self.num_tasks if self.num_tasks else 0
+
+    @profiled('metrics.resource_utilization')
+    def resource_utilization(self):
+        """
+        Utilization percentage per task type at every distinct time point of the schedule.
+        """
+        firsts = np.array(self.first_times, dtype=np.int64)
+        seconds = np.array(self.second_times, dtype=np.int64)
+        time_points = np.unique(np.concatenate([firsts, seconds]))
+        positions = np.array(self.positions, dtype=np.int64)
+        rows = self.type_rows[positions] if len(positions) else positions
+        reqs = self.resource_reqs[positions] if len(positions) else positions
+
+        utilization = {}
+        for row, task_type in enumerate(self.resource_types):
+            # An entry is running at t when start <= t < end; entries with start >= end never run
+            active = (rows == row) & (firsts < seconds)
+            starts, ends, weights = firsts[active], seconds[active], reqs[active]
+            start_order, end_order = np.argsort(starts, kind='stable'), np.argsort(ends, kind='stable')
+            started = np.concatenate([[0], np.cumsum(weights[start_order])])
+            ended = np.concatenate([[0], np.cumsum(weights[end_order])])
+            usage = started[np.searchsorted(starts[start_order], time_points, side='right')] - \
+                ended[np.searchsorted(ends[end_order], time_points, side='right')]
+            utilization[task_type] = (usage / self.resource_limits[task_type] * 100).tolist()
+        return utilization
+
+    @profiled('metrics.resource_profiles')
+    def resource_profiles(self):
+        """
+        Usage of every task type over time as ResourceProfile segment trees,
+        for interval queries such as the peak usage in a window or the
+        earliest start at which another task would fit.
+
+        Returns:
+            dict: A ResourceProfile per task type, with the resource limit as capacity.
+        """
+        # Entries may be (task_id, start, end) or the genetic algorithm's (task_id, end, start)
+        firsts = np.array(self.first_times, dtype=np.int64)
+        seconds = np.array(self.second_times, dtype=np.int64)
+        starts, ends = np.minimum(firsts, seconds), np.maximum(firsts, seconds)
+        positions = np.array(self.positions, dtype=np.int64)
+        rows = self.type_rows[positions] if len(positions) else positions
+        reqs = self.resource_reqs[positions] if len(positions) else positions
+        horizon = int(ends.max()) if len(ends) else 0
+
+        profiles = {}
+        for row, task_type in enumerate(self.resource_types):
+            # Difference array of the running entries, then its prefix sum
+            active = (rows == row) & (starts >= 0)
+            delta = np.zeros(horizon + 1, dtype=np.int64)
+            np.add.at(delta, starts[active], reqs[active])
+            np.add.at(delta, ends[active], -reqs[active])
+            usage = np.cumsum(delta[:horizon]).tolist()
+            profiles[task_type] = ResourceProfile.from_usage(self.resource_limits[task_type], usage)
+        return profiles
+
+    def metrics(self):
+        """
+        Returns:
+            tuple: The same tuple as `measure_metrics`.
+        """
+        return (self.weighted_throughput(), self.makespan(), self.task_utilization_rate(),
+                self.priority_satisfaction(), self.resource_utilization(), self.average_wait_time())
+
+@profiled('metrics')
 def measure_metrics(schedule, tasks, resource_limits):
     """
     Measures the various metrics for the given schedule, tasks, and resource limits.
@@ -192,16 +380,18 @@ def measure_metrics(schedule, tasks, resource_limits):
     Returns:
         tuple: A tuple containing the measured metrics (weighted_throughput, makespan, task_utilization_rate, priority_satisfaction, resource_utilization).
     """
-    weighted_throughput = calculate_weighted_throughput(schedule, tasks)
+    with phase('metrics.index'):
+        engine = MetricsEngine(tasks, resource_limits).extend(schedule)
+    weighted_throughput = engine.weighted_throughput()
     # print(f"weighted throughput: {weighted_throughput}")
-    makespan = calculate_makespan(schedule)
+    makespan = engine.makespan()
     # print(f"makespan: {makespan}")
-    task_utilization_rate = calculate_task_utilization_rate(schedule, tasks)
+    task_utilization_rate = engine.task_utilization_rate()
     # print(f"task utilisation rate: {task_utilization_rate}")
-    priority_satisfaction = calculate_priority_satisfaction(schedule, tasks)
+    priority_satisfaction = engine.priority_satisfaction()
     # print(f"priority satisfaction: {priority_satisfaction}")
-    resource_utilization = calculate_resource_utilization(schedule, tasks, resource_limits)
-    task_avg_wait_time = calculate_average_wait_time(tasks, schedule)
+    resource_utilization = engine.resource_utilization()
+    task_avg_wait_time = engine.average_wait_time()
     # print(f"task avg wait time: {task_avg_wait_time}")
     # print(f"DEBUG Metrics: task_avg_wait_time: {task_avg_wait_time}")
     # print(f"DEBUG Metrics: throughput: {throughput}")
@@ -0,0 +1,193 @@
+'''
+Per-phase timing instrumentation for the schedulers.
+
+Code marks its phases with the `phase` context manager or the `profiled`
+decorator. Nothing is recorded unless a Profiler is active, and then every
+phase records its wall time, call count and the net number of memory blocks
+it allocated. While disabled, a phase costs one global lookup.
+
+Example:
+    with profiling() as profiler:
+        genetic_algorithm(tasks, RESOURCE_LIMITS)
+    profiler.print_report()
+    profiler.save_chrome_trace('results/ga_trace.json')   # chrome://tracing or Perfetto
+    profiler.save_collapsed_stacks('results/ga.folded')   # flamegraph.pl / speedscope
+'''
+
+from contextlib import contextmanager, nullcontext
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+# Active profiler, or None when profiling is disabled
+_profiler = None
+_DISABLED = nullcontext()
+
+def phase(name):
+    """
+    Context manager that records a named phase in the active profiler.
+    """
+    if _profiler is None:
+        return _DISABLED
+    return _Phase(_profiler, name)
+
+def profiled(name=None):
+    """
+    Decorator that records every call of a function as a phase.
+
+    Parameters:
+    - name: Name of the phase (default: module.qualname of the function).
+    """
+    def decorate(function):
+        phase_name = name or f'{function.__module__}.{function.__qualname__}'
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _profiler is None:
+                return function(*args, **kwargs)
+            with _Phase(_profiler, phase_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+@contextmanager
+def profiling(track_allocations=True, max_events=1_000_000):
+    """
+    Activate a new Profiler for the duration of the block and yield it.
+    """
+    global _profiler
+    previous = _profiler
+    _profiler = Profiler(track_allocations, max_events)
+    try:
+        yield _profiler
+    finally:
+        _profiler = previous
+
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'frame')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.frame = self.profiler._enter(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler._exit(self.frame)
+        return False
+
+
+class Profiler:
+    """
+    Collects phase timings.
+
+    Aggregates (calls, total/min/max time, allocated blocks, self time per
+    call stack) are always kept; individual events for the trace export are
+    kept up to `max_events`.
+
+    Parameters:
+    - track_allocations: Record the net change of sys.getallocatedblocks()
+      per phase (a few microseconds per phase).
+    - max_events: Maximum number of events kept for the trace export.
+    """
+
+    def __init__(self, track_allocations=True, max_events=1_000_000):
+        self.track_allocations = track_allocations
+        self.max_events = max_events
+        self.origin = time.perf_counter_ns()
+        self.stats = {}        # name -> [calls, total_ns, min_ns, max_ns, allocated_blocks]
+        self.stack_times = {}  # 'outer;inner' call stack -> self time in ns
+        self.events = []       # (name, thread_id, start_ns, duration_ns)
+        self.dropped_events = 0
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def _enter(self, name):
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        path = f'{stack[-1][1]};{name}' if stack else name
+        blocks = sys.getallocatedblocks() if self.track_allocations else 0
+        # Frame: [name, stack path, start, allocated blocks at start, time spent in child phases]
+        frame = [name, path, time.perf_counter_ns(), blocks, 0]
+        stack.append(frame)
+        return frame
+
+    def _exit(self, frame):
+        end = time.perf_counter_ns()
+        blocks = sys.getallocatedblocks() - frame[3] if self.track_allocations else 0
+        stack = self.local.stack
+        stack.pop()
+        duration = end - frame[2]
+        if stack:
+            stack[-1][4] += duration
+        name = frame[0]
+        with self.lock:
+            entry = self.stats.get(name)
+            if entry is None:
+                self.stats[name] = [1, duration, duration, duration, blocks]
+            else:
+                entry[0] += 1
+                entry[1] += duration
+                entry[2] = min(entry[2], duration)
+                entry[3] = max(entry[3], duration)
+                entry[4] += blocks
+            self.stack_times[frame[1]] = self.stack_times.get(frame[1], 0) + duration - frame[4]
+            if len(self.events) < self.max_events:
+                self.events.append((name, threading.get_ident(), frame[2] - self.origin, duration))
+            else:
+                self.dropped_events += 1
+
+    def report(self):
+        """
+        Aggregated statistics per phase, slowest total first.
+
+        Returns:
+        A list of dictionaries with the phase name, call count, total, mean,
+        min and max time in seconds, and net allocated memory blocks.
+        """
+        rows = []
+        for name, (calls, total, shortest, longest, blocks) in self.stats.items():
+            rows.append({'phase': name, 'calls': calls, 'total_time': total / 1e9, 'mean_time': total / calls / 1e9,
+                         'min_time': shortest / 1e9, 'max_time': longest / 1e9, 'allocated_blocks': blocks})
+        rows.sort(key=lambda row: -row['total_time'])
+        return rows
+
+    def print_report(self):
+        print(f"{'Phase':<45} {'Calls':>8} {'Total (s)':>11} {'Mean (ms)':>11} {'Blocks':>10}")
+        for row in self.report():
+            print(f"{row['phase']:<45} {row['calls']:>8} {row['total_time']:>11.4f} "
+                  f"{row['mean_time'] * 1e3:>11.4f} {row['allocated_blocks']:>10}")
+
+    def save_report(self, path):
+        """
+        Write the aggregated report as JSON.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def save_chrome_trace(self, path):
+        """
+        Write the events in the Chrome trace event format (chrome://tracing, Perfetto).
+        """
+        pid = os.getpid()
+        events = [{'name': name, 'cat': name.split('.')[0], 'ph': 'X', 'pid': pid, 'tid': tid,
+                   'ts': start / 1e3, 'dur': duration / 1e3}
+                  for name, tid, start, duration in self.events]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def save_collapsed_stacks(self, path):
+        """
+        Write self time per call stack in microseconds, in the collapsed-stack
+        format read by flamegraph.pl and speedscope.
+        """
+        with open(path, 'w') as f:
+            for stack, self_time in sorted(self.stack_times.items()):
+                f.write(f'{stack} {self_time // 1000}\n')
@@ -0,0 +1,197 @@
+'''
+Resource profile of one task type over discrete time.
+
+A ResourceProfile stores how much of a resource is in use in every time slot
+[t, t + 1) in a segment tree with lazy range addition, keeping the maximum
+and minimum usage of every node. Booking a task, asking for the peak usage
+in an interval, checking whether a task fits, and finding the earliest
+start at which it fits all cost O(log T) for a horizon of T slots (the
+earliest start costs O(log T) per gap too short for the task that it skips,
+so it pays off over a scan for long tasks and long busy stretches).
+The tree grows by doubling when a booking reaches past its horizon.
+
+Example:
+    profile = ResourceProfile(capacity=RESOURCE_LIMITS['A'])
+    start = profile.earliest_start(task.min_start_time, task.length, task.resource_req)
+    profile.add(start, start + task.length, task.resource_req)
+'''
+
+class ResourceProfile:
+    """
+    Segment tree over the usage of one resource per time slot.
+
+    Slots past the horizon are unused. Usage may go above the capacity (for
+    example when measuring an existing schedule); `fits` and `earliest_start`
+    compare against the capacity.
+    """
+
+    def __init__(self, capacity, horizon=64):
+        self.capacity = capacity
+        self._allocate(max(horizon, 1))
+
+    def _allocate(self, horizon):
+        size = 1
+        while size < horizon:
+            size *= 2
+        self.size = size
+        self.height = size.bit_length() - 1
+        self.high = [0] * (2 * size)  # Max usage of every node, including its own pending addition
+        self.low = [0] * (2 * size)   # Min usage of every node, including its own pending addition
+        self.pending = [0] * size     # Addition not yet applied to the children of an internal node
+
+    @classmethod
+    def from_usage(cls, capacity, usage):
+        """
+        Build a profile from the usage of every slot in O(T).
+        """
+        profile = cls(capacity, len(usage))
+        size, high, low = profile.size, profile.high, profile.low
+        high[size:size + len(usage)] = usage
+        low[size:size + len(usage)] = usage
+        for node in range(size - 1, 0, -1):
+            high[node] = max(high[2 * node], high[2 * node + 1])
+            low[node] = min(low[2 * node], low[2 * node + 1])
+        return profile
+
+    def __len__(self):
+        return self.size
+
+    def values(self):
+        """
+        Usage of every slot of the horizon.
+        """
+        for node in range(1, self.size):
+            self._push_node(node)
+        return self.high[self.size:]
+
+    def usage(self, slot):
+        """
+        Usage of one time slot.
+        """
+        if slot >= self.size:
+            return 0
+        self._push(slot + self.size)
+        return self.high[slot + self.size]
+
+    def _apply(self, node, amount):
+        self.high[node] += amount
+        self.low[node] += amount
+        if node < self.size:
+            self.pending[node] += amount
+
+    def _push_node(self, node):
+        amount = self.pending[node]
+        if amount:
+            self._apply(2 * node, amount)
+            self._apply(2 * node + 1, amount)
+            self.pending[node] = 0
+
+    def _push(self, leaf):
+        # Apply the pending additions of all ancestors of a leaf, root first
+        for shift in range(self.height, 0, -1):
+            self._push_node(leaf >> shift)
+
+    def _pull(self, leaf):
+        # Recompute the ancestors of a leaf after its subtree changed
+        high, low, pending = self.high, self.low, self.pending
+        node = leaf >> 1
+        while node:
+            high[node] = max(high[2 * node], high[2 * node + 1]) + pending[node]
+            low[node] = min(low[2 * node], low[2 * node + 1]) + pending[node]
+            node >>= 1
+
+    def add(self, start, end, amount):
+        """
+        Add `amount` to the usage of the slots [start, end).
+        """
+        if start >= end:
+            return
+        if end > self.size:
+            usage = self.values()
+            self._allocate(max(end, 2 * self.size))
+            self.high[self.size:self.size + len(usage)] = usage
+            self.low[self.size:self.size + len(usage)] = usage
+            for node in range(self.size - 1, 0, -1):
+                self.high[node] = max(self.high[2 * node], self.high[2 * node + 1])
+                self.low[node] = min(self.low[2 * node], self.low[2 * node + 1])
+        left, right = start + self.size, end + self.size
+        while left < right:
+            if left & 1:
+                self._apply(left, amount)
+                left += 1
+            if right & 1:
+                right -= 1
+                self._apply(right, amount)
+            left >>= 1
+            right >>= 1
+        self._pull(start + self.size)
+        self._pull(end - 1 + self.size)
+
+    def max(self, start, end):
+        """
+        Peak usage over the slots [start, end) (0 for an empty interval).
+        """
+        peak = 0 if end > self.size or start >= end else None
+        end = min(end, self.size)
+        if start < end:
+            left, right = start + self.size, end + self.size
+            self._push(left)
+            self._push(right - 1)
+            high = self.high
+            while left < right:
+                if left & 1:
+                    peak = high[left] if peak is None else max(peak, high[left])
+                    left += 1
+                if right & 1:
+                    right -= 1
+                    peak = high[right] if peak is None else max(peak, high[right])
+                left >>= 1
+                right >>= 1
+        return 0 if peak is None else peak
+
+    def fits(self, start, end, amount):
+        """
+        True when `amount` more fits within the capacity during [start, end).
+        """
+        return self.max(start, end) + amount <= self.capacity
+
+    def _find(self, start, end, threshold, above, last=False):
+        """
+        First (or last) slot in [start, end) whose usage is above `threshold`
+        (or at most `threshold` when `above` is False), or None.
+        """
+        high, low, pending, size = self.high, self.low, self.pending, self.size
+        stack = [(1, 0, size, 0)]  # (node, first slot, end slot, pending additions of the ancestors)
+        while stack:
+            node, node_start, node_end, added = stack.pop()
+            if node_end <= start or node_start >= end:
+                continue
+            if (high[node] + added <= threshold) if above else (low[node] + added > threshold):
+                continue
+            if node >= size:
+                return node_start
+            added += pending[node]
+            middle = (node_start + node_end) // 2
+            left, right = (2 * node, node_start, middle, added), (2 * node + 1, middle, node_end, added)
+            # The child searched first goes on the stack last
+            stack.extend((left, right) if last else (right, left))
+        return None
+
+    def earliest_start(self, release, length, amount):
+        """
+        Earliest start >= release at which `amount` fits for `length` slots.
+
+        Raises a ValueError if `amount` exceeds the capacity.
+        """
+        threshold = self.capacity - amount
+        if threshold < 0:
+            raise ValueError(f"Amount {amount} exceeds the capacity {self.capacity}")
+        start = release
+        while start < self.size:
+            # Restart after the last blocked slot of the window, past the blocked run it ends
+            blocked = self._find(start, start + length, threshold, above=True, last=True)
+            if blocked is None:
+                return start
+            free = self._find(blocked + 1, self.size, threshold, above=False)
+            start = self.size if free is None else free
+        return start
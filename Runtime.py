@@ -0,0 +1,196 @@
+'''
+Asyncio runtime that executes a schedule.
+
+The schedulers only produce (task_id, start, end) tuples. This module runs a
+coroutine for every scheduled task in one event loop: a task starts no earlier
+than its planned start (and min_start_time), only after all of its scheduled
+dependencies have completed, and only while its task type has enough free
+resources, enforced by one semaphore per type weighted by resource_req. The
+report compares actual against planned start and finish times.
+
+Example:
+    async def work(task):
+        await fetch(task.task_id)
+
+    report = execute_schedule(schedule, tasks, RESOURCE_LIMITS, work, time_unit=0.01)
+'''
+
+import asyncio
+from collections import deque
+
+class WeightedSemaphore:
+    """
+    Asyncio semaphore whose acquisitions take a weight out of a fixed capacity.
+
+    Waiters are served first come, first served, so a large request is not
+    starved by a stream of small ones.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.free = capacity
+        self.waiters = deque()  # (weight, future) in arrival order
+
+    async def acquire(self, weight):
+        if weight > self.capacity:
+            raise ValueError(f"Weight {weight} exceeds the capacity {self.capacity}")
+        if not self.waiters and weight <= self.free:
+            self.free -= weight
+            return
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append((weight, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Give back the weight if it was granted just before cancellation
+            if future.done() and not future.cancelled():
+                self.release(weight)
+            else:
+                self.waiters.remove((weight, future))
+                self._wake()
+            raise
+
+    def release(self, weight):
+        self.free += weight
+        self._wake()
+
+    def _wake(self):
+        while self.waiters and self.waiters[0][0] <= self.free:
+            weight, future = self.waiters.popleft()
+            self.free -= weight
+            future.set_result(None)
+
+def normalize_schedule(schedule):
+    """
+    Return the schedule as a list of (task_id, start_time, end_time) tuples.
+
+    The genetic algorithm returns (task_id, end_time, start_time); both orders
+    are accepted since a task never ends before it starts.
+    """
+    if not isinstance(schedule, list):
+        raise ValueError(f"Not a schedule: {schedule!r}")
+    return [(task_id, min(a, b), max(a, b)) for task_id, a, b in schedule]
+
+async def simulate_task(task, time_unit=0.01):
+    """
+    Default work coroutine: sleep for the length of the task.
+    """
+    await asyncio.sleep(task.length * time_unit)
+
+async def run_schedule(schedule, tasks, resource_limits, work=None, time_unit=0.01):
+    """
+    Execute a schedule in the running event loop.
+
+    Parameters:
+    - schedule: Schedule from any of the algorithms.
+    - tasks: The scheduled tasks; their status is updated as they run.
+    - resource_limits: Dictionary of resource limits per task type.
+    - work: Coroutine function called with each task to do its work
+      (default: `simulate_task`).
+    - time_unit: Seconds per unit of schedule time. Tasks are held back until
+      their planned start; with 0 they start as soon as dependencies and
+      resources allow.
+
+    Returns:
+    A list of dictionaries, one per scheduled task in schedule order, with the
+    planned and actual start and end (in schedule time units since the run
+    began; in seconds when time_unit is 0) and the outcome: 'completed',
+    'failed' (work raised, or the task's type has no resource limit or too
+    small a one; the exception is under 'error') or 'skipped' (a dependency
+    did not complete).
+
+    Raises a ValueError if the schedule has a task twice or a task that is
+    not in `tasks`.
+    """
+    schedule = normalize_schedule(schedule)
+    if work is None:
+        work = lambda task: simulate_task(task, time_unit)
+    task_by_id = {task.task_id: task for task in tasks}
+    task_ids = [task_id for task_id, _, _ in schedule]
+    if len(set(task_ids)) != len(task_ids):
+        raise ValueError("The schedule has duplicate task IDs")
+    unknown = [task_id for task_id in task_ids if task_id not in task_by_id]
+    if unknown:
+        raise ValueError(f"{len(unknown)} scheduled tasks are not in the task list, e.g. {unknown[0]!r}")
+    semaphores = {task_type: WeightedSemaphore(limit) for task_type, limit in resource_limits.items()}
+    loop = asyncio.get_running_loop()
+    done = {task_id: loop.create_future() for task_id, _, _ in schedule}
+    origin = loop.time()
+
+    def elapsed():
+        return (loop.time() - origin) / time_unit if time_unit else loop.time() - origin
+
+    async def run_one(task_id, planned_start, planned_end):
+        task = task_by_id[task_id]
+        record = {'task_id': task_id, 'task_type': task.task_type,
+                  'planned_start': planned_start, 'planned_end': planned_end,
+                  'actual_start': None, 'actual_end': None, 'outcome': 'skipped', 'error': None}
+        succeeded = False
+        try:
+            # Dependencies that are not part of the schedule are taken as satisfied
+            for dep in task.dependencies:
+                if dep in done and dep != task_id and not await done[dep]:
+                    return record
+
+            if time_unit:
+                delay = max(planned_start, task.min_start_time) * time_unit - (loop.time() - origin)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            try:
+                if task.task_type not in semaphores:
+                    raise ValueError(f"No resource limit for task type {task.task_type!r}")
+                semaphore = semaphores[task.task_type]
+                await semaphore.acquire(task.resource_req)
+            except ValueError as error:
+                # The task can never run; its dependents are skipped
+                record['outcome'] = 'failed'
+                record['error'] = error
+                return record
+            try:
+                task.status = 'Running'
+                record['actual_start'] = elapsed()
+                await work(task)
+                record['outcome'] = 'completed'
+                task.status = 'Completed'
+                succeeded = True
+            except Exception as error:
+                record['outcome'] = 'failed'
+                record['error'] = error
+                task.status = 'Not Running'
+            finally:
+                record['actual_end'] = elapsed()
+                semaphore.release(task.resource_req)
+            return record
+        finally:
+            done[task_id].set_result(succeeded)
+
+    return list(await asyncio.gather(*(run_one(*entry) for entry in schedule)))
+
+def execute_schedule(schedule, tasks, resource_limits, work=None, time_unit=0.01):
+    """
+    Run `run_schedule` in a new event loop and return its report.
+    """
+    return asyncio.run(run_schedule(schedule, tasks, resource_limits, work, time_unit))
+
+def execution_summary(report):
+    """
+    Summarize an execution report.
+
+    Returns:
+    A dictionary with the number of tasks per outcome, the planned and actual
+    makespan, and the mean and maximum start delay (actual - planned start)
+    of the tasks that ran.
+    """
+    outcomes = {}
+    for record in report:
+        outcomes[record['outcome']] = outcomes.get(record['outcome'], 0) + 1
+    ran = [record for record in report if record['actual_start'] is not None]
+    delays = [record['actual_start'] - record['planned_start'] for record in ran]
+    return {
+        'outcomes': outcomes,
+        'planned_makespan': max((record['planned_end'] for record in report), default=0),
+        'actual_makespan': max((record['actual_end'] for record in ran), default=0),
+        'mean_start_delay': sum(delays) / len(delays) if delays else 0,
+        'max_start_delay': max(delays, default=0),
+    }
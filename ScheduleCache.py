@@ -0,0 +1,211 @@
+'''
+Memoization layer for the schedulers.
+
+A schedule is cached under a fingerprint of everything that determines it:
+the task attributes and dependencies (in order), the resource limits, the
+algorithm and its extra parameters. Entries live in an in-memory LRU that
+evicts by total size, optionally backed by a directory of pickle files that
+survives restarts.
+
+Schedulers also update the status of the tasks they schedule; the cache
+records those updates and replays them on a hit, so a cached call leaves the
+tasks in the same state as a real one. Stochastic algorithms (the genetic
+algorithm) return the first schedule computed for a fingerprint.
+
+Example:
+    cache = ScheduleCache(max_bytes=64 * 2**20, directory='results/cache')
+    ALGORITHMS = cache_algorithms(ALGORITHMS, cache)
+    ...
+    print(cache.stats())
+'''
+
+from collections import OrderedDict
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+from threading import Lock
+
+from TaskSet import TaskSet
+
+def fingerprint(tasks, resource_limits, algorithm, args=(), kwargs=None):
+    """
+    Hex digest identifying a scheduler call.
+
+    Parameters:
+    - tasks: List of tasks or a TaskSet.
+    - resource_limits: Dictionary of resource limits per task type.
+    - algorithm: Name of the scheduler.
+    - args, kwargs: Extra parameters of the call.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((algorithm, sorted(resource_limits.items()), args, sorted((kwargs or {}).items()))).encode())
+    if isinstance(tasks, TaskSet):
+        for array in (tasks.ids, tasks.task_type, tasks.status, tasks.min_start_time, tasks.length,
+                      tasks.priority, tasks.resource_req, tasks.dep_indptr, tasks.dep_indices):
+            digest.update(array.tobytes())
+        digest.update(repr(tasks.task_types).encode())
+    else:
+        for task in tasks:
+            digest.update(repr((task.task_id, task.task_type, task.status, task.min_start_time, task.length,
+                                task.priority, task.resource_req, tuple(task.dependencies))).encode())
+    return digest.hexdigest()
+
+
+class ScheduleCache:
+    """
+    LRU cache of schedules with size-based eviction and an optional disk store.
+
+    Parameters:
+    - max_bytes: Total pickled size of the entries kept in memory.
+    - directory: Directory of the on-disk store, or None to keep memory only.
+      Entries evicted from memory stay on disk.
+    """
+
+    def __init__(self, max_bytes=256 * 2**20, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.entries = OrderedDict()  # key -> (entry, size), least recently used first
+        self.current_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Return the entry stored under `key`, or None.
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+        data = self._read(key)
+        with self.lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            entry = pickle.loads(data)
+            self._insert(key, entry, len(data))
+            return entry
+
+    def put(self, key, entry):
+        """
+        Store an entry under `key`.
+        """
+        data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self._insert(key, entry, len(data))
+        self._write(key, data)
+
+    def clear(self):
+        """
+        Drop all in-memory entries and reset the statistics. The disk store is kept.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.current_bytes = 0
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Hit/miss statistics and current size of the cache.
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.current_bytes,
+            }
+
+    def _insert(self, key, entry, size):
+        if key in self.entries:
+            self.current_bytes -= self.entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (entry, size)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.pkl')
+
+    def _read(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, key, data):
+        if self.directory is None:
+            return
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+
+
+def cached(function, cache, name=None):
+    """
+    Wrap a scheduler `function(tasks, resource_limits, *args, **kwargs)` so
+    that its results are memoized in `cache`.
+
+    Parameters:
+    - function: The scheduler.
+    - cache: A ScheduleCache.
+    - name: Name of the algorithm in the fingerprint (default: the qualified
+      name of the function; required for lambdas).
+    """
+    if name is None:
+        name = f'{function.__module__}.{function.__qualname__}'
+        if '<lambda>' in name:
+            raise ValueError("A name is required to cache a lambda")
+
+    @functools.wraps(function)
+    def wrapper(tasks, resource_limits, *args, **kwargs):
+        key = fingerprint(tasks, resource_limits, name, args, kwargs)
+        entry = cache.get(key)
+        if entry is None:
+            before = [task.status for task in tasks]
+            schedule = function(tasks, resource_limits, *args, **kwargs)
+            # Record the status updates made by the scheduler
+            updates = [(i, task.status) for i, task in enumerate(tasks) if task.status != before[i]]
+            entry = (schedule, updates)
+            cache.put(key, entry)
+        else:
+            schedule, updates = entry
+            for i, status in updates:
+                tasks[i].status = status
+        return list(schedule) if isinstance(schedule, list) else schedule
+
+    wrapper.cache = cache
+    return wrapper
+
+def cache_algorithms(algorithms, cache):
+    """
+    Return a copy of an algorithm registry ({name: function}) with every
+    function wrapped by `cached`, using the registry names in the fingerprints.
+    """
+    return {name: cached(function, cache, name) for name, function in algorithms.items()}
@@ -0,0 +1,478 @@
+'''
+Distributed runner for experiment sweeps.
+
+A sweep is a grid of cells, one per (algorithm, setting, seed). The
+coordinator puts the cells that are not in the checkpoint yet on a work
+queue, workers take them off, generate the setting's tasks with the cell's
+seed, run the algorithm and send back its metrics, and the coordinator
+appends every result to the checkpoint as it arrives. An interrupted sweep
+picks up where it stopped when it is started again with the same checkpoint;
+the cells the interrupted run left on the work queue are dropped first, so
+no cell runs twice. The coordinator gives up when no result arrives for
+`--result-timeout` seconds, e.g. because every remote worker died.
+
+Queues:
+- LocalQueue: multiprocessing queues, for workers on this machine.
+- RedisQueue: two lists on a Redis-style server (LPUSH / BRPOP), for workers
+  on any number of nodes. It works with a redis.Redis client, or with a
+  BrokerClient talking to the BrokerServer stand-in of this module, which
+  needs nothing but the standard library.
+
+Examples:
+    # Local processes
+    python Sweep.py run --settings settings2 --seeds 0 1 2 --processes 4 --checkpoint results/sweep.jsonl --plot
+
+    # Several nodes: a broker, workers on every node, and the coordinator
+    python Sweep.py broker --port 6400
+    python Sweep.py worker --broker head-node:6400 --processes 8
+    python Sweep.py run --broker head-node:6400 --processes 0 --checkpoint results/sweep.jsonl
+'''
+
+import argparse
+from collections import deque
+import json
+import multiprocessing
+import os
+import queue
+import random
+import socket
+import socketserver
+import threading
+import time
+
+from experiment_multi_datasets import ALGORITHMS, RESOURCE_LIMITS, settings1, settings2
+from Metrics import measure_metrics
+from TaskGeneration import generate_random_tasks
+
+SETTINGS = {'settings1': settings1, 'settings2': settings2}
+
+def cell_key(cell):
+    return f"{cell['algorithm']}|{cell['setting']}|{cell['seed']}"
+
+def build_cells(settings, algorithms, seeds):
+    """
+    Cells of a sweep.
+
+    Parameters:
+    - settings: Dictionary of setting name -> (num_tasks, max_dependencies).
+    - algorithms: Algorithm names.
+    - seeds: Seeds of the task generation; every algorithm gets the same tasks per seed.
+
+    Returns:
+    A list of cell dictionaries, smallest settings first.
+    """
+    ordered = sorted(settings.items(), key=lambda item: item[1])
+    return [{'algorithm': algorithm, 'setting': name, 'num_tasks': num_tasks,
+             'max_dependencies': max_dependencies, 'seed': seed}
+            for name, (num_tasks, max_dependencies) in ordered for seed in seeds for algorithm in algorithms]
+
+def _algorithm(name):
+    # The experiment algorithms first, then the benchmark schedulers
+    if name in ALGORITHMS:
+        return ALGORITHMS[name]
+    from Benchmark import SCHEDULERS
+    return SCHEDULERS[name]
+
+def run_cell(cell):
+    """
+    Run one cell.
+
+    Returns:
+    The cell with its `metrics` (weighted throughput, makespan, task
+    utilization rate, priority satisfaction, average wait time), its
+    `execution_time`, the `worker` that ran it and an `error` message if the
+    algorithm or the metrics failed.
+    """
+    record = dict(cell, key=cell_key(cell), metrics=None, execution_time=None, error=None,
+                  worker=f'{socket.gethostname()}:{os.getpid()}')
+    try:
+        random.seed(cell['seed'])
+        tasks = generate_random_tasks(cell['num_tasks'], RESOURCE_LIMITS, cell['max_dependencies'],
+                                      csv_filename=None, show_statistics=False)
+        algorithm = _algorithm(cell['algorithm'])
+        start_time = time.time()
+        schedule = algorithm(tasks, RESOURCE_LIMITS)
+        record['execution_time'] = time.time() - start_time
+        weighted_throughput, makespan, task_utilization_rate, priority_satisfaction, _, task_avg_wait_time = \
+            measure_metrics(schedule, tasks, RESOURCE_LIMITS)
+        record['metrics'] = [float(weighted_throughput), float(makespan), float(task_utilization_rate),
+                             float(priority_satisfaction), float(task_avg_wait_time)]
+    except Exception as error:
+        record['error'] = f'{type(error).__name__}: {error}'
+    return record
+
+
+class LocalQueue:
+    """
+    Work and result queues shared with worker processes on this machine.
+    """
+
+    def __init__(self):
+        context = multiprocessing.get_context()
+        self.tasks = context.Queue()
+        self.results = context.Queue()
+
+    def put_task(self, cell):
+        self.tasks.put(cell)
+
+    def clear_tasks(self):
+        """
+        Drop the cells (and stop signals) still waiting on the work queue.
+        """
+        while True:
+            try:
+                self.tasks.get(timeout=0.1)
+            except queue.Empty:
+                return
+
+    def get_task(self, timeout=None):
+        try:
+            return self.tasks.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def put_result(self, record):
+        self.results.put(record)
+
+    def get_result(self, timeout=None):
+        try:
+            return self.results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class RedisQueue:
+    """
+    Work and result queues as two lists on a Redis-style server.
+
+    `client` needs `lpush(key, value)`, `brpop(key, timeout)` and
+    `delete(key)` with the semantics of redis-py: a redis.Redis instance or
+    a BrokerClient. Items are JSON; a stop signal for the workers is the JSON
+    null.
+    """
+
+    def __init__(self, client, name='sweep'):
+        self.client = client
+        self.task_key = f'{name}:tasks'
+        self.result_key = f'{name}:results'
+
+    @classmethod
+    def from_url(cls, url, name='sweep'):
+        """
+        Queue on a real Redis server (requires the redis package).
+        """
+        try:
+            import redis
+        except ImportError as error:
+            raise ImportError("RedisQueue.from_url needs the redis package; use a BrokerClient instead") from error
+        return cls(redis.Redis.from_url(url), name)
+
+    def _pop(self, key, timeout):
+        # redis-py blocks forever with timeout 0 and takes whole seconds
+        item = self.client.brpop(key, timeout=0 if timeout is None else max(1, int(round(timeout))))
+        if item is None:
+            return None, False
+        value = item[1]
+        return json.loads(value.decode() if isinstance(value, bytes) else value), True
+
+    def put_task(self, cell):
+        self.client.lpush(self.task_key, json.dumps(cell))
+
+    def clear_tasks(self):
+        """
+        Drop the cells (and stop signals) still waiting on the work list.
+        """
+        self.client.delete(self.task_key)
+
+    def get_task(self, timeout=None):
+        return self._pop(self.task_key, timeout)[0]
+
+    def put_result(self, record):
+        self.client.lpush(self.result_key, json.dumps(record))
+
+    def get_result(self, timeout=None):
+        return self._pop(self.result_key, timeout)[0]
+
+
+class BrokerServer(socketserver.ThreadingTCPServer):
+    """
+    In-memory stand-in for the LPUSH / BRPOP / DEL subset of a Redis server.
+
+    Requests and replies are JSON lines over TCP. Start it with
+    `serve_forever()` (or `start()` for a background thread).
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address=('127.0.0.1', 0)):
+        self.lists = {}
+        self.condition = threading.Condition()
+        super().__init__(address, _BrokerHandler)
+
+    @property
+    def address(self):
+        return f'{self.server_address[0]}:{self.server_address[1]}'
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def lpush(self, key, value):
+        with self.condition:
+            self.lists.setdefault(key, deque()).appendleft(value)
+            self.condition.notify_all()
+            return len(self.lists[key])
+
+    def delete(self, key):
+        with self.condition:
+            return 1 if self.lists.pop(key, None) else 0
+
+    def brpop(self, key, timeout):
+        deadline = None if not timeout else time.monotonic() + timeout
+        with self.condition:
+            while not self.lists.get(key):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self.condition.wait(remaining)
+            return [key, self.lists[key].pop()]
+
+class _BrokerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            request = json.loads(line)
+            if request['op'] == 'lpush':
+                reply = self.server.lpush(request['key'], request['value'])
+            elif request['op'] == 'brpop':
+                reply = self.server.brpop(request['key'], request['timeout'])
+            elif request['op'] == 'delete':
+                reply = self.server.delete(request['key'])
+            else:
+                reply = None
+            self.wfile.write(json.dumps(reply).encode() + b'\n')
+            self.wfile.flush()
+
+
+class BrokerClient:
+    """
+    Client of a BrokerServer with the redis-py `lpush` / `brpop` / `delete` signatures.
+
+    It connects on first use, so it can be passed to worker processes.
+    """
+
+    def __init__(self, address):
+        host, port = address.rsplit(':', 1)
+        self.host, self.port = host, int(port)
+        self.connection = None
+
+    def __getstate__(self):
+        return {'host': self.host, 'port': self.port, 'connection': None}
+
+    def _request(self, **request):
+        if self.connection is None:
+            sock = socket.create_connection((self.host, self.port))
+            self.connection = (sock, sock.makefile('rb'))
+        sock, reader = self.connection
+        sock.sendall(json.dumps(request).encode() + b'\n')
+        return json.loads(reader.readline())
+
+    def lpush(self, key, value):
+        return self._request(op='lpush', key=key, value=value)
+
+    def brpop(self, key, timeout=0):
+        reply = self._request(op='brpop', key=key, timeout=timeout)
+        return None if reply is None else tuple(reply)
+
+    def delete(self, *keys):
+        return sum(self._request(op='delete', key=key) for key in keys)
+
+
+def worker_loop(work_queue, idle_timeout=None):
+    """
+    Run cells from the queue until a stop signal arrives (or nothing arrives
+    for `idle_timeout` seconds).
+    """
+    while True:
+        cell = work_queue.get_task(timeout=idle_timeout)
+        if cell is None:
+            return
+        work_queue.put_result(run_cell(cell))
+
+def start_workers(work_queue, processes):
+    """
+    Start `processes` local worker processes on a queue.
+    """
+    workers = [multiprocessing.Process(target=worker_loop, args=(work_queue,), daemon=True)
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    return workers
+
+def stop_workers(work_queue, count):
+    """
+    Send a stop signal to `count` workers.
+    """
+    for _ in range(count):
+        work_queue.put_task(None)
+
+def load_checkpoint(path):
+    """
+    Records of the completed cells in a checkpoint file, by cell key.
+    """
+    records = {}
+    if path and os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    records[record['key']] = record
+    return records
+
+def run_sweep(cells, work_queue, checkpoint=None, retry_failed=True, workers=None, result_timeout=None, log=print):
+    """
+    Run the cells of a sweep on the workers of a queue.
+
+    Parameters:
+    - cells: Cells from `build_cells`.
+    - work_queue: LocalQueue or RedisQueue the workers listen on.
+    - checkpoint: JSON lines file with one record per completed cell. Cells
+      already in it are skipped and new records are appended as they arrive.
+    - retry_failed: Run cells again whose checkpointed record has an error.
+    - workers: Local worker processes; if all of them die while cells are
+      outstanding, a RuntimeError is raised instead of waiting forever.
+    - result_timeout: Seconds to wait for the next result before raising a
+      RuntimeError, the only liveness check for remote workers (default:
+      wait forever). It must be longer than the slowest cell.
+
+    Cells left on the work queue by an interrupted run are dropped before the
+    pending cells are queued, so they do not run twice.
+
+    Returns:
+    The records of all cells, in cell order.
+    """
+    done = load_checkpoint(checkpoint)
+    if retry_failed:
+        done = {key: record for key, record in done.items() if record['error'] is None}
+    pending = {cell_key(cell) for cell in cells} - set(done)
+    work_queue.clear_tasks()
+    for cell in cells:
+        if cell_key(cell) in pending:
+            work_queue.put_task(cell)
+    if log:
+        log(f"Sweep: {len(cells)} cells, {len(cells) - len(pending)} from the checkpoint, {len(pending)} to run")
+
+    with open(checkpoint, 'a') if checkpoint else open(os.devnull, 'w') as f:
+        last_result = time.monotonic()
+        while pending:
+            record = work_queue.get_result(timeout=1)
+            if record is None:
+                if workers and not any(worker.is_alive() for worker in workers):
+                    raise RuntimeError(f"All workers exited with {len(pending)} cells outstanding")
+                if result_timeout is not None and time.monotonic() - last_result > result_timeout:
+                    raise RuntimeError(f"No result for {result_timeout} s with {len(pending)} cells outstanding; "
+                                       "are the workers running?")
+                continue
+            last_result = time.monotonic()
+            if record['key'] not in pending:
+                continue  # A late result of an earlier run
+            pending.discard(record['key'])
+            done[record['key']] = record
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+            if log:
+                status = record['error'] or f"{record['execution_time']:.2f}s"
+                log(f"[{len(cells) - len(pending)}/{len(cells)}] {record['key']} on {record['worker']}: {status}")
+    return [done[cell_key(cell)] for cell in cells]
+
+def aggregate(records, algorithms=None):
+    """
+    Turn sweep records into the `results` structure of the experiment scripts.
+
+    Returns:
+    A dictionary algorithm -> list of (num_tasks, weighted_throughput,
+    makespan, task_utilization_rate, priority_satisfaction,
+    average_wait_time, execution_time) tuples, one per setting ordered by
+    number of tasks, averaged over the seeds. Failed cells are left out.
+    """
+    groups = {}
+    for record in records:
+        if record['error'] is None:
+            groups.setdefault((record['algorithm'], record['num_tasks'], record['setting']), []).append(
+                record['metrics'] + [record['execution_time']])
+    if algorithms is None:
+        algorithms = sorted({algorithm for algorithm, _, _ in groups})
+    results = {algorithm: [] for algorithm in algorithms}
+    for (algorithm, num_tasks, _), rows in sorted(groups.items(), key=lambda item: item[0][1:]):
+        if algorithm in results:
+            means = [sum(column) / len(column) for column in zip(*rows)]
+            results[algorithm].append((num_tasks, *means))
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run experiment sweeps on local or remote workers.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="Coordinate a sweep.")
+    run.add_argument('--settings', default='settings2', choices=list(SETTINGS))
+    run.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS))
+    run.add_argument('--seeds', nargs='+', type=int, default=[0])
+    run.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                     help="Local worker processes (0 when only remote workers run cells).")
+    run.add_argument('--broker', help="host:port of a broker; default: local queues.")
+    run.add_argument('--redis', help="Redis URL to use as the broker.")
+    run.add_argument('--checkpoint', default='results/sweep.jsonl')
+    run.add_argument('--result-timeout', type=float, default=3600,
+                     help="Seconds without any result after which the sweep stops (it resumes from the checkpoint).")
+    run.add_argument('--plot', action='store_true', help="Plot the results with visualize_metrics.")
+
+    worker = commands.add_parser('worker', help="Run cells from a broker.")
+    worker.add_argument('--broker', help="host:port of the broker.")
+    worker.add_argument('--redis', help="Redis URL of the broker.")
+    worker.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+
+    broker = commands.add_parser('broker', help="Serve the stand-in broker.")
+    broker.add_argument('--host', default='0.0.0.0')
+    broker.add_argument('--port', type=int, default=6400)
+
+    args = parser.parse_args(argv)
+    if args.command == 'broker':
+        server = BrokerServer((args.host, args.port))
+        print(f"Broker listening on {server.address}")
+        server.serve_forever()
+        return 0
+
+    if args.redis:
+        work_queue = RedisQueue.from_url(args.redis)
+    elif args.broker:
+        work_queue = RedisQueue(BrokerClient(args.broker))
+    elif args.command == 'run':
+        work_queue = LocalQueue()
+    else:
+        parser.error("worker needs --broker or --redis")
+
+    if args.command == 'worker':
+        for process in start_workers(work_queue, args.processes):
+            process.join()
+        return 0
+
+    workers = start_workers(work_queue, args.processes)
+    if not workers and isinstance(work_queue, LocalQueue):
+        parser.error("--processes 0 needs a --broker or --redis with remote workers")
+    if os.path.dirname(args.checkpoint):
+        os.makedirs(os.path.dirname(args.checkpoint), exist_ok=True)
+    try:
+        records = run_sweep(build_cells(SETTINGS[args.settings], args.algorithms, args.seeds), work_queue,
+                            args.checkpoint, workers=workers, result_timeout=args.result_timeout)
+    finally:
+        stop_workers(work_queue, len(workers))
+    failed = [record for record in records if record['error']]
+    print(f"Sweep finished: {len(records) - len(failed)} cells ok, {len(failed)} failed")
+    if args.plot:
+        from Visualisation import visualize_metrics
+        visualize_metrics(aggregate(records, args.algorithms), args.algorithms)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,205 @@
+'''
+Streaming reader and writer for task datasets.
+
+Tasks are read from and written to the CSV schema produced by
+TaskGeneration.generate_random_tasks in fixed-size chunks, so parsing memory
+stays flat no matter how many rows the file has. Whole datasets can be loaded
+straight into a columnar TaskSet, and saved to / loaded from a NumPy .npz
+file, which is much faster to read back than reparsing CSV text.
+'''
+
+import numpy as np
+import pandas as pd
+
+from TaskGeneration import Task, TASK_TYPES
+from TaskSet import TaskSet, STATUS_CODES, STATUS_NAMES
+
+# CSV schema of the task datasets and the dtypes used to parse it
+CSV_COLUMNS = ["Task ID", "Task Type", "Status", "Length", "Priority", "Resource Requirement",
+               "Min Start Time", "Dependencies", "Number of Dependencies"]
+CSV_DTYPES = {
+    "Task ID": str,
+    "Task Type": "category",
+    "Status": "category",
+    "Length": "int32",
+    "Priority": "int32",
+    "Resource Requirement": "int32",
+    "Min Start Time": "int32",
+    "Dependencies": str,
+    "Number of Dependencies": "int32",
+}
+DEPENDENCY_SEPARATOR = ", "
+
+def iter_csv_chunks(csv_filename, chunksize=100_000):
+    """
+    Read a task CSV as a sequence of typed DataFrames of at most `chunksize` rows.
+    """
+    return pd.read_csv(csv_filename, dtype=CSV_DTYPES, keep_default_na=False, chunksize=chunksize)
+
+def _split_dependencies(dependencies):
+    """
+    Split a column of comma-joined dependency IDs.
+
+    Returns:
+    A tuple (counts, flat) with the number of dependencies per row and all
+    dependency IDs concatenated in row order.
+    """
+    dependencies = dependencies.to_numpy(dtype=object)
+    non_empty = dependencies != ''
+    counts = np.zeros(len(dependencies), dtype=np.int64)
+    joined = DEPENDENCY_SEPARATOR.join(dependencies[non_empty])
+    if not joined:
+        return counts, []
+    counts[non_empty] = [value.count(',') + 1 for value in dependencies[non_empty]]
+    return counts, joined.split(DEPENDENCY_SEPARATOR)
+
+def iter_tasks(csv_filename, chunksize=100_000):
+    """
+    Read a task CSV as a sequence of lists of Task objects, one list per chunk.
+    """
+    for chunk in iter_csv_chunks(csv_filename, chunksize):
+        counts, flat = _split_dependencies(chunk["Dependencies"])
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        columns = [chunk[column].tolist() for column in CSV_COLUMNS]
+        yield [Task(task_id=task_id, task_type=task_type, status=status, min_start_time=min_start_time,
+                    length=length, priority=priority, resource_req=resource_req,
+                    dependencies=flat[offsets[i]:offsets[i + 1]], num_dependencies=num_dependencies)
+               for i, (task_id, task_type, status, length, priority, resource_req, min_start_time, _,
+                       num_dependencies) in enumerate(zip(*columns))]
+
+def load_tasks(csv_filename, chunksize=100_000):
+    """
+    Load a task CSV as a list of Task objects.
+    """
+    tasks = []
+    for chunk in iter_tasks(csv_filename, chunksize):
+        tasks.extend(chunk)
+    return tasks
+
+def load_taskset(csv_filename, chunksize=100_000, task_types=TASK_TYPES):
+    """
+    Load a task CSV into a TaskSet without creating a Python object per task.
+
+    Each chunk is converted to arrays right away; dependency IDs are resolved
+    to positions once all IDs are known. Dependencies on IDs that are not in
+    the file are dropped.
+    """
+    type_codes = {task_type: code for code, task_type in enumerate(task_types)}
+    columns = {name: [] for name in ("ids", "task_type", "status", "length", "priority", "resource_req",
+                                     "min_start_time", "num_dependencies", "dep_counts", "dep_ids")}
+    for chunk in iter_csv_chunks(csv_filename, chunksize):
+        counts, flat = _split_dependencies(chunk["Dependencies"])
+        columns["ids"].append(chunk["Task ID"].to_numpy(dtype='S'))
+        columns["task_type"].append(chunk["Task Type"].map(type_codes).to_numpy(dtype=np.int8))
+        columns["status"].append(chunk["Status"].map(STATUS_CODES).to_numpy(dtype=np.int8))
+        columns["length"].append(chunk["Length"].to_numpy())
+        columns["priority"].append(chunk["Priority"].to_numpy())
+        columns["resource_req"].append(chunk["Resource Requirement"].to_numpy())
+        columns["min_start_time"].append(chunk["Min Start Time"].to_numpy())
+        columns["num_dependencies"].append(chunk["Number of Dependencies"].to_numpy())
+        columns["dep_counts"].append(counts)
+        columns["dep_ids"].append(np.array(flat, dtype='S'))
+    # Concatenate the chunks, releasing each column's chunk list as soon as it is merged
+    arrays = {}
+    for name in list(columns):
+        parts = columns.pop(name)
+        arrays[name] = np.concatenate(parts) if parts else np.zeros(0, dtype='S1' if name.endswith("ids") else np.int64)
+        del parts
+
+    # Resolve dependency IDs to positions now that every ID is known
+    ids, dep_ids = arrays.pop("ids"), arrays.pop("dep_ids")
+    order = np.argsort(ids, kind='stable')
+    known = np.zeros(len(dep_ids), dtype=bool)
+    dep_indices = np.zeros(0, dtype=np.int32)
+    if len(ids) and len(dep_ids):
+        sorted_ids = ids[order]
+        positions = np.minimum(np.searchsorted(sorted_ids, dep_ids), len(ids) - 1)
+        known = sorted_ids[positions] == dep_ids
+        dep_indices = order[positions[known]].astype(np.int32)
+        del sorted_ids, positions
+    del dep_ids
+    owners = np.repeat(np.arange(len(ids), dtype=np.int32), arrays.pop("dep_counts").astype(np.int64))
+    dep_indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(owners[known], minlength=len(ids)), out=dep_indptr[1:])
+    del owners, known
+
+    return TaskSet(ids=ids, task_type=arrays["task_type"], status=arrays["status"],
+                   min_start_time=arrays["min_start_time"], length=arrays["length"],
+                   priority=arrays["priority"], resource_req=arrays["resource_req"],
+                   dep_indptr=dep_indptr, dep_indices=dep_indices,
+                   num_dependencies=arrays["num_dependencies"], task_types=task_types, id_order=order)
+
+def _tasks_to_frame(tasks):
+    return pd.DataFrame({
+        "Task ID": [task.task_id for task in tasks],
+        "Task Type": [task.task_type for task in tasks],
+        "Status": [task.status for task in tasks],
+        "Length": [task.length for task in tasks],
+        "Priority": [task.priority for task in tasks],
+        "Resource Requirement": [task.resource_req for task in tasks],
+        "Min Start Time": [task.min_start_time for task in tasks],
+        "Dependencies": [DEPENDENCY_SEPARATOR.join(task.dependencies) for task in tasks],
+        "Number of Dependencies": [task.num_dependencies for task in tasks],
+    }, columns=CSV_COLUMNS)
+
+def _taskset_chunk_to_frame(taskset, start, stop):
+    ids = taskset.ids
+    return pd.DataFrame({
+        "Task ID": np.char.decode(ids[start:stop]),
+        "Task Type": np.asarray(taskset.task_types, dtype=object)[taskset.task_type[start:stop]],
+        "Status": np.asarray(STATUS_NAMES, dtype=object)[taskset.status[start:stop]],
+        "Length": taskset.length[start:stop],
+        "Priority": taskset.priority[start:stop],
+        "Resource Requirement": taskset.resource_req[start:stop],
+        "Min Start Time": taskset.min_start_time[start:stop],
+        "Dependencies": [DEPENDENCY_SEPARATOR.join(task_id.decode() for task_id in ids[taskset.dependency_indices(i)])
+                         for i in range(start, stop)],
+        "Number of Dependencies": taskset.num_dependencies[start:stop],
+    }, columns=CSV_COLUMNS)
+
+def write_tasks(tasks, csv_filename, chunksize=100_000):
+    """
+    Write tasks to a CSV file in chunks.
+
+    Parameters:
+    - tasks: A TaskSet, or any iterable of Task objects (e.g. a generator).
+    - csv_filename: Path of the CSV file to write.
+    - chunksize: Number of rows converted and written at a time.
+    """
+    header = True
+    with open(csv_filename, 'w', newline='') as f:
+        if isinstance(tasks, TaskSet):
+            for start in range(0, len(tasks), chunksize):
+                _taskset_chunk_to_frame(tasks, start, min(start + chunksize, len(tasks))).to_csv(f, index=False, header=header)
+                header = False
+        else:
+            chunk = []
+            for task in tasks:
+                chunk.append(task)
+                if len(chunk) == chunksize:
+                    _tasks_to_frame(chunk).to_csv(f, index=False, header=header)
+                    header, chunk = False, []
+            if chunk or header:
+                _tasks_to_frame(chunk).to_csv(f, index=False, header=header)
+
+def save_taskset_npz(taskset, npz_filename):
+    """
+    Save a TaskSet to a NumPy .npz file for fast reloading.
+    """
+    np.savez(npz_filename, ids=taskset.ids, task_type=taskset.task_type, status=taskset.status,
+             min_start_time=taskset.min_start_time, length=taskset.length, priority=taskset.priority,
+             resource_req=taskset.resource_req, dep_indptr=taskset.dep_indptr, dep_indices=taskset.dep_indices,
+             num_dependencies=taskset.num_dependencies, task_types=np.array(taskset.task_types),
+             id_order=taskset._id_order)
+
+def load_taskset_npz(npz_filename):
+    """
+    Load a TaskSet saved by `save_taskset_npz`.
+    """
+    with np.load(npz_filename) as data:
+        return TaskSet(ids=data["ids"], task_type=data["task_type"], status=data["status"],
+                       min_start_time=data["min_start_time"], length=data["length"],
+                       priority=data["priority"], resource_req=data["resource_req"],
+                       dep_indptr=data["dep_indptr"], dep_indices=data["dep_indices"],
+                       num_dependencies=data["num_dependencies"], task_types=data["task_types"].tolist(),
+                       id_order=data["id_order"])
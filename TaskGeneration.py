@@ -23,13 +23,16 @@ class Task:
             f"Priority: {self.priority}, Resource Requirement: {self.resource_req}, "
             f"Dependencies: {self.dependencies}")
   
-def generate_random_tasks(num_tasks, resource_limits, max_dependencies=0):
+def generate_random_tasks(num_tasks, resource_limits, max_dependencies=0, csv_filename="tasks_dataset.csv", show_statistics=True):
     '''
     Generate a list of tasks with random attributes.
 
     Parameters:
     num_tasks (int): The number of tasks to generate.
     resource_limits (dict): A dictionary with task types as keys and their max resource limits as values.
+    max_dependencies (int): The maximum number of dependencies of a task.
+    csv_filename (str): Where to save the dataset, or None to skip saving it.
+    show_statistics (bool): Whether to print statistics of the dataset.
 
     Returns:
     list: A list of Task objects.
@@ -50,7 +53,8 @@ def generate_random_tasks(num_tasks, resource_limits, max_dependencies=0):
 
         # Determine the number of dependencies (up to max_dependencies) based on previously created tasks
         num_dependencies = random.randint(0, min(i, max_dependencies))
-        dependencies = random.sample([f'T{j}' for j in range(i)], k=num_dependencies)
+        # Sampling positions from a range draws the same IDs without building an O(i) list per task
+        dependencies = [f'T{j}' for j in random.sample(range(i), k=num_dependencies)]
 
         task = Task(
             task_id=f'T{i}',
@@ -66,6 +70,9 @@ def generate_random_tasks(num_tasks, resource_limits, max_dependencies=0):
         
         tasks.append(task)
 
+    if csv_filename is None and not show_statistics:
+        return tasks
+
     # Create a DataFrame to hold task data
     data = {
         "Task ID": [task.task_id for task in tasks],
@@ -82,11 +89,12 @@ def generate_random_tasks(num_tasks, resource_limits, max_dependencies=0):
     df = pd.DataFrame(data)
 
     # Save the DataFrame to a CSV file
-    csv_filename = "tasks_dataset.csv"
-    df.to_csv(csv_filename, index=False)
+    if csv_filename is not None:
+        df.to_csv(csv_filename, index=False)
 
     # Show statistics of the dataset
-    print("Dataset Statistics:")
-    print(df.describe(include='all'))
+    if show_statistics:
+        print("Dataset Statistics:")
+        print(df.describe(include='all'))
 
     return tasks
\ No newline at end of file
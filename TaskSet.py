@@ -0,0 +1,274 @@
+'''
+Columnar storage for large task workloads.
+
+A TaskSet keeps every task attribute in a contiguous NumPy array instead of one
+Python object per task, maps task IDs to dense integer positions and stores the
+dependency graph in CSR form (indptr / indices). Iterating a TaskSet yields
+lightweight TaskView objects that expose the same attributes as
+TaskGeneration.Task, so the existing schedulers and metrics accept a TaskSet
+wherever they accept a list of tasks.
+'''
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from TaskGeneration import Task, TASK_TYPES
+
+# Status codes stored in the status array
+STATUS_NAMES = ['Not Running', 'Running', 'Completed']
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+
+class TaskView:
+    """
+    A Task-like view on one row of a TaskSet.
+
+    Reads go straight to the underlying arrays, and assigning `status` writes
+    back to the TaskSet, so schedulers that update task status keep working.
+    """
+    __slots__ = ('_taskset', '_index')
+
+    def __init__(self, taskset, index):
+        self._taskset = taskset
+        self._index = index
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def task_id(self):
+        return self._taskset.ids[self._index].decode()
+
+    @property
+    def task_type(self):
+        return self._taskset.task_types[self._taskset.task_type[self._index]]
+
+    @property
+    def status(self):
+        return STATUS_NAMES[self._taskset.status[self._index]]
+
+    @status.setter
+    def status(self, value):
+        self._taskset.status[self._index] = STATUS_CODES[value]
+
+    @property
+    def min_start_time(self):
+        return int(self._taskset.min_start_time[self._index])
+
+    @property
+    def length(self):
+        return int(self._taskset.length[self._index])
+
+    @property
+    def priority(self):
+        return int(self._taskset.priority[self._index])
+
+    @property
+    def resource_req(self):
+        return int(self._taskset.resource_req[self._index])
+
+    @property
+    def dependencies(self):
+        ids = self._taskset.ids
+        return [ids[j].decode() for j in self._taskset.dependency_indices(self._index)]
+
+    @property
+    def num_dependencies(self):
+        return int(self._taskset.num_dependencies[self._index])
+
+    def __str__(self):
+        return (f"Task ID: {self.task_id}, Type: {self.task_type}, Status: {self.status}, "
+                f"Min Start Time: {self.min_start_time}, Length: {self.length}, "
+                f"Priority: {self.priority}, Resource Requirement: {self.resource_req}, "
+                f"Dependencies: {self.dependencies}")
+
+
+class TaskSet(Sequence):
+    """
+    Array-backed collection of tasks.
+
+    Attributes:
+    - ids: Task IDs as a fixed-width bytes array.
+    - task_type: Index into `task_types` for every task (int8).
+    - status: Index into STATUS_NAMES for every task (int8).
+    - min_start_time, length, priority, resource_req: int32 arrays.
+    - num_dependencies: Number of dependencies as generated (int32).
+    - dep_indptr, dep_indices: Dependencies in CSR form; the dependencies of
+      task i are the positions dep_indices[dep_indptr[i]:dep_indptr[i + 1]].
+
+    `id_order` (the argsort of `ids`) can be passed when it is already known,
+    e.g. when loading a saved set, to skip sorting the IDs again.
+    """
+
+    def __init__(self, ids, task_type, status, min_start_time, length, priority, resource_req,
+                 dep_indptr, dep_indices, num_dependencies=None, task_types=TASK_TYPES, id_order=None):
+        self.ids = np.asarray(ids, dtype='S')
+        self.task_types = list(task_types)
+        self.task_type = np.asarray(task_type, dtype=np.int8)
+        self.status = np.asarray(status, dtype=np.int8)
+        self.min_start_time = np.asarray(min_start_time, dtype=np.int32)
+        self.length = np.asarray(length, dtype=np.int32)
+        self.priority = np.asarray(priority, dtype=np.int32)
+        self.resource_req = np.asarray(resource_req, dtype=np.int32)
+        self.dep_indptr = np.asarray(dep_indptr, dtype=np.int64)
+        self.dep_indices = np.asarray(dep_indices, dtype=np.int32)
+        if num_dependencies is None:
+            num_dependencies = np.diff(self.dep_indptr)
+        self.num_dependencies = np.asarray(num_dependencies, dtype=np.int32)
+
+        # Sorted copy of the IDs for O(log n) lookups without a per-task dict
+        if id_order is None:
+            id_order = np.argsort(self.ids, kind='stable')
+        self._id_order = np.asarray(id_order, dtype=np.int32)
+        self._sorted_ids = self.ids[self._id_order]
+        if len(self._sorted_ids) > 1 and (self._sorted_ids[1:] == self._sorted_ids[:-1]).any():
+            raise ValueError("Task IDs must be unique")
+
+    @classmethod
+    def from_tasks(cls, tasks, task_types=TASK_TYPES):
+        """
+        Build a TaskSet from an iterable of Task objects.
+
+        Dependencies on task IDs that are not part of `tasks` are dropped, since
+        they can never be scheduled together with this set.
+        """
+        tasks = list(tasks)
+        type_codes = {task_type: code for code, task_type in enumerate(task_types)}
+        ids = np.array([task.task_id for task in tasks], dtype='S')
+
+        # Flatten the dependency lists, then translate IDs to positions in bulk
+        dep_counts = np.array([len(task.dependencies) for task in tasks], dtype=np.int64)
+        flat_deps = np.array([dep for task in tasks for dep in task.dependencies], dtype='S')
+        owners = np.repeat(np.arange(len(tasks)), dep_counts)
+
+        order = np.argsort(ids, kind='stable')
+        positions = np.searchsorted(ids[order], flat_deps)
+        positions = np.minimum(positions, max(len(ids) - 1, 0))
+        known = (ids[order][positions] == flat_deps) if len(ids) else np.zeros(0, dtype=bool)
+        dep_indices = order[positions[known]]
+        dep_indptr = np.zeros(len(tasks) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owners[known], minlength=len(tasks)), out=dep_indptr[1:])
+
+        return cls(
+            ids=ids,
+            task_type=[type_codes[task.task_type] for task in tasks],
+            status=[STATUS_CODES[task.status] for task in tasks],
+            min_start_time=[task.min_start_time for task in tasks],
+            length=[task.length for task in tasks],
+            priority=[task.priority for task in tasks],
+            resource_req=[task.resource_req for task in tasks],
+            dep_indptr=dep_indptr,
+            dep_indices=dep_indices,
+            num_dependencies=[task.num_dependencies for task in tasks],
+            task_types=task_types,
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        for i in range(len(self.ids)):
+            yield TaskView(self, i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TaskView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TaskSet index out of range")
+        return TaskView(self, index)
+
+    def index_of(self, task_id):
+        """
+        Return the dense position of a task ID, or None if it is not in the set.
+        """
+        key = task_id.encode()
+        pos = np.searchsorted(self._sorted_ids, key)
+        if pos < len(self._sorted_ids) and self._sorted_ids[pos] == key:
+            return int(self._id_order[pos])
+        return None
+
+    def indices_of(self, task_ids):
+        """
+        Return the dense positions of many task IDs at once (-1 for unknown IDs).
+        """
+        keys = np.asarray(task_ids, dtype='S')
+        if len(self._sorted_ids) == 0:
+            return np.full(len(keys), -1, dtype=np.int32)
+        pos = np.minimum(np.searchsorted(self._sorted_ids, keys), len(self._sorted_ids) - 1)
+        return np.where(self._sorted_ids[pos] == keys, self._id_order[pos], -1).astype(np.int32)
+
+    def get(self, task_id):
+        """
+        Return a TaskView for a task ID, or None if it is not in the set.
+        """
+        index = self.index_of(task_id)
+        return None if index is None else TaskView(self, index)
+
+    def dependency_indices(self, index):
+        """
+        Return the positions of the dependencies of the task at `index`.
+        """
+        return self.dep_indices[self.dep_indptr[index]:self.dep_indptr[index + 1]]
+
+    def type_mask(self, task_type):
+        """
+        Return a boolean mask selecting the tasks of one task type.
+        """
+        return self.task_type == self.task_types.index(task_type)
+
+    def subset(self, indices):
+        """
+        Return a new TaskSet holding the tasks at `indices`, in that order.
+
+        Dependencies on tasks outside the subset are dropped.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        remap = np.full(len(self), -1, dtype=np.int64)
+        remap[indices] = np.arange(len(indices))
+
+        # Gather the CSR rows of the selected tasks and keep in-subset edges only
+        counts = self.dep_indptr[indices + 1] - self.dep_indptr[indices]
+        offsets = np.repeat(self.dep_indptr[indices] - np.cumsum(counts) + counts, counts)
+        rows = np.repeat(np.arange(len(indices)), counts)
+        deps = remap[self.dep_indices[offsets + np.arange(counts.sum())]] if counts.sum() else np.zeros(0, dtype=np.int64)
+        keep = deps >= 0
+        dep_indptr = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows[keep], minlength=len(indices)), out=dep_indptr[1:])
+
+        return TaskSet(
+            ids=self.ids[indices],
+            task_type=self.task_type[indices],
+            status=self.status[indices],
+            min_start_time=self.min_start_time[indices],
+            length=self.length[indices],
+            priority=self.priority[indices],
+            resource_req=self.resource_req[indices],
+            dep_indptr=dep_indptr,
+            dep_indices=deps[keep],
+            num_dependencies=self.num_dependencies[indices],
+            task_types=self.task_types,
+        )
+
+    def to_tasks(self):
+        """
+        Materialise the set as a list of TaskGeneration.Task objects.
+        """
+        return [Task(task_id=view.task_id, task_type=view.task_type, status=view.status,
+                     min_start_time=view.min_start_time, length=view.length, priority=view.priority,
+                     resource_req=view.resource_req, dependencies=view.dependencies,
+                     num_dependencies=view.num_dependencies)
+                for view in self]
+
+    @property
+    def nbytes(self):
+        """
+        Total memory held by the arrays of this set, in bytes.
+        """
+        arrays = (self.ids, self.task_type, self.status, self.min_start_time, self.length,
+                  self.priority, self.resource_req, self.dep_indptr, self.dep_indices,
+                  self.num_dependencies, self._id_order, self._sorted_ids)
+        return sum(array.nbytes for array in arrays)
@@ -0,0 +1,232 @@
+'''
+Vectorized, reproducible generation of large task workloads.
+
+Every attribute is drawn for all tasks at once from a seeded NumPy Generator
+and written straight into a TaskSet, and dependencies are sampled as integer
+positions without building candidate lists, so generation is linear in the
+number of tasks and dependencies. The defaults draw from the same
+distributions as TaskGeneration.generate_random_tasks; lengths, priorities
+and min_start_time take any distribution from this module (or a
+`function(rng, size)`), and the DAG shape controls where dependencies come
+from.
+
+Large datasets can be written as shards by a process pool. Shard k gets the
+k-th child of the SeedSequence of the seed, so its content only depends on
+the seed and its position, not on the number of processes.
+
+Example:
+    taskset = generate_taskset(10_000_000, RESOURCE_LIMITS, max_dependencies=3, seed=42,
+                               length=poisson(3, low=1), dag='layered', layer_width=1000)
+    paths = generate_shards(10_000_000, RESOURCE_LIMITS, 'results/shards', shard_size=1_000_000,
+                            max_dependencies=3, seed=42)
+'''
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+import numpy as np
+
+from TaskDataset import save_taskset_npz, write_tasks
+from TaskGeneration import TASK_TYPES
+from TaskSet import TaskSet, STATUS_CODES
+
+# Distributions: each returns a function(rng, size) drawing integer arrays
+
+def uniform(low, high):
+    """
+    Integers between `low` and `high`, inclusive, with equal probability.
+    """
+    return lambda rng, size: rng.integers(low, high + 1, size)
+
+def poisson(mean, low=0, high=None):
+    """
+    Poisson-distributed integers, clipped to [low, high].
+    """
+    return lambda rng, size: np.clip(rng.poisson(mean, size), low, high)
+
+def geometric(p, low=1, high=None):
+    """
+    Geometric integers (number of trials to the first success) shifted to
+    start at `low`, clipped to `high`.
+    """
+    return lambda rng, size: np.clip(rng.geometric(p, size) + (low - 1), low, high)
+
+def zipf(a, low=1, high=None):
+    """
+    Heavy-tailed Zipf integers shifted to start at `low`, clipped to `high`.
+    """
+    return lambda rng, size: np.clip(rng.zipf(a, size) + (low - 1), low, high)
+
+def choice(values, weights=None):
+    """
+    One of `values`, with probabilities proportional to `weights` (default: equal).
+    """
+    values = np.asarray(values)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float) / np.sum(weights)
+    return lambda rng, size: rng.choice(values, size, p=weights)
+
+def _draw(distribution, rng, size):
+    """
+    Draw from a distribution given as a function(rng, size) or a (low, high) range.
+    """
+    if callable(distribution):
+        return np.asarray(distribution(rng, size))
+    low, high = distribution
+    return rng.integers(low, high + 1, size)
+
+# DAG shapes: the range [first, last) of positions task i draws its dependencies from
+DAG_SHAPES = ('uniform', 'window', 'layered')
+
+def _candidate_ranges(num_tasks, dag, window, layer_width):
+    positions = np.arange(num_tasks, dtype=np.int64)
+    if dag == 'uniform':
+        # Any earlier task, as in generate_random_tasks
+        return np.zeros(num_tasks, dtype=np.int64), positions
+    if dag == 'window':
+        # One of the `window` previous tasks: long, narrow chains
+        return np.maximum(positions - window, 0), positions
+    if dag == 'layered':
+        # Any task of the previous layer: the DAG is num_tasks / layer_width levels deep
+        layer_start = positions - positions % layer_width
+        return np.maximum(layer_start - layer_width, 0), layer_start
+    raise ValueError(f"Unknown DAG shape: {dag} (expected one of {DAG_SHAPES})")
+
+def sample_dependencies(rng, first, last, counts):
+    """
+    Sample `counts[i]` distinct positions from [first[i], last[i]) for every
+    task i, without building the candidate lists.
+
+    Positions are drawn with replacement and the duplicates are redrawn
+    until every task's positions are distinct, so counts must not exceed the
+    size of the ranges.
+
+    Returns:
+    The dependencies in CSR form (indptr, indices), sorted within every task.
+    """
+    num_tasks = len(counts)
+    owners = np.repeat(np.arange(num_tasks, dtype=np.int64), counts)
+    base = owners * num_tasks
+    low, span = base + first[owners], (last - first)[owners]
+    # Key task * num_tasks + position: sorting the keys sorts every task's positions, and since
+    # the keys are already ordered by task the stable (merge) sort only has short runs to fix
+    keys = low + (rng.random(len(owners)) * span).astype(np.int64)
+    while len(keys):
+        keys.sort(kind='stable')
+        repeat = np.flatnonzero(keys[1:] == keys[:-1]) + 1
+        if not len(repeat):
+            break
+        keys[repeat] = low[repeat] + (rng.random(len(repeat)) * span[repeat]).astype(np.int64)
+    indptr = np.zeros(num_tasks + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, keys - base
+
+def _task_ids(first_id, num_tasks):
+    """
+    IDs 'T<first_id>' ... 'T<first_id + num_tasks - 1>' and their lexicographic order.
+    """
+    numbers = np.arange(first_id, first_id + num_tasks, dtype=np.int64)
+    text = numbers.astype('S')
+    digits = np.char.str_len(text)
+    ids = np.char.add(b'T', text)
+    # Comparing '0.<digits>' as numbers orders the IDs like strings, with a prefix before its extensions
+    order = np.lexsort((digits, numbers / 10.0 ** digits))
+    return ids, order
+
+def generate_taskset(num_tasks, resource_limits, max_dependencies=0, seed=None, length=(1, 5),
+                     priority=(1, 10), min_start_time=(0, 10), type_weights=None, running_share=0.5,
+                     dag='uniform', window=100, layer_width=1000, first_id=0, task_types=TASK_TYPES):
+    """
+    Generate a TaskSet of tasks with random attributes.
+
+    Parameters:
+    - num_tasks: The number of tasks to generate.
+    - resource_limits: Dictionary with the max resource limit of every task type;
+      resource requirements are uniform between 1 and the limit - 1.
+    - max_dependencies: Maximum number of dependencies of a task; the number
+      is uniform between 0 and the maximum (capped by the candidates).
+    - seed: Seed, SeedSequence or Generator that makes the set reproducible.
+    - length, priority, min_start_time: Distributions of the attributes, a
+      (low, high) range or a function(rng, size) such as `poisson(3, low=1)`.
+    - type_weights: Relative frequency of every task type (default: equal).
+    - running_share: Share of the tasks with the 'Running' status; the others
+      are 'Not Running'.
+    - dag: Where dependencies come from (see DAG_SHAPES): 'uniform' (any
+      earlier task), 'window' (the `window` previous tasks) or 'layered'
+      (the previous layer of `layer_width` tasks).
+    - first_id: Number of the first task ID, e.g. the offset of a shard.
+    - task_types: Task types, in code order.
+
+    Returns:
+    A TaskSet with IDs 'T<first_id>' onwards.
+    """
+    rng = np.random.default_rng(seed)
+    type_codes = _draw(choice(np.arange(len(task_types), dtype=np.int8), type_weights), rng, num_tasks)
+    status = np.where(rng.random(num_tasks) < running_share, STATUS_CODES['Running'], STATUS_CODES['Not Running'])
+    lengths = _draw(length, rng, num_tasks)
+    priorities = _draw(priority, rng, num_tasks)
+
+    # Resource requirement between 1 and the limit of the task type - 1
+    limits = np.array([resource_limits[task_type] for task_type in task_types], dtype=np.int64)[type_codes]
+    upper = np.maximum(limits - 1, 1)
+    resource_req = np.where(limits > 0, 1 + (rng.random(num_tasks) * upper).astype(np.int64), 0)
+    min_start_times = _draw(min_start_time, rng, num_tasks)
+
+    # Number of dependencies, capped by the number of candidates of every task
+    first, last = _candidate_ranges(num_tasks, dag, window, layer_width)
+    most = np.minimum(last - first, max_dependencies)
+    counts = (rng.random(num_tasks) * (most + 1)).astype(np.int64)
+    dep_indptr, dep_indices = sample_dependencies(rng, first, last, counts)
+
+    ids, id_order = _task_ids(first_id, num_tasks)
+    return TaskSet(ids=ids, task_type=type_codes, status=status, min_start_time=min_start_times,
+                   length=lengths, priority=priorities, resource_req=resource_req,
+                   dep_indptr=dep_indptr, dep_indices=dep_indices, num_dependencies=counts,
+                   task_types=task_types, id_order=id_order)
+
+def _write_shard(args):
+    path, shard_tasks, first_id, seed, resource_limits, options = args
+    taskset = generate_taskset(shard_tasks, resource_limits, seed=seed, first_id=first_id, **options)
+    if path.endswith('.csv'):
+        write_tasks(taskset, path)
+    else:
+        save_taskset_npz(taskset, path)
+    return path
+
+def generate_shards(num_tasks, resource_limits, directory, shard_size=1_000_000, seed=None, processes=None,
+                    file_format='npz', **options):
+    """
+    Generate a dataset as shards written by a process pool.
+
+    Every shard is an independent TaskSet (dependencies stay within the
+    shard) with globally unique IDs: shard k holds the tasks numbered from
+    k * shard_size. Its seed is the k-th child of SeedSequence(seed), so the
+    shards are the same for any number of processes.
+
+    Parameters:
+    - num_tasks: Total number of tasks.
+    - resource_limits: Dictionary of resource limits.
+    - directory: Directory the shards are written to.
+    - shard_size: Number of tasks per shard (the last one may be smaller).
+    - seed: Seed of the dataset.
+    - processes: Number of worker processes (default: one per CPU, 1 runs in this process).
+    - file_format: 'npz' (see TaskDataset.save_taskset_npz) or 'csv'.
+    - options: Further keyword arguments of `generate_taskset`.
+
+    Returns:
+    The paths of the shards, in order.
+    """
+    if file_format not in ('npz', 'csv'):
+        raise ValueError(f"Unknown file format: {file_format}")
+    os.makedirs(directory, exist_ok=True)
+    num_shards = -(-num_tasks // shard_size)
+    seeds = np.random.SeedSequence(seed).spawn(num_shards)
+    jobs = [(os.path.join(directory, f'shard_{k:05d}.{file_format}'), min(shard_size, num_tasks - k * shard_size),
+             k * shard_size, seeds[k], resource_limits, options)
+            for k in range(num_shards)]
+    if processes is None:
+        processes = min(num_shards, os.cpu_count() or 1)
+    if processes <= 1:
+        return [_write_shard(job) for job in jobs]
+    with ProcessPoolExecutor(processes) as executor:
+        return list(executor.map(_write_shard, jobs))
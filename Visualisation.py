@@ -1,5 +1,12 @@
 
+from concurrent.futures import ProcessPoolExecutor
+import os
+import warnings
+
+import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib.collections import PolyCollection
+import numpy as np
 import seaborn as sns
 import pandas as pd
 
@@ -61,40 +68,91 @@ def visualize_tasks(tasks):
     plt.tight_layout()
     plt.show()
 
-def visualize_pipeline(tasks, schedule, num_tasks):
+# Above this many scheduled tasks, visualize_pipeline draws one collection per task type without labels
+PIPELINE_DETAIL_LIMIT = 200
+
+def gantt_bars(tasks, schedule, task_types=('A', 'B', 'C', 'D')):
+    """
+    Group the bars of a schedule by task type.
+
+    Parameters:
+    tasks (list): A list of Task objects (or a TaskSet).
+    schedule (list): (task_id, start_time, end_time) tuples; the genetic
+        algorithm's (task_id, end_time, start_time) order is accepted too.
+    task_types (tuple): Task types to collect.
+
+    Returns:
+    dict: For every task type, a list of (task_id, start_time, end_time, priority) tuples in schedule order.
+    """
+    by_id = {task.task_id: task for task in tasks}
+    bars = {task_type: [] for task_type in task_types}
+    for task_id, first, second in schedule:
+        task = by_id[task_id]
+        if task.task_type in bars:
+            bars[task.task_type].append((task_id, min(first, second), max(first, second), task.priority))
+    return bars
+
+def visualize_pipeline(tasks, schedule, num_tasks, detailed=None):
+    """
+    Plots the execution timeline of a schedule, one subplot per task type.
+
+    Parameters:
+    tasks (list): A list of Task objects.
+    schedule (list): (task_id, start_time, end_time) tuples.
+    num_tasks (int): Number of tasks shown in the titles.
+    detailed (bool): Draw a labelled bar per task. By default only up to
+        PIPELINE_DETAIL_LIMIT scheduled tasks; larger schedules are drawn as
+        one PolyCollection per task type, without labels, which renders in
+        a fraction of the time.
+    """
     if not schedule:
         return 0  # Return 0 for empty schedule
-    
-    # Create a figure with 4 subplots (one for each task type)
-    fig, axs = plt.subplots(4, 1, figsize=(15, 15), sharex=True)
 
     # Get unique task types
     task_types = ['A', 'B', 'C', 'D']
+    bars = gantt_bars(tasks, schedule, task_types)
+    if not any(bars.values()):
+        return 0  # No scheduled task has a plotted type
+    if detailed is None:
+        detailed = len(schedule) <= PIPELINE_DETAIL_LIMIT
+
+    # Create a figure with 4 subplots (one for each task type)
+    fig, axs = plt.subplots(4, 1, figsize=(15, 15), sharex=True)
 
     # Determine unique priorities and create a color map
     unique_priorities = sorted(set(task.priority for task in tasks))
+    priority_index = {priority: i for i, priority in enumerate(unique_priorities)}
     num_priorities = len(unique_priorities)
     
     # Create a blue-to-white color map
     cmap = plt.get_cmap('Blues', num_priorities)  # Blue colormap
+    makespan = max(end_time for _, _, end_time, _ in (bar for type_bars in bars.values() for bar in type_bars))
 
     # Plot the tasks for each task type
     for i, task_type in enumerate(task_types):
         ax = axs[i]
-        for task_id, start_time, end_time in schedule:
-            task = next(t for t in tasks if t.task_id == task_id)
-            if task.task_type == task_type:
-                # Get the index for the color based on task priority
-                priority_index = unique_priorities.index(task.priority)
-                color = cmap(priority_index)  # Get color from the colormap
+        if detailed:
+            for task_id, start_time, end_time, priority in bars[task_type]:
+                # Get the color based on task priority
+                color = cmap(priority_index[priority])
                 ax.barh(task_id, end_time - start_time, left=start_time, height=0.4, color=color)
-                ax.text(start_time + 0.5 * (end_time - start_time), task_id, str(task.task_id), 
+                ax.text(start_time + 0.5 * (end_time - start_time), task_id, str(task_id),
                         va='center', ha='center', color='white')
+        else:
+            # One row per task as with barh, but all bars of the type in a single collection
+            rows = np.arange(len(bars[task_type]))
+            if len(rows):
+                _, starts, ends, priorities = (np.array(column) for column in zip(*bars[task_type]))
+                verts = np.stack([np.stack([starts, rows - 0.2], axis=1), np.stack([ends, rows - 0.2], axis=1),
+                                  np.stack([ends, rows + 0.2], axis=1), np.stack([starts, rows + 0.2], axis=1)], axis=1)
+                colors = cmap(np.array([priority_index[priority] for priority in priorities.tolist()]))
+                ax.add_collection(PolyCollection(verts, facecolors=colors, edgecolors='none'))
+            ax.set_ylim(-1, max(len(rows), 1))
 
         # Set labels and title for each subplot
         ax.set_title(f'Task Type {task_type} Execution Timeline (Number of Tasks: {num_tasks})')
-        ax.set_ylabel('Task ID')
-        ax.set_xlim(0, max(end_time for _, start_time, end_time in schedule) + 1)  # Extend x-axis for visibility
+        ax.set_ylabel('Task ID' if detailed else 'Task (schedule order)')
+        ax.set_xlim(0, makespan + 1)  # Extend x-axis for visibility
         ax.grid(True)
 
     # Set the x-axis label for the entire figure
@@ -106,9 +164,46 @@ def visualize_pipeline(tasks, schedule, num_tasks):
     # Show the plot
     # plt.show()
 
-def visualize_resource_utilization(resource_utilization):
+def threshold_spans(values, threshold):
+    """
+    Merge the time points whose value is above a threshold into spans.
+
+    Returns:
+    list: (start, end) index pairs of the maximal runs with values[j] > threshold, end exclusive.
+    """
+    over = np.concatenate([[False], np.asarray(values) > threshold, [False]])
+    edges = np.flatnonzero(over[1:] != over[:-1])
+    return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+def downsample(values, max_points):
+    """
+    Reduce a long series to at most `max_points` points, keeping the peaks.
+
+    Returns:
+    tuple: (x, y) arrays, where y is the maximum of every bucket of
+    consecutive values and x the index of the bucket's first value.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) <= max_points:
+        return np.arange(len(values)), values
+    bucket = -(-len(values) // max_points)
+    padded = np.full(bucket * (-(-len(values) // bucket)), -np.inf)
+    padded[:len(values)] = values
+    return np.arange(0, len(values), bucket), padded.reshape(-1, bucket).max(axis=1)
+
+def visualize_resource_utilization(resource_utilization, threshold=95, max_points=5000):
+    """
+    Plots the resource utilization of every task type over time.
+
+    Parameters:
+    resource_utilization (list): Utilization dictionaries as returned by
+        measure_metrics; the last one is plotted.
+    threshold (float): Utilization (%) above which periods are highlighted;
+        contiguous periods are merged into one span.
+    max_points (int): Longer timelines are downsampled to this many points,
+        keeping the peak of every bucket.
+    """
     # Create a figure with subplots
-    # print(f"DEBUG: {resource_utilization}")
     num_resources = len(resource_utilization[-1])
     fig, axs = plt.subplots(num_resources, 1, figsize=(10, 3.5 * num_resources), sharex=True)
 
@@ -122,25 +217,24 @@ def visualize_resource_utilization(resource_utilization):
 
     # Plot each resource utilization in its own subplot
     for i, (label, res) in enumerate(resource_utilization[-1].items()):
-        axs[i].plot(time_points[:len(res)], res, label=label)
+        axs[i].plot(*downsample(res, max_points), label=label)
 
-        # Highlight periods where utilization is over 95%
-        for j in range(len(res)):
-            if res[j] > 95:
-                axs[i].axvspan(time_points[j], time_points[j] + 1, color='red', alpha=0.3)
+        # Highlight periods where utilization is over the threshold, one span per period
+        spans = threshold_spans(res, threshold)
+        if spans:
+            axs[i].broken_barh([(start, end - start) for start, end in spans], (0, 100), color='red', alpha=0.3, linewidth=0)
 
         axs[i].set_title(f'Resource Utilization for {label}')
         axs[i].set_ylabel('Utilization (%)')
         axs[i].set_ylim(0, 100)  # Set y-limits to 0-100% for better readability
         axs[i].grid()
-        axs[i].legend()
+        axs[i].legend(loc='upper right')
 
     plt.xlabel('Time')
     plt.xticks(x_ticks, x_tick_labels)  # Set x-ticks to the defined intervals
     plt.tight_layout()  # Adjust layout to prevent overlapping
     # plt.show()
 
-
 def visualize_metrics(results, algorithms):
     """
     Visualizes the metrics measured in the experiment.
@@ -172,4 +266,85 @@ def visualize_metrics(results, algorithms):
         plt.legend()
 
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+# Plots that can be rendered to files by render_to_file and BackgroundRenderer
+RENDERERS = {
+    'tasks': visualize_tasks,
+    'pipeline': visualize_pipeline,
+    'resource_utilization': visualize_resource_utilization,
+    'metrics': visualize_metrics,
+}
+
+def render_to_file(plot, path, *args, dpi=100, **kwargs):
+    """
+    Draw a plot and save it to a file instead of showing it.
+
+    Parameters:
+    plot (str): Key of RENDERERS.
+    path (str): Output file; the format follows the extension.
+    args, kwargs: Arguments of the plot function.
+
+    Returns:
+    str: The path.
+    """
+    with warnings.catch_warnings():
+        # plt.show() is a no-op on a non-interactive backend
+        warnings.filterwarnings('ignore', message='.*non-interactive.*')
+        RENDERERS[plot](*args, **kwargs)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        plt.savefig(path, dpi=dpi)
+        plt.close('all')
+    return path
+
+def _init_headless_renderer():
+    matplotlib.use('Agg', force=True)
+    plt.close('all')
+
+class BackgroundRenderer:
+    """
+    Renders plots to files in a worker process with the headless Agg backend,
+    so that scheduling runs go on while the plots are drawn.
+
+    Example:
+        with BackgroundRenderer() as renderer:
+            renderer.submit('pipeline', 'results/pipeline_2000.png', tasks, schedule, 2000)
+            ...
+        # All plots are written when the block ends
+    """
+
+    def __init__(self, processes=1):
+        self.executor = ProcessPoolExecutor(max_workers=processes, initializer=_init_headless_renderer)
+        self.futures = []
+
+    def submit(self, plot, path, *args, **kwargs):
+        """
+        Queue a plot (a key of RENDERERS) to be saved to `path`.
+
+        Returns:
+        Future: Resolves to the path once the file is written.
+        """
+        if plot not in RENDERERS:
+            raise ValueError(f"Unknown plot: {plot}")
+        future = self.executor.submit(render_to_file, plot, path, *args, **kwargs)
+        self.futures.append(future)
+        return future
+
+    def close(self):
+        """
+        Wait for all queued plots and stop the worker.
+
+        Returns:
+        list: The paths written, in submission order.
+        """
+        self.executor.shutdown(wait=True)
+        return [future.result() for future in self.futures]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
@@ -1,13 +1,14 @@
-from Visualisation import visualize_tasks, visualize_metrics, visualize_pipeline
+from Visualisation import BackgroundRenderer
 from Greedy import schedule_tasks_greedy
 from TaskGeneration import generate_random_tasks
 from Metrics import measure_metrics
+from Benchmark import copy_tasks
 from IntegerLinearProgramming import schedule_tasks_ilp
 import time
 import pandas as pd
 import random
 
-from MetaheuristicAlgorithms import genetic_algorithm
+from MetaheuristicAlgorithms import genetic_algorithm, simulated_annealing, tabu_search
 
 # Task attributes
 RESOURCE_LIMITS = {'A': 23, 'B': 17, 'C': 19, 'D': 11}
@@ -34,8 +35,14 @@ RESOURCE_LIMITS = {'A': 23, 'B': 17, 'C': 19, 'D': 11}
 # Define a dictionary of algorithms
 ALGORITHMS = {
     'Greedy': schedule_tasks_greedy,
+    'Greedy-Aging': lambda tasks, resource_limits: schedule_tasks_greedy(tasks, resource_limits, engine='event', policy='aging'),
+    'Greedy-MLFQ': lambda tasks, resource_limits: schedule_tasks_greedy(tasks, resource_limits, engine='event', policy='mlfq'),
+    'Greedy-FairShare': lambda tasks, resource_limits: schedule_tasks_greedy(tasks, resource_limits, engine='event', policy='fair'),
+    'Greedy-SJF': lambda tasks, resource_limits: schedule_tasks_greedy(tasks, resource_limits, engine='event', policy='sjf'),
     'ILP-Based': schedule_tasks_ilp,
     'Genetic-Algorithm': genetic_algorithm,
+    'Simulated-Annealing': simulated_annealing,
+    'Tabu-Search': tabu_search,
     # Add other algorithms here
 }
 
@@ -45,8 +52,10 @@ results = {algo_name: [] for algo_name in ALGORITHMS}
 def run_experiment(tasks, resource_limits, algorithms, num_tasks):
     for algo_name in algorithms:
         algo_func = ALGORITHMS[algo_name]
+        # Every algorithm gets fresh copies, since the schedulers update task statuses
+        run_tasks = copy_tasks(tasks)
         start_time = time.time()
-        schedule = algo_func(tasks, resource_limits)
+        schedule = algo_func(run_tasks, resource_limits)
         end_time = time.time()
 
         # visualise task
@@ -63,16 +72,19 @@ def run_experiment(tasks, resource_limits, algorithms, num_tasks):
     return results
 
 # Experiment setup
-# Generate the dataset as a list
-dataset = generate_random_tasks(2000, RESOURCE_LIMITS, 10)
-visualize_tasks(dataset)
-
-num_tasks = [10, 20, 50, 100, 200, 500, 1000, 2000]
-
-for num in num_tasks:
-    # Select a random sample of 'num' tasks from the list
-    tasks = random.sample(dataset, num)
-    # print(f"type: {type(tasks)}")
-    results = run_experiment(tasks, RESOURCE_LIMITS, list(ALGORITHMS.keys()), num)
-
-visualize_metrics(results, list(ALGORITHMS.keys()))
\ No newline at end of file
+# The plots are written to results/ by the renderer's worker, so the runs are not blocked on plt.show()
+if __name__ == '__main__':
+    with BackgroundRenderer() as renderer:
+        # Generate the dataset as a list
+        dataset = generate_random_tasks(2000, RESOURCE_LIMITS, 10)
+        renderer.submit('tasks', 'results/tasks_attributes.png', dataset)
+
+        num_tasks = [10, 20, 50, 100, 200, 500, 1000, 2000]
+
+        for num in num_tasks:
+            # Select a random sample of 'num' tasks from the list
+            tasks = random.sample(dataset, num)
+            # print(f"type: {type(tasks)}")
+            results = run_experiment(tasks, RESOURCE_LIMITS, list(ALGORITHMS.keys()), num)
+
+        renderer.submit('metrics', 'results/metrics.png', results, list(ALGORITHMS.keys()))
@@ -1,12 +1,13 @@
-from Visualisation import visualize_tasks, visualize_metrics, visualize_pipeline
+from Visualisation import visualize_tasks, visualize_metrics, visualize_pipeline, BackgroundRenderer
 from Greedy import schedule_tasks_greedy
 from TaskGeneration import generate_random_tasks
 from Metrics import measure_metrics
+from Benchmark import copy_tasks
 from IntegerLinearProgramming import schedule_tasks_ilp
 import time
 import matplotlib.pyplot as plt
 
-from MetaheuristicAlgorithms import genetic_algorithm
+from MetaheuristicAlgorithms import genetic_algorithm, simulated_annealing, tabu_search
 
 # Task attributes
 RESOURCE_LIMITS = {'A': 23, 'B': 17, 'C': 19, 'D': 11}
@@ -58,24 +59,36 @@ settings2 = {# experiments with number of tasks and max dependencies
 # Define a dictionary of algorithms
 ALGORITHMS = {
     'Greedy': schedule_tasks_greedy,
+    'Greedy-Aging': lambda tasks, resource_limits: schedule_tasks_greedy(tasks, resource_limits, engine='event', policy='aging'),
+    'Greedy-MLFQ': lambda tasks, resource_limits: schedule_tasks_greedy(tasks, resource_limits, engine='event', policy='mlfq'),
+    'Greedy-FairShare': lambda tasks, resource_limits: schedule_tasks_greedy(tasks, resource_limits, engine='event', policy='fair'),
+    'Greedy-SJF': lambda tasks, resource_limits: schedule_tasks_greedy(tasks, resource_limits, engine='event', policy='sjf'),
     'ILP-Based': schedule_tasks_ilp,
     'Genetic-Algorithm': genetic_algorithm,
+    'Simulated-Annealing': simulated_annealing,
+    'Tabu-Search': tabu_search,
     # Add other algorithms here
 }
 
 # Initialize a dictionary to hold results for each algorithm
 results = {algo_name: [] for algo_name in ALGORITHMS}
 
-def run_experiment(tasks, resource_limits, algorithms, num_tasks):
+def run_experiment(tasks, resource_limits, algorithms, num_tasks, renderer=None):
     for algo_name in algorithms:
         algo_func = ALGORITHMS[algo_name]
+        # Every algorithm gets fresh copies, since the schedulers update task statuses
+        run_tasks = copy_tasks(tasks)
         start_time = time.time()
-        schedule = algo_func(tasks, resource_limits)
+        schedule = algo_func(run_tasks, resource_limits)
         end_time = time.time()
 
         # visualise task
         if algo_name == "Genetic-Algorithm":
-            visualize_pipeline(tasks, schedule, num_tasks)
+            if renderer is None:
+                visualize_pipeline(tasks, schedule, num_tasks)
+            else:
+                # Drawn to a file in the renderer's worker while the next algorithms run
+                renderer.submit('pipeline', f'results/pipeline_{num_tasks}.png', tasks, schedule, num_tasks)
 
         # Measure metrics
         weighted_throughput, makespan, task_utilization_rate, priority_satisfaction, resource_utilization, task_avg_wait_time = measure_metrics(schedule, tasks, resource_limits)
@@ -86,9 +99,11 @@ def run_experiment(tasks, resource_limits, algorithms, num_tasks):
 
     return results
 
-# Run the experiment
-for experiment_name, (num_tasks, max_dependencies) in settings2.items():
-    tasks = generate_random_tasks(num_tasks, RESOURCE_LIMITS, max_dependencies)
-    results = run_experiment(tasks, RESOURCE_LIMITS, list(ALGORITHMS.keys()), num_tasks)
-    
-visualize_metrics(results, list(ALGORITHMS.keys()))
\ No newline at end of file
+# Run the experiment (Sweep.py imports the settings and runs the cells in parallel)
+if __name__ == '__main__':
+    with BackgroundRenderer() as renderer:
+        for experiment_name, (num_tasks, max_dependencies) in settings2.items():
+            tasks = generate_random_tasks(num_tasks, RESOURCE_LIMITS, max_dependencies)
+            results = run_experiment(tasks, RESOURCE_LIMITS, list(ALGORITHMS.keys()), num_tasks, renderer)
+
+    visualize_metrics(results, list(ALGORITHMS.keys()))
\ No newline at end of file
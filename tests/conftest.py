@@ -0,0 +1,63 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DATASET = os.path.join(ROOT, 'tasks_dataset.csv')
+RESOURCE_LIMITS = {'A': 23, 'B': 17, 'C': 19, 'D': 11}
+
+
+@pytest.fixture
+def resource_limits():
+    return dict(RESOURCE_LIMITS)
+
+
+@pytest.fixture
+def dataset_path():
+    return DATASET
+
+
+def attributes(task):
+    """
+    All attributes of a task (Task or TaskView), for comparisons.
+    """
+    return (task.task_id, task.task_type, task.status, task.min_start_time, task.length, task.priority,
+            task.resource_req, list(task.dependencies), task.num_dependencies)
+
+
+def assert_tasksets_equal(actual, expected):
+    for name in ('ids', 'task_type', 'status', 'min_start_time', 'length', 'priority', 'resource_req',
+                 'dep_indptr', 'dep_indices', 'num_dependencies'):
+        assert np.array_equal(getattr(actual, name), getattr(expected, name)), name
+    assert actual.task_types == expected.task_types
+
+
+def assert_valid_schedule(schedule, tasks, resource_limits):
+    """
+    Check that a schedule respects min_start_time, dependencies on scheduled
+    tasks and the resource limit of every task type at every instant.
+    """
+    by_id = {task.task_id: task for task in tasks}
+    times = {task_id: (start, end) for task_id, start, end in schedule}
+    assert len(times) == len(schedule), "a task is scheduled twice"
+
+    events = {}
+    for task_id, (start, end) in times.items():
+        task = by_id[task_id]
+        assert start >= task.min_start_time, f"{task_id} starts before its min_start_time"
+        assert end - start == task.length, f"{task_id} has the wrong length"
+        for dep_id in task.dependencies:
+            if dep_id in times:
+                assert start >= times[dep_id][1], f"{task_id} starts before its dependency {dep_id} ends"
+        events.setdefault(task.task_type, []).extend([(start, task.resource_req), (end, -task.resource_req)])
+
+    for task_type, type_events in events.items():
+        usage = 0
+        # Releases sort before acquisitions at the same instant
+        for _, amount in sorted(type_events, key=lambda event: (event[0], event[1])):
+            usage += amount
+            assert usage <= resource_limits[task_type], f"type {task_type} exceeds its resource limit"
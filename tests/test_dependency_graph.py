@@ -0,0 +1,45 @@
+import pytest
+
+from DependencyGraph import DependencyGraph
+from TaskGeneration import Task
+from TaskSet import TaskSet
+
+
+def make_tasks():
+    # T0 -> T1 -> T3, T0 -> T2 -> T3; T4 is independent; T9 is outside the set
+    return [Task('T0', 'A', 'Not Running', 2, 3, 1, 1, [], 0),
+            Task('T1', 'A', 'Not Running', 0, 1, 1, 1, ['T0'], 1),
+            Task('T2', 'B', 'Not Running', 10, 2, 1, 1, ['T0', 'T0'], 2),
+            Task('T3', 'B', 'Not Running', 0, 4, 1, 1, ['T1', 'T2', 'T9'], 3),
+            Task('T4', 'C', 'Not Running', 1, 1, 1, 1, [], 0)]
+
+
+@pytest.mark.parametrize('container', [list, TaskSet.from_tasks])
+def test_levels_and_times(container):
+    graph = DependencyGraph.from_tasks(container(make_tasks()))
+    # The duplicate edge and the outside dependency are dropped
+    assert graph.num_edges == 4
+    assert graph.levels.tolist() == [0, 1, 1, 2, 0]
+    assert graph.topological_order().tolist() == [0, 4, 1, 2, 3]
+    assert graph.earliest_start_times().tolist() == [2, 5, 10, 12, 1]
+    assert graph.critical_path_lengths().tolist() == [9, 5, 6, 4, 1]
+    assert graph.critical_path_length() == 16
+    assert graph.index_of('T3') == 3 and graph.index_of('T9') is None
+
+
+def test_completion_tracker():
+    counter = DependencyGraph.from_tasks(make_tasks()).completion_tracker()
+    assert [counter.is_ready(i) for i in range(5)] == [True, False, False, False, True]
+    assert sorted(counter.complete(0)) == [1, 2]
+    assert list(counter.complete(1)) == []
+    assert list(counter.complete(2)) == [3]
+
+
+def test_cycles_are_detected():
+    tasks = [Task('T0', 'A', 'Not Running', 0, 1, 1, 1, ['T1'], 1),
+             Task('T1', 'A', 'Not Running', 0, 1, 1, 1, ['T0'], 1),
+             Task('T2', 'A', 'Not Running', 0, 1, 1, 1, [], 0)]
+    graph = DependencyGraph.from_tasks(tasks)
+    assert not graph.is_acyclic()
+    with pytest.raises(ValueError):
+        graph.validate()
@@ -0,0 +1,82 @@
+import functools
+import random
+
+import pytest
+
+from DispatchPolicies import POLICIES, AgingQueue, FairShareQueue, FeedbackQueue, IndexedHeap
+from Greedy import schedule_tasks_greedy
+from TaskDataset import load_tasks
+from TaskGeneration import Task
+
+from conftest import assert_valid_schedule
+
+
+def make_task(task_id, priority=5, length=1, resource_req=1):
+    return Task(task_id, 'A', 'Not Running', 0, length, priority, resource_req, [], 0)
+
+
+def assert_heap_order(heap):
+    for index in range(1, len(heap)):
+        assert not heap.keys[index] < heap.keys[(index - 1) >> 1]
+    assert all(heap.items[index] == item for item, index in heap.position.items())
+
+
+def test_indexed_heap_update_and_remove():
+    rng = random.Random(0)
+    heap = IndexedHeap()
+    keys = {}
+    for item in range(200):
+        keys[item] = rng.random()
+        heap.push(item, keys[item])
+    for item in rng.sample(range(200), 80):
+        keys[item] = rng.random()
+        heap.update(item, keys[item])
+        assert_heap_order(heap)
+    for item in rng.sample(range(200), 50):
+        assert heap.remove(item) == keys.pop(item)
+        assert_heap_order(heap)
+    assert all(item in heap for item in keys) and len(heap) == len(keys)
+    popped = [heap.pop() for _ in range(len(heap))]
+    assert popped == sorted((key, item) for item, key in keys.items())
+
+
+def test_aging_lets_a_waiting_task_overtake():
+    def first_after(arrival):
+        queue = AgingQueue(rate=0.1)
+        queue.push(make_task('low', priority=1), 0, 'low', now=0)
+        queue.push(make_task('high', priority=10), 1, 'high', now=arrival)
+        return queue.pop_fitting(free=1, now=arrival)
+
+    # Waiting (10 - 1) / 0.1 = 90 time units outranks any later arrival
+    assert first_after(50) == 'high'
+    assert first_after(100) == 'low'
+
+
+def test_feedback_queue_promotes_waiting_tasks():
+    queue = FeedbackQueue(quanta=(1, 2, 4), boost=10)
+    queue.push(make_task('long', length=10), 0, 'long', now=0)
+    assert queue.buckets[1].key('long')[0] == 3
+    queue.advance(25)
+    assert queue.buckets[1].key('long')[0] == 1
+
+    # After four boosts the long task outranks a short task that just arrived
+    queue.push(make_task('short', length=1), 1, 'short', now=40)
+    assert queue.pop_fitting(free=1, now=40) == 'long'
+
+
+def test_fair_share_rejects_non_positive_weights():
+    queue = FairShareQueue()
+    with pytest.raises(ValueError):
+        queue.push(make_task('zero', priority=0), 0, 'zero', now=0)
+    queue = FairShareQueue(weights={0: 1})
+    queue.push(make_task('zero', priority=0), 0, 'zero', now=0)
+    assert queue.pop_fitting(free=1) == 'zero'
+
+
+@pytest.mark.parametrize('policy', list(POLICIES) + [functools.partial(AgingQueue, rate=0.5)])
+def test_policies_give_valid_schedules(dataset_path, resource_limits, policy):
+    tasks = load_tasks(dataset_path)
+    pending = {task.task_id for task in tasks if task.status == 'Not Running'}
+    schedule = schedule_tasks_greedy(load_tasks(dataset_path), resource_limits, engine='event', policy=policy)
+    assert {task_id for task_id, _, _ in schedule} == pending
+    assert_valid_schedule(schedule, tasks, resource_limits)
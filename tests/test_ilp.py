@@ -0,0 +1,13 @@
+import pytest
+
+from IntegerLinearProgramming import schedule_tasks_ilp
+from TaskDataset import load_tasks
+from TaskSet import TaskSet
+
+
+@pytest.mark.parametrize('warm_start', ['greedy', 'genetic'])
+def test_warm_start_leaves_taskset_statuses(dataset_path, resource_limits, warm_start):
+    taskset = TaskSet.from_tasks(load_tasks(dataset_path)[:30])
+    statuses = [task.status for task in taskset]
+    schedule_tasks_ilp(taskset, resource_limits, warm_start=warm_start, time_limit=5)
+    assert [task.status for task in taskset] == statuses
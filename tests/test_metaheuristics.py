@@ -0,0 +1,24 @@
+import random
+
+import pytest
+
+from MetaheuristicAlgorithms import island_genetic_algorithm
+from TaskDataset import load_tasks
+
+
+@pytest.mark.parametrize('migration_interval', [0, -1])
+def test_island_model_rejects_empty_epochs(dataset_path, resource_limits, migration_interval):
+    tasks = load_tasks(dataset_path)[:20]
+    with pytest.raises(ValueError):
+        island_genetic_algorithm(tasks, resource_limits, generations=5, migration_interval=migration_interval,
+                                 processes=1)
+
+
+def test_island_model_keeps_caller_random_state(dataset_path, resource_limits):
+    tasks = load_tasks(dataset_path)[:20]
+    random.seed(7)
+    expected = random.random()
+    random.seed(7)
+    island_genetic_algorithm(tasks, resource_limits, num_islands=2, population_size=6, generations=2,
+                             migration_interval=1, processes=1, seed=0, compat=True)
+    assert random.random() == expected
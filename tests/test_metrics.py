@@ -0,0 +1,62 @@
+import pytest
+
+from Greedy import schedule_tasks_greedy
+from MetaheuristicAlgorithms import genetic_algorithm
+from Metrics import (MetricsEngine, calculate_average_wait_time, calculate_makespan, calculate_priority_satisfaction,
+                     calculate_resource_utilization, calculate_task_utilization_rate, calculate_weighted_throughput,
+                     measure_metrics)
+from TaskDataset import load_tasks
+from TaskSet import TaskSet
+
+
+def reference_metrics(schedule, tasks, resource_limits):
+    # The list-based implementation measure_metrics used before MetricsEngine
+    return (calculate_weighted_throughput(schedule, tasks), calculate_makespan(schedule),
+            calculate_task_utilization_rate(schedule, tasks), calculate_priority_satisfaction(schedule, tasks),
+            calculate_resource_utilization(schedule, tasks, resource_limits),
+            calculate_average_wait_time(tasks, schedule))
+
+
+def assert_metrics_equal(actual, expected):
+    assert len(actual) == len(expected)
+    for value, reference in zip(actual, expected):
+        if isinstance(reference, dict):
+            assert value.keys() == reference.keys()
+            for task_type in reference:
+                assert value[task_type] == pytest.approx(reference[task_type])
+        else:
+            assert value == pytest.approx(reference)
+
+
+@pytest.fixture
+def tasks(dataset_path):
+    return load_tasks(dataset_path)[:200]
+
+
+@pytest.fixture(params=['greedy', 'event', 'genetic'])
+def schedule(request, tasks, resource_limits):
+    # Greedy entries are (task_id, start, end), genetic ones (task_id, end, start)
+    if request.param == 'genetic':
+        return genetic_algorithm(tasks, resource_limits, population_size=10, generations=5)
+    engine = 'threaded' if request.param == 'greedy' else 'event'
+    return schedule_tasks_greedy(tasks, resource_limits, engine=engine)
+
+
+def test_measure_metrics_matches_reference(schedule, tasks, resource_limits):
+    assert_metrics_equal(measure_metrics(schedule, tasks, resource_limits),
+                         reference_metrics(schedule, tasks, resource_limits))
+
+
+def test_engine_on_taskset_matches_reference(schedule, tasks, resource_limits):
+    engine = MetricsEngine(TaskSet.from_tasks(tasks), resource_limits).extend(schedule)
+    assert_metrics_equal(engine.metrics(), reference_metrics(schedule, tasks, resource_limits))
+
+
+def test_streaming_matches_reference(schedule, tasks, resource_limits):
+    engine = MetricsEngine(tasks, resource_limits)
+    half = len(schedule) // 2
+    for entry in schedule[:half]:
+        engine.add(entry)
+    assert_metrics_equal(engine.metrics(), reference_metrics(schedule[:half], tasks, resource_limits))
+    engine.extend(schedule[half:])
+    assert_metrics_equal(engine.metrics(), reference_metrics(schedule, tasks, resource_limits))
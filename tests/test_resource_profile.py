@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from ResourceProfile import ResourceProfile
+
+
+def scan_earliest_start(usage, capacity, release, length, amount):
+    start = release
+    while any(slot < len(usage) and usage[slot] + amount > capacity for slot in range(start, start + length)):
+        start += 1
+    return start
+
+
+def test_matches_plain_list():
+    rng = random.Random(0)
+    capacity = 20
+    profile = ResourceProfile(capacity, horizon=8)
+    usage = []
+    for _ in range(300):
+        start = rng.randrange(0, 200)
+        end = start + rng.randrange(1, 30)
+        amount = rng.randrange(1, 8)
+        # Bookings reach past the horizon, so the tree grows
+        profile.add(start, end, amount)
+        usage.extend([0] * (end - len(usage)))
+        for slot in range(start, end):
+            usage[slot] += amount
+
+        query_start = rng.randrange(0, 250)
+        query_end = query_start + rng.randrange(0, 40)
+        expected = max(usage[query_start:query_end], default=0)
+        assert profile.max(query_start, query_end) == expected
+        assert profile.fits(query_start, query_end, 3) == (expected + 3 <= capacity)
+
+        release, length, need = rng.randrange(0, 250), rng.randrange(1, 20), rng.randrange(1, capacity + 1)
+        assert profile.earliest_start(release, length, need) == \
+            scan_earliest_start(usage, capacity, release, length, need)
+
+    assert len(profile) >= len(usage)
+    assert profile.values()[:len(usage)] == usage
+    assert all(profile.usage(slot) == used for slot, used in enumerate(usage))
+
+
+def test_growth_keeps_usage():
+    profile = ResourceProfile(10, horizon=4)
+    profile.add(0, 3, 2)
+    profile.add(2, 100, 5)
+    assert len(profile) >= 100
+    assert [profile.usage(slot) for slot in range(5)] == [2, 2, 7, 5, 5]
+    assert profile.usage(99) == 5
+    assert profile.usage(100) == 0
+    assert profile.max(0, 1000) == 7
+
+
+def test_from_usage():
+    usage = [1, 4, 0, 3, 3]
+    profile = ResourceProfile.from_usage(5, usage)
+    assert profile.values()[:len(usage)] == usage
+    assert profile.max(1, 4) == 4
+    assert profile.earliest_start(0, 2, 2) == 2
+    assert profile.earliest_start(0, 2, 3) == 5
+
+
+def test_amount_above_capacity():
+    with pytest.raises(ValueError):
+        ResourceProfile(5).earliest_start(0, 1, 6)
@@ -0,0 +1,33 @@
+import pytest
+
+from Runtime import execute_schedule, execution_summary
+from TaskGeneration import Task
+
+
+def make_tasks():
+    return [Task('T1', 'A', 'Not Running', 0, 2, 5, 3, [], 0),
+            Task('T2', 'A', 'Not Running', 0, 1, 5, 3, ['T1'], 1),
+            Task('T3', 'A', 'Not Running', 0, 1, 5, 99, [], 0),
+            Task('T4', 'E', 'Not Running', 0, 1, 5, 1, [], 0),
+            Task('T5', 'A', 'Not Running', 0, 1, 5, 1, ['T3'], 1)]
+
+
+def test_dependencies_and_bad_tasks():
+    tasks = make_tasks()
+    schedule = [('T1', 0, 2), ('T2', 2, 3), ('T3', 0, 1), ('T4', 0, 1), ('T5', 1, 2)]
+    report = execute_schedule(schedule, tasks, {'A': 5}, time_unit=0)
+    by_id = {record['task_id']: record for record in report}
+
+    assert by_id['T1']['outcome'] == by_id['T2']['outcome'] == 'completed'
+    assert by_id['T2']['actual_start'] >= by_id['T1']['actual_end']
+    # Too large for its type, and a type without a limit: failed, not a crash
+    assert by_id['T3']['outcome'] == by_id['T4']['outcome'] == 'failed'
+    assert isinstance(by_id['T3']['error'], ValueError) and isinstance(by_id['T4']['error'], ValueError)
+    assert by_id['T5']['outcome'] == 'skipped'
+    assert execution_summary(report)['outcomes'] == {'completed': 2, 'failed': 2, 'skipped': 1}
+    assert [task.status for task in tasks] == ['Completed', 'Completed', 'Not Running', 'Not Running', 'Not Running']
+
+
+def test_duplicate_task_ids_are_rejected():
+    with pytest.raises(ValueError):
+        execute_schedule([('T1', 0, 2), ('T1', 2, 4)], make_tasks(), {'A': 5}, time_unit=0)
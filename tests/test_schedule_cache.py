@@ -0,0 +1,57 @@
+import pytest
+
+from Greedy import schedule_tasks_greedy
+from ScheduleCache import ScheduleCache, cached, fingerprint
+from TaskDataset import load_tasks
+from TaskSet import TaskSet
+
+
+def event_greedy(tasks, resource_limits):
+    return schedule_tasks_greedy(tasks, resource_limits, engine='event')
+
+
+def test_hit_replays_schedule_and_statuses(dataset_path, resource_limits):
+    cache = ScheduleCache()
+    schedule = cached(event_greedy, cache)
+    tasks = load_tasks(dataset_path)[:200]
+    first = schedule(tasks, resource_limits)
+
+    fresh = load_tasks(dataset_path)[:200]
+    assert schedule(fresh, resource_limits) == first
+    assert [task.status for task in fresh] == [task.status for task in tasks]
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+    # The statuses changed by the first run give a new fingerprint
+    schedule(tasks, resource_limits)
+    assert cache.stats()['misses'] == 2
+
+
+def test_fingerprint_inputs(dataset_path, resource_limits):
+    tasks = load_tasks(dataset_path)[:50]
+    key = fingerprint(tasks, resource_limits, 'Greedy')
+    assert fingerprint(load_tasks(dataset_path)[:50], resource_limits, 'Greedy') == key
+    assert fingerprint(tasks, resource_limits, 'Greedy', kwargs={'engine': 'event'}) != key
+    assert fingerprint(tasks, dict(resource_limits, A=1), 'Greedy') != key
+    assert fingerprint(TaskSet.from_tasks(tasks), resource_limits, 'Greedy') == \
+        fingerprint(TaskSet.from_tasks(load_tasks(dataset_path)[:50]), resource_limits, 'Greedy')
+
+
+def test_eviction_and_disk_store(tmp_path):
+    directory = str(tmp_path / 'cache')
+    cache = ScheduleCache(max_bytes=80, directory=directory)
+    for i in range(5):
+        cache.put(f'key{i}', ([(f'T{i}', 0, 1)] * 3, []))
+    assert cache.current_bytes <= 80 and cache.stats()['evictions'] > 0
+    assert 'key0' not in cache.entries
+
+    # Evicted entries and entries of an earlier process come back from disk
+    assert cache.get('key0') == ([('T0', 0, 1)] * 3, [])
+    restarted = ScheduleCache(directory=directory)
+    assert restarted.get('key4') == ([('T4', 0, 1)] * 3, [])
+    assert restarted.stats()['disk_hits'] == 1
+    assert restarted.get('missing') is None
+
+
+def test_lambdas_need_a_name():
+    with pytest.raises(ValueError):
+        cached(lambda tasks, resource_limits: [], ScheduleCache())
@@ -0,0 +1,44 @@
+import threading
+
+import pytest
+
+from Sweep import BrokerClient, BrokerServer, RedisQueue, build_cells, cell_key, run_sweep, worker_loop
+
+
+@pytest.fixture
+def broker():
+    server = BrokerServer().start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_resume_drops_cells_left_on_the_queue(broker, tmp_path):
+    cells = build_cells({'tiny': (10, 0)}, ['Greedy', 'Greedy-Aging'], [0])
+    coordinator = RedisQueue(BrokerClient(broker.address))
+    # An interrupted run left every cell on the work list
+    for cell in cells:
+        coordinator.put_task(cell)
+
+    runs = []
+    worker_queue = RedisQueue(BrokerClient(broker.address))
+    original_put_result = worker_queue.put_result
+
+    def put_result(record):
+        runs.append(record['key'])
+        original_put_result(record)
+
+    worker_queue.put_result = put_result
+    worker = threading.Thread(target=worker_loop, args=(worker_queue, 2), daemon=True)
+    worker.start()
+
+    records = run_sweep(cells, coordinator, checkpoint=str(tmp_path / 'sweep.jsonl'), result_timeout=30, log=None)
+    worker.join()
+    assert [record['key'] for record in records] == [cell_key(cell) for cell in cells]
+    assert sorted(runs) == sorted(cell_key(cell) for cell in cells)
+
+
+def test_result_timeout_without_workers(broker):
+    cells = build_cells({'tiny': (10, 0)}, ['Greedy'], [0])
+    with pytest.raises(RuntimeError):
+        run_sweep(cells, RedisQueue(BrokerClient(broker.address)), result_timeout=1, log=None)
@@ -0,0 +1,26 @@
+from TaskDataset import load_taskset, load_taskset_npz, load_tasks, save_taskset_npz, write_tasks
+from TaskSet import TaskSet
+
+from conftest import assert_tasksets_equal, attributes
+
+
+def test_csv_round_trip(dataset_path, tmp_path):
+    tasks = load_tasks(dataset_path, chunksize=300)
+    path = str(tmp_path / 'tasks.csv')
+    write_tasks(tasks, path, chunksize=700)
+    assert [attributes(task) for task in load_tasks(path)] == [attributes(task) for task in tasks]
+
+    # A TaskSet written to CSV reads back the same, chunk by chunk or as a list
+    taskset = load_taskset(dataset_path, chunksize=300)
+    assert_tasksets_equal(taskset, TaskSet.from_tasks(tasks))
+    write_tasks(taskset, path, chunksize=700)
+    assert_tasksets_equal(load_taskset(path), taskset)
+
+
+def test_npz_round_trip(dataset_path, tmp_path):
+    taskset = load_taskset(dataset_path)
+    path = str(tmp_path / 'tasks.npz')
+    save_taskset_npz(taskset, path)
+    loaded = load_taskset_npz(path)
+    assert_tasksets_equal(loaded, taskset)
+    assert loaded.get('T1').dependencies == taskset.get('T1').dependencies
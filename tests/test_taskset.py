@@ -0,0 +1,39 @@
+import pytest
+
+from TaskDataset import load_tasks
+from TaskGeneration import Task
+from TaskSet import TaskSet
+
+from conftest import attributes
+
+
+def test_round_trip_and_lookups(dataset_path):
+    tasks = load_tasks(dataset_path)
+    taskset = TaskSet.from_tasks(tasks)
+    assert len(taskset) == len(tasks)
+    assert [attributes(task) for task in taskset.to_tasks()] == [attributes(task) for task in tasks]
+    assert attributes(taskset.get('T2')) == attributes(tasks[2])
+    assert taskset.get('missing') is None
+    assert taskset.indices_of(['T5', 'missing', 'T0']).tolist() == [5, -1, 0]
+
+
+def test_views_write_through_and_subset():
+    tasks = [Task('T0', 'A', 'Not Running', 0, 1, 1, 1, [], 0),
+             Task('T1', 'B', 'Not Running', 0, 1, 1, 1, ['T0'], 1),
+             Task('T2', 'C', 'Not Running', 0, 1, 1, 1, ['T0', 'T1', 'T9'], 3)]
+    taskset = TaskSet.from_tasks(tasks)
+    # The unknown dependency T9 is dropped
+    assert taskset[2].dependencies == ['T0', 'T1']
+    taskset[1].status = 'Completed'
+    assert taskset.get('T1').status == 'Completed'
+
+    subset = taskset.subset([2, 1])
+    assert [task.task_id for task in subset] == ['T2', 'T1']
+    assert subset[0].dependencies == ['T1']
+    assert subset[1].status == 'Completed'
+
+
+def test_duplicate_ids_are_rejected():
+    tasks = [Task('T0', 'A', 'Not Running', 0, 1, 1, 1, [], 0)] * 2
+    with pytest.raises(ValueError):
+        TaskSet.from_tasks(tasks)
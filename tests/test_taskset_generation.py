@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from TaskDataset import load_taskset_npz
+from TaskSetGeneration import generate_shards, generate_taskset, poisson
+
+from conftest import assert_tasksets_equal
+
+
+@pytest.mark.parametrize('dag', ['uniform', 'window', 'layered'])
+def test_seeded_generation(resource_limits, dag):
+    options = dict(max_dependencies=3, seed=42, dag=dag, window=5, layer_width=50, length=poisson(3, low=1))
+    taskset = generate_taskset(2000, resource_limits, **options)
+    assert_tasksets_equal(generate_taskset(2000, resource_limits, **options), taskset)
+
+    assert taskset.get('T0') is not None and taskset.get('T1999') is not None
+    assert (taskset.length >= 1).all()
+    limits = np.array([resource_limits[task_type] for task_type in taskset.task_types])[taskset.task_type]
+    assert ((taskset.resource_req >= 1) & (taskset.resource_req < limits)).all()
+
+    # Dependencies are distinct earlier tasks, at most max_dependencies per task
+    counts = np.diff(taskset.dep_indptr)
+    assert counts.max() <= 3 and (counts == taskset.num_dependencies).all()
+    for i in range(len(taskset)):
+        deps = taskset.dependency_indices(i)
+        assert (deps < i).all() and len(set(deps.tolist())) == len(deps)
+        if dag == 'window':
+            assert (deps >= i - 5).all()
+        if dag == 'layered':
+            assert (deps // 50 == i // 50 - 1).all()
+
+
+def test_shards_do_not_depend_on_processes(resource_limits, tmp_path):
+    serial = generate_shards(2500, resource_limits, str(tmp_path / 'serial'), shard_size=1000, seed=7,
+                             processes=1, max_dependencies=2)
+    parallel = generate_shards(2500, resource_limits, str(tmp_path / 'parallel'), shard_size=1000, seed=7,
+                               processes=2, max_dependencies=2)
+    assert len(serial) == 3
+    for serial_path, parallel_path in zip(serial, parallel):
+        assert_tasksets_equal(load_taskset_npz(parallel_path), load_taskset_npz(serial_path))
+    # Shard k holds the tasks numbered from k * shard_size
+    last = load_taskset_npz(serial[-1])
+    assert len(last) == 500 and last[0].task_id == 'T2000'
@@ -0,0 +1,11 @@
+import matplotlib
+
+matplotlib.use('Agg')
+
+from TaskGeneration import Task
+from Visualisation import visualize_pipeline
+
+
+def test_pipeline_without_plotted_task_types():
+    tasks = [Task('T1', 'E', 'Not Running', 0, 2, 1, 1, [], 0)]
+    assert visualize_pipeline(tasks, [('T1', 0, 2)], 1) == 0